@@ -0,0 +1,90 @@
+""" A module for caching the responses of the views safely per user and grade,
+the cache key of a view is made of the view, the requested path,
+the grade of the student, the running semester, and the curriculum version,
+and also the user for the views that render anything private to the user.
+
+Only GET and HEAD requests are cached, and never while a message is waiting
+to be shown to the user, the curriculum version is changed whenever
+any curriculum material is saved or deleted which invalidates all cached views.
+"""
+
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+
+from curriculum.utils import get_current_semester
+
+CURRICULUM_VERSION_KEY = "curriculum:version"
+
+
+def get_curriculum_version():
+    """returns the current version of the curriculum content"""
+    return cache.get_or_set(CURRICULUM_VERSION_KEY, time.time_ns(), None)
+
+
+def invalidate_curriculum_cache(**kwargs):
+    """changes the curriculum version so the cached views are not used anymore"""
+    cache.set(CURRICULUM_VERSION_KEY, time.time_ns(), None)
+
+
+def has_pending_messages(request):
+    """checks if there are messages to be shown to the user"""
+    storage = getattr(request, "_messages", None)
+    return storage is not None and len(storage) > 0
+
+
+def view_cache_key(view, request, per_user):
+    """returns the cache key of the response of a view to a request"""
+    semester = get_current_semester()
+    user = request.user
+    student = getattr(user, "student", None) if user.is_authenticated else None
+    parts = [
+        f"{view.__module__}.{view.__qualname__}",
+        request.method,
+        request.get_full_path(),
+        student.grade_id if student else None,
+        semester.pk if semester else None,
+        get_curriculum_version(),
+    ]
+    if per_user:
+        # pages holding a csrf token are only valid for the same csrf cookie
+        parts += [user.pk, request.COOKIES.get(settings.CSRF_COOKIE_NAME)]
+    key = hashlib.md5(repr(parts).encode()).hexdigest()
+    return f"views:{key}"
+
+
+def cache_view(timeout, per_user=True):
+    """caches the responses of a view for timeout seconds,
+    with per_user=False the response is shared by the students of the same grade"""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD") or has_pending_messages(request):
+                return view(request, *args, **kwargs)
+
+            key = view_cache_key(view, request, per_user)
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            response = view(request, *args, **kwargs)
+            if (
+                response.status_code == 200
+                and not response.streaming
+                and not has_pending_messages(request)
+            ):
+                if hasattr(response, "render") and callable(response.render):
+                    response.add_post_render_callback(
+                        lambda r: cache.set(key, r, timeout)
+                    )
+                else:
+                    cache.set(key, response, timeout)
+            return response
+
+        return wrapper
+
+    return decorator
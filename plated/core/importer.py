@@ -0,0 +1,268 @@
+""" A module for importing the curriculum material and the question bank in bulk
+from CSV or JSON lines files, the rows are read one by one so a large file
+is never loaded in memory at once.
+
+Each row is converted and validated with the fields of its model, then the rows
+are upserted by id in chunks, each chunk in one transaction with bulk_create
+for the new rows and bulk_update for the existing ones. The models of a chunk
+are saved from the subjects down to the answers, so a row can refer to a parent
+imported earlier in the same file.
+"""
+
+import csv
+import json
+import time
+from collections import Counter
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models, transaction
+from django.utils import timezone
+
+# the importable models from the root of the curriculum tree to the leaves
+IMPORT_MODELS = {
+    "subject": "subjects.Subject",
+    "unit": "subjects.Unit",
+    "chapter": "subjects.Chapter",
+    "lesson": "subjects.Lesson",
+    "question": "questions.Question",
+    "answer": "questions.Answer",
+}
+
+# the fields set by the database or the importer itself
+SKIPPED_FIELDS = ("created_at", "updated_at")
+
+
+class InvalidRow(ValueError):
+    """a row that can not be imported"""
+
+
+def read_rows(file, format):
+    """yields the line number and the values of each row of a CSV or JSON lines file"""
+    if format == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for number, line in enumerate(file, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            yield number, InvalidRow(f"invalid JSON: {error}")
+            continue
+        if not isinstance(row, dict):
+            row = InvalidRow("a row must be a JSON object")
+        yield number, row
+
+
+def get_import_model(name):
+    """returns the model imported by the rows of this model name"""
+    if name not in IMPORT_MODELS:
+        raise InvalidRow(f"unknown model {name!r}")
+    return apps.get_model(IMPORT_MODELS[name])
+
+
+def clean_row(model, row):
+    """returns the values of the row converted by the model fields by their attnames,
+    the empty values are left out to keep their defaults"""
+    values = {}
+    for key, value in row.items():
+        if key is None:
+            raise InvalidRow("the row has more values than the header")
+        try:
+            field = model._meta.get_field(key)
+        except FieldDoesNotExist:
+            raise InvalidRow(f"unknown field {key!r}")
+        if (
+            not field.concrete
+            or field.many_to_many
+            or field.name in SKIPPED_FIELDS
+            or isinstance(field, models.FileField)
+        ):
+            raise InvalidRow(f"the field {key!r} can not be imported")
+
+        if value == "" or value is None:
+            if field.null:
+                values[field.attname] = None
+            continue
+        try:
+            if field.is_relation:
+                value = field.target_field.to_python(value)
+            else:
+                value = field.clean(value, None)
+        except ValidationError as error:
+            raise InvalidRow(f"{key}: {' '.join(error.messages)}")
+        values[field.attname] = value
+    return values
+
+
+def required_fields(model):
+    """returns the attnames of the fields a new row must have"""
+    return {
+        field.attname
+        for field in model._meta.concrete_fields
+        if not (field.null or field.has_default() or field.name in SKIPPED_FIELDS)
+        and not field.primary_key
+    }
+
+
+class Importer:
+    """upserts the imported rows in chunks of batch_size rows"""
+
+    def __init__(self, batch_size=1000, on_flush=None):
+        self.batch_size = batch_size
+        self.on_flush = on_flush
+        self.created = Counter()
+        self.updated = Counter()
+        self.errors = []
+        self.rows = 0
+        self.started = time.perf_counter()
+        # the lessons whose questions changed to drop their cached question ids
+        self.question_lessons = set()
+        self.reset()
+
+    def reset(self):
+        # the pending rows of each model grouped by the fields they set
+        self.pending = {name: {} for name in IMPORT_MODELS}
+        self.pending_ids = {name: set() for name in IMPORT_MODELS}
+        self.pending_count = 0
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        """returns the imported rows per second"""
+        return self.rows / self.elapsed if self.elapsed else 0
+
+    def error(self, source, message):
+        self.errors.append(f"{source}: {message}")
+
+    def add(self, row, source, default_model=None):
+        """validates a row and adds it to the pending chunk,
+        the answers of a question can be nested in it as a list"""
+        if isinstance(row, InvalidRow):
+            self.error(source, row)
+            return
+        row = dict(row)
+        answers = row.pop("answers", None)
+        try:
+            name = row.pop("model", None) or default_model
+            if not name:
+                raise InvalidRow("the row has no model")
+            model = get_import_model(name)
+            values = clean_row(model, row)
+            if answers is not None and name != "question":
+                raise InvalidRow("only questions can have nested answers")
+        except InvalidRow as error:
+            self.error(source, error)
+            return
+
+        instance = model(**values)
+        if instance.pk in self.pending_ids[name]:
+            # the same row twice in a chunk is saved in order
+            self.flush()
+        fields = tuple(sorted(set(values) - {model._meta.pk.attname}))
+        self.pending[name].setdefault(fields, []).append((source, instance))
+        self.pending_ids[name].add(instance.pk)
+        self.pending_count += 1
+
+        for answer in answers or []:
+            if not isinstance(answer, dict):
+                self.error(source, "an answer must be a JSON object")
+                continue
+            self.add({**answer, "question": instance.pk}, source, "answer")
+
+        if self.pending_count >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """saves the pending chunk in one transaction"""
+        if not self.pending_count:
+            return
+        with transaction.atomic():
+            for name in IMPORT_MODELS:
+                model = get_import_model(name)
+                for fields, rows in self.pending[name].items():
+                    self.save(name, model, fields, rows)
+        self.reset()
+        if self.on_flush:
+            self.on_flush(self)
+
+    def missing_parents(self, model, fields, rows):
+        """returns the errors of the rows referring to parents that do not exist
+        by the indexes of the rows"""
+        missing = {}
+        for field in model._meta.concrete_fields:
+            if not field.is_relation or field.attname not in fields:
+                continue
+            ids = {getattr(instance, field.attname) for _, instance in rows} - {None}
+            existing = set(
+                field.related_model._default_manager.filter(pk__in=ids).values_list(
+                    "pk", flat=True
+                )
+            )
+            for index, (_, instance) in enumerate(rows):
+                value = getattr(instance, field.attname)
+                if value is not None and value not in existing:
+                    missing[index] = f"{field.name} {value} does not exist"
+        return missing
+
+    def save(self, name, model, fields, rows):
+        """creates the new rows and updates the existing ones of a model"""
+        missing = self.missing_parents(model, fields, rows)
+        for index, message in missing.items():
+            self.error(rows[index][0], message)
+        rows = [row for index, row in enumerate(rows) if index not in missing]
+
+        ids = [instance.pk for _, instance in rows]
+        existing = model._default_manager.filter(pk__in=ids)
+        if name == "question":
+            existing = dict(existing.values_list("pk", "lesson_id"))
+            # a question moved to another lesson is removed from the old one
+            self.question_lessons.update(existing.values())
+        else:
+            existing = set(existing.values_list("pk", flat=True))
+
+        required = required_fields(model) - set(fields)
+        new, changed = [], []
+        for source, instance in rows:
+            if instance.pk in existing:
+                changed.append(instance)
+            elif required:
+                self.error(source, f"a new {name} needs {', '.join(sorted(required))}")
+            else:
+                new.append(instance)
+
+        model._default_manager.bulk_create(new)
+        if changed and fields:
+            now = timezone.now()
+            for instance in changed:
+                instance.updated_at = now
+            names = [model._meta.get_field(field).name for field in fields]
+            model._default_manager.bulk_update(changed, [*names, "updated_at"])
+
+        if name == "question":
+            self.question_lessons.update(
+                instance.lesson_id for instance in new + changed
+            )
+        self.created[name] += len(new)
+        self.updated[name] += len(changed)
+        self.rows += len(new) + len(changed)
+
+    def finish(self):
+        """saves the last chunk and drops the caches of the imported content"""
+        from core.cache import invalidate_curriculum_cache
+        from questions.sampling import invalidate_question_ids
+
+        self.flush()
+        material = ("subject", "unit", "chapter", "lesson")
+        if any(self.created[name] + self.updated[name] for name in material):
+            invalidate_curriculum_cache()
+        for lesson_id in self.question_lessons - {None}:
+            invalidate_question_ids(lesson_id)
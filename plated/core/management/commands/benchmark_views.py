@@ -0,0 +1,168 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Q
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.instrumentation import measure
+from core.pagination import encode_cursor
+from exams.models import Exam
+from exams.views import EXAM_LIST_ORDERING
+from subjects.tree import get_student_tree
+from users.models import Student
+
+
+def percentile(values, percent):
+    """returns the percentile of the values by the nearest rank"""
+    values = sorted(values)
+    rank = max(round(percent / 100 * len(values)) - 1, 0)
+    return values[rank]
+
+
+class Command(BaseCommand):
+    help = (
+        "Requests the student pages through the test client and reports"
+        " their p50/p95 latency and query counts as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--student",
+            help="username of the student, the student with most exams by default",
+        )
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument(
+            "--cold",
+            action="store_true",
+            help="clear the cache before each request",
+        )
+        parser.add_argument("--output", help="write the JSON report to this file")
+        parser.add_argument(
+            "--compare", help="a previous JSON report to compare the results with"
+        )
+
+    def get_student(self, username):
+        students = Student.objects.select_related("user")
+        if username:
+            student = students.filter(user__username=username).first()
+        else:
+            student = (
+                students.annotate(exams_count=Count("exam"))
+                .order_by("-exams_count")
+                .first()
+            )
+        if student is None:
+            raise CommandError("No student found, run seed_load_data first.")
+        return student
+
+    def get_urls(self, student):
+        """returns the urls of the benchmarked pages by their names"""
+        tree = get_student_tree(student)
+        exams = Exam.objects.filter(student=student)
+        # an overdue exam redirects to its result instead of rendering the form
+        unsolved = exams.filter(
+            Q(deadline__isnull=True) | Q(deadline__gt=timezone.now()),
+            solved_at__isnull=True,
+        ).first()
+        solved = exams.filter(solved_at__isnull=False).first()
+        subject = next(iter(tree.instances("subject")), None)
+        unit = next(iter(tree.instances("unit", subject.id)), None) if subject else None
+        chapter = next(iter(tree.instances("chapter", unit.id)), None) if unit else None
+
+        urls = {
+            "home": reverse("home"),
+            "exam_list": reverse("exams"),
+            "main_dashboard": reverse("main-dashboard"),
+            "main_dashboard_data": reverse("main-dashboard-data"),
+            "subjects_dashboard": reverse("subjects-dashboard"),
+            "subjects_dashboard_data": reverse("subjects-dashboard-data"),
+        }
+        # the page after the 600 newest exams
+        deep = exams.order_by(*EXAM_LIST_ORDERING)[599:600].first()
+        if deep:
+            cursor = encode_cursor(deep, EXAM_LIST_ORDERING)
+            urls["exam_list_deep"] = f"{reverse('exams')}?after={cursor}"
+        if unsolved:
+            urls["exam"] = reverse("exam", args=[unsolved.id])
+        if solved:
+            urls["solved_exam"] = reverse("solved-exam", args=[solved.id])
+        for name, url_name, instance in (
+            ("units_dashboard", "units-dashboard", subject),
+            ("chapters_dashboard", "chapters-dashboard", unit),
+            ("lessons_dashboard", "lessons-dashboard", chapter),
+        ):
+            if instance:
+                urls[name] = reverse(url_name, args=[instance.id])
+                urls[f"{name}_data"] = reverse(f"{url_name}-data", args=[instance.id])
+        return urls
+
+    def benchmark(self, client, url, iterations, cold):
+        """requests the url and returns its latency and query measures"""
+        latencies, queries, duplicates = [], [], []
+        if not cold:
+            # the warm measures leave out the first request filling the caches
+            client.get(url)
+        for _ in range(iterations):
+            if cold:
+                cache.clear()
+            started = time.perf_counter()
+            with measure() as metrics:
+                response = client.get(url)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f"{url} returned {response.status_code}")
+            queries.append(metrics.query_count)
+            duplicates.append(sum(metrics.duplicates.values()))
+        return {
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "queries": max(queries),
+            "queries_median": statistics.median(queries),
+            "duplicate_queries": max(duplicates),
+        }
+
+    def compare(self, report, path):
+        """writes the changes from a previous report"""
+        with open(path) as file:
+            previous = json.load(file)["views"]
+        for name, result in report["views"].items():
+            before = previous.get(name)
+            if not before:
+                continue
+            self.stdout.write(
+                f"{name}: p50 {before['p50_ms']} -> {result['p50_ms']} ms,"
+                f" p95 {before['p95_ms']} -> {result['p95_ms']} ms,"
+                f" queries {before['queries']} -> {result['queries']}"
+            )
+
+    def handle(self, *args, **kwargs):
+        student = self.get_student(kwargs["student"])
+        client = Client()
+        client.force_login(student.user)
+        # the test client requests the pages as testserver
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            urls = self.get_urls(student)
+            views = {
+                name: self.benchmark(client, url, kwargs["iterations"], kwargs["cold"])
+                for name, url in urls.items()
+            }
+        report = {
+            "student": student.user.username,
+            "exams": Exam.objects.filter(student=student).count(),
+            "iterations": kwargs["iterations"],
+            "cold": kwargs["cold"],
+            "views": views,
+        }
+        output = json.dumps(report, indent=2)
+        if kwargs["output"]:
+            with open(kwargs["output"], "w") as file:
+                file.write(output)
+        self.stdout.write(output)
+        if kwargs["compare"]:
+            self.compare(report, kwargs["compare"])
@@ -0,0 +1,78 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importer import IMPORT_MODELS, Importer, read_rows
+
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".json": "jsonl",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports subjects, units, chapters, lessons, questions, and answers in bulk"
+        " from CSV or JSON lines files, upserting the rows by id"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="+", help="the CSV or JSON lines files")
+        parser.add_argument(
+            "--model",
+            choices=IMPORT_MODELS,
+            help="the model of the rows that have no model column",
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(set(FORMATS.values())),
+            help="the format of the files, guessed from their extension by default",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="number of rows saved in each transaction",
+        )
+
+    def get_format(self, path, format):
+        """returns the format of the file"""
+        if format:
+            return format
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in FORMATS:
+            raise CommandError(f"unknown format of {path}, use --format")
+        return FORMATS[extension]
+
+    def report_progress(self, importer):
+        if self.verbosity > 1:
+            self.stdout.write(
+                f"{importer.rows} rows in {importer.elapsed:.1f} s"
+                f" ({importer.rate:.0f} rows/s)"
+            )
+
+    def handle(self, *args, **kwargs):
+        self.verbosity = kwargs["verbosity"]
+        importer = Importer(kwargs["batch_size"], on_flush=self.report_progress)
+        for path in kwargs["files"]:
+            format = self.get_format(path, kwargs["format"])
+            # utf-8-sig drops the byte order mark spreadsheets add to CSV files
+            with open(path, newline="", encoding="utf-8-sig") as file:
+                for line, row in read_rows(file, format):
+                    importer.add(row, f"{path}:{line}", kwargs["model"])
+        importer.finish()
+
+        for name in IMPORT_MODELS:
+            created, updated = importer.created[name], importer.updated[name]
+            if created or updated:
+                self.stdout.write(f"{name}: {created} created, {updated} updated")
+        self.stdout.write(
+            f"{importer.rows} rows imported in {importer.elapsed:.1f} s"
+            f" ({importer.rate:.0f} rows/s)"
+        )
+        for error in importer.errors:
+            self.stderr.write(error)
+        if importer.errors:
+            raise CommandError(f"{len(importer.errors)} rows were not imported")
@@ -0,0 +1,298 @@
+import datetime
+import random
+import time
+import uuid
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.cache import invalidate_curriculum_cache
+from curriculum.models import Curriculum, Grade, Semester
+from dashboard.progress import rebuild_score_progress
+from exams.models import Exam, StudentAnswer
+from questions.models import Answer, Question
+from subjects.models import Chapter, Lesson, Subject, Unit
+from users.models import Student
+
+USERNAME_PREFIX = "load-student-"
+
+# the curriculum tree of each grade
+SUBJECTS_PER_GRADE = 6
+UNITS_PER_SUBJECT = 4
+CHAPTERS_PER_UNIT = 3
+LESSONS_PER_CHAPTER = 4
+ANSWERS_PER_QUESTION = 4
+
+# the share of the exams of each focus and their number of questions
+EXAM_FOCUSES = {
+    "lesson": (0.5, 10),
+    "chapter": (0.25, 25),
+    "unit": (0.15, 40),
+    "subject": (0.1, 50),
+}
+SOLVED_RATE = 0.9
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills the database with generated grades, curriculum, questions, students,"
+        " and exams in bulk, to reproduce production volumes locally"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--grades", type=int, default=3)
+        parser.add_argument("--students", type=int, default=10000)
+        parser.add_argument("--questions", type=int, default=200000)
+        parser.add_argument(
+            "--answers",
+            type=int,
+            default=5000000,
+            help="the approximate number of student answers",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="number of rows inserted at once",
+        )
+
+    def log(self, message):
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(f"[{elapsed:7.1f} s] {message}")
+
+    def bulk_create(self, model, objects):
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.rows += len(objects)
+
+    def create_curriculum(self, grades):
+        """creates the curriculum tree of each grade,
+        the first two units of each subject are taught in the running semester"""
+        today = timezone.localdate()
+        running = Semester.objects.create(
+            title="1",
+            starting_date=today - datetime.timedelta(days=60),
+            ending_date=today + datetime.timedelta(days=60),
+        )
+        next_semester = Semester.objects.create(
+            title="2",
+            starting_date=today + datetime.timedelta(days=61),
+            ending_date=today + datetime.timedelta(days=180),
+        )
+        curriculum = Curriculum.objects.create()
+        grade_objects = [
+            Grade(title=f"Load grade {number}", curriculum=curriculum)
+            for number in range(1, grades + 1)
+        ]
+        subjects, units, chapters, lessons = [], [], [], []
+        for grade in grade_objects:
+            for s in range(SUBJECTS_PER_GRADE):
+                subject = Subject(title=f"{grade.title} subject {s + 1}", grade=grade)
+                subjects.append(subject)
+                for u in range(UNITS_PER_SUBJECT):
+                    unit = Unit(title=f"Unit {u + 1}", subject=subject)
+                    unit.order_in_syllabus = unit.number = u + 1
+                    units.append(unit)
+                    semester = running if u < UNITS_PER_SUBJECT // 2 else next_semester
+                    for c in range(CHAPTERS_PER_UNIT):
+                        chapter = Chapter(title=f"Chapter {c + 1}", unit=unit)
+                        chapter.order_in_syllabus = chapter.number = c + 1
+                        chapters.append(chapter)
+                        for n in range(LESSONS_PER_CHAPTER):
+                            lesson = Lesson(
+                                title=f"Lesson {n + 1}",
+                                chapter=chapter,
+                                semester=semester,
+                            )
+                            lesson.order_in_syllabus = lesson.number = n + 1
+                            lessons.append(lesson)
+        for model, objects in (
+            (Grade, grade_objects),
+            (Subject, subjects),
+            (Unit, units),
+            (Chapter, chapters),
+            (Lesson, lessons),
+        ):
+            self.bulk_create(model, objects)
+        return grade_objects, lessons, running
+
+    def create_questions(self, lessons, count):
+        """creates the questions evenly over the lessons with their answers,
+        returns the (question id, difficulty, answer ids) of each lesson,
+        the first answer id is the correct one"""
+        lesson_questions = {lesson.id: [] for lesson in lessons}
+        questions, answers = [], []
+        for number in range(count):
+            lesson = lessons[number % len(lessons)]
+            question = Question(
+                id=uuid.uuid4(),
+                body=f"Load question {number}",
+                difficulty=self.rng.choices((1, 2, 3, 4), (3, 4, 2, 1))[0],
+                lesson_id=lesson.id,
+            )
+            question_answers = [
+                Answer(
+                    id=uuid.uuid4(),
+                    body=f"Answer {k + 1}",
+                    is_correct=k == 0,
+                    question_id=question.id,
+                )
+                for k in range(ANSWERS_PER_QUESTION)
+            ]
+            questions.append(question)
+            answers += question_answers
+            lesson_questions[lesson.id].append(
+                (question.id, question.difficulty, [a.id for a in question_answers])
+            )
+            if len(answers) >= self.batch_size:
+                self.bulk_create(Question, questions)
+                self.bulk_create(Answer, answers)
+                questions, answers = [], []
+        self.bulk_create(Question, questions)
+        self.bulk_create(Answer, answers)
+        return lesson_questions
+
+    def create_students(self, grades, count):
+        """creates the students evenly over the grades, returns them"""
+        password = make_password("password")
+        users = [
+            User(username=f"{USERNAME_PREFIX}{number}", password=password)
+            for number in range(count)
+        ]
+        self.bulk_create(User, users)
+        user_ids = dict(
+            User.objects.filter(username__startswith=USERNAME_PREFIX).values_list(
+                "username", "id"
+            )
+        )
+        students = [
+            Student(
+                id=uuid.uuid4(),
+                user_id=user_ids[user.username],
+                grade=grades[number % len(grades)],
+            )
+            for number, user in enumerate(users)
+        ]
+        self.bulk_create(Student, students)
+        return students
+
+    def get_focus_pools(self, lessons, lesson_questions, semester):
+        """returns the questions of each focus instance of the running semester
+        by grade, as {grade id: {focus: [(focus id, questions)]}}"""
+        pools = {}
+        for lesson in lessons:
+            if lesson.semester_id != semester.id:
+                continue
+            chapter = lesson.chapter
+            unit = chapter.unit
+            subject = unit.subject
+            grade_pools = pools.setdefault(subject.grade_id, {})
+            for focus, instance in (
+                ("lesson", lesson),
+                ("chapter", chapter),
+                ("unit", unit),
+                ("subject", subject),
+            ):
+                grade_pools.setdefault(focus, {}).setdefault(instance.id, []).extend(
+                    lesson_questions[lesson.id]
+                )
+        return {
+            grade_id: {focus: list(ids.items()) for focus, ids in grade_pools.items()}
+            for grade_id, grade_pools in pools.items()
+        }
+
+    def create_exams(self, students, pools, answers_count):
+        """creates solved and unsolved exams of random students until about
+        answers_count answers are given, the students answer correctly
+        by their ability and the difficulty of the questions"""
+        ability = {student.id: self.rng.uniform(0.3, 0.95) for student in students}
+        focuses = list(EXAM_FOCUSES)
+        weights = [share for share, _ in EXAM_FOCUSES.values()]
+        now = timezone.now()
+        through = Exam.questions.through
+        exams, exam_questions, student_answers = [], [], []
+        given = 0
+
+        while given < answers_count:
+            student = self.rng.choice(students)
+            focus = self.rng.choices(focuses, weights)[0]
+            focus_id, questions = self.rng.choice(pools[student.grade_id][focus])
+            questions = self.rng.sample(
+                questions, min(EXAM_FOCUSES[focus][1], len(questions))
+            )
+            exam = Exam(
+                id=uuid.uuid4(),
+                student_id=student.id,
+                question_count=len(questions),
+                duration=datetime.timedelta(minutes=len(questions) * 3),
+            )
+            setattr(exam, f"{focus}_id", focus_id)
+            exam_questions += [
+                through(exam_id=exam.id, question_id=question_id)
+                for question_id, _, _ in questions
+            ]
+            if self.rng.random() < SOLVED_RATE:
+                score = 0
+                for _, difficulty, answer_ids in questions:
+                    chance = ability[student.id] - (difficulty - 2) * 0.1
+                    if self.rng.random() < chance:
+                        answer_id = answer_ids[0]
+                        score += 1
+                    else:
+                        answer_id = self.rng.choice(answer_ids[1:])
+                    student_answers.append(
+                        StudentAnswer(
+                            exam_id=exam.id, student_id=student.id, answer_id=answer_id
+                        )
+                    )
+                exam.set_score(score)
+                exam.solved_at = now - datetime.timedelta(
+                    minutes=self.rng.randrange(60 * 24 * 60)
+                )
+                given += len(questions)
+            exams.append(exam)
+
+            if len(exam_questions) >= self.batch_size:
+                self.save_exams(exams, exam_questions, student_answers)
+                exams, exam_questions, student_answers = [], [], []
+                self.log(f"{given} answers, {self.rows / self.elapsed:.0f} rows/s")
+        self.save_exams(exams, exam_questions, student_answers)
+
+    def save_exams(self, exams, exam_questions, student_answers):
+        with transaction.atomic():
+            self.bulk_create(Exam, exams)
+            self.bulk_create(Exam.questions.through, exam_questions)
+            self.bulk_create(StudentAnswer, student_answers)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def handle(self, *args, **kwargs):
+        if User.objects.filter(username__startswith=USERNAME_PREFIX).exists():
+            raise CommandError("The load data already exists in this database.")
+        self.rng = random.Random(kwargs["seed"])
+        self.batch_size = kwargs["batch_size"]
+        self.started = time.perf_counter()
+        self.rows = 0
+
+        grades, lessons, semester = self.create_curriculum(kwargs["grades"])
+        self.log(f"{len(lessons)} lessons created")
+        lesson_questions = self.create_questions(lessons, kwargs["questions"])
+        self.log(f"{kwargs['questions']} questions created")
+        students = self.create_students(grades, kwargs["students"])
+        self.log(f"{len(students)} students created")
+        pools = self.get_focus_pools(lessons, lesson_questions, semester)
+        self.create_exams(students, pools, kwargs["answers"])
+        self.log("exams created")
+
+        for student in students:
+            rebuild_score_progress(student)
+        invalidate_curriculum_cache()
+        self.log(
+            f"score progresses rebuilt, {self.rows} rows inserted"
+            f" ({self.rows / self.elapsed:.0f} rows/s)"
+        )
@@ -0,0 +1,91 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# runs in a fresh interpreter to measure a cold django.setup()
+SETUP_SCRIPT = """
+import json, sys, time
+
+started = time.perf_counter()
+modules = len(sys.modules)
+
+from django.db import connections
+
+queries = []
+
+
+def count_query(execute, sql, params, many, context):
+    queries.append(sql)
+    return execute(sql, params, many, context)
+
+
+connections["default"].execute_wrappers.append(count_query)
+
+import django
+
+django.setup()
+print(json.dumps({
+    "setup_ms": (time.perf_counter() - started) * 1000,
+    "queries": len(queries),
+    "modules": len(sys.modules) - modules,
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Reports the import time and query count of a cold django.setup()"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs", type=int, default=5, help="number of cold starts to measure"
+        )
+        parser.add_argument(
+            "--budget-ms",
+            type=float,
+            default=None,
+            help="fail if the median setup time exceeds this budget",
+        )
+
+    def cold_start(self):
+        """runs django.setup() in a new process and returns its measures"""
+        env = os.environ.copy()
+        env.setdefault("DJANGO_SETTINGS_MODULE", "plated.settings")
+        result = subprocess.run(
+            [sys.executable, "-c", SETUP_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(f"django.setup() failed:\n{result.stderr}")
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def handle(self, *args, **kwargs):
+        starts = [self.cold_start() for _ in range(kwargs["runs"])]
+        setup_ms = [start["setup_ms"] for start in starts]
+        report = {
+            "runs": len(starts),
+            "setup_ms_median": statistics.median(setup_ms),
+            "setup_ms_min": min(setup_ms),
+            "setup_ms_max": max(setup_ms),
+            "queries": max(start["queries"] for start in starts),
+            "modules_imported": starts[-1]["modules"],
+        }
+        self.stdout.write(json.dumps(report, indent=2))
+
+        if report["queries"]:
+            raise CommandError(
+                f"django.setup() ran {report['queries']} queries, it should run none."
+            )
+        budget = kwargs["budget_ms"]
+        if budget is not None and report["setup_ms_median"] > budget:
+            raise CommandError(
+                f"django.setup() took {report['setup_ms_median']:.1f} ms,"
+                f" over the budget of {budget:.1f} ms."
+            )
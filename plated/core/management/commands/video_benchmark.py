@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+
+from core.streaming import serve_file
+
+
+class Command(BaseCommand):
+    help = "Reports the worker time per streamed MB of the video delivery modes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size-mb", type=int, default=64, help="size of the streamed video"
+        )
+        parser.add_argument(
+            "--range-mb", type=int, default=1, help="size of each requested range"
+        )
+
+    def stream(self, video, headers, sendfile_header=None):
+        """serves the video once and returns the number of bytes the worker sent"""
+        request = RequestFactory().get("/video/", headers=headers)
+        with override_settings(SENDFILE_HEADER=sendfile_header):
+            response = serve_file(request, video)
+        sent = sum(len(chunk) for chunk in response)
+        response.close()
+        return sent
+
+    def measure(self, name, requests, size):
+        """runs the requests and returns the worker time spent per streamed MB"""
+        wall, cpu = time.perf_counter(), time.process_time()
+        sent = sum(self.stream(*request) for request in requests)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        mb = size / 2**20
+        return {
+            "mode": name,
+            "requests": len(requests),
+            "worker_bytes": sent,
+            "wall_ms_per_mb": wall * 1000 / mb,
+            "cpu_ms_per_mb": cpu * 1000 / mb,
+        }
+
+    def handle(self, *args, **kwargs):
+        size = kwargs["size_mb"] * 2**20
+        range_size = kwargs["range_mb"] * 2**20
+        with tempfile.NamedTemporaryFile(suffix=".mp4") as file:
+            file.write(os.urandom(size))
+            file.flush()
+            video = SimpleNamespace(path=file.name, name=os.path.basename(file.name))
+
+            ranges = [
+                (video, {"Range": f"bytes={start}-{start + range_size - 1}"})
+                for start in range(0, size, range_size)
+            ]
+            report = [
+                self.measure("whole file", [(video, {})], size),
+                self.measure(f"{kwargs['range_mb']} MB ranges", ranges, size),
+                self.measure(
+                    "X-Accel-Redirect handoff",
+                    [(video, {}, "X-Accel-Redirect")],
+                    size,
+                ),
+            ]
+        self.stdout.write(json.dumps(report, indent=2))
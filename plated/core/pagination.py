@@ -0,0 +1,135 @@
+""" A module for paginating the lists by cursor (keyset pagination),
+a page is read after or before the last row of another page by its ordering
+values, instead of skipping the rows of the previous pages with OFFSET,
+so a deep page costs the same as the first one and no COUNT(*) is needed.
+
+The queryset is ordered by one or more fields ending with a unique one
+(the id), all descending or all ascending, e.g. ("-created_at", "-id").
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+DATETIME_PREFIX = "dt:"
+
+
+class InvalidCursor(ValueError):
+    """a cursor that was not made by encode_cursor"""
+
+
+def _dump(value):
+    if isinstance(value, datetime):
+        return DATETIME_PREFIX + value.isoformat()
+    return str(value)
+
+
+def _load(value):
+    if not isinstance(value, str):
+        raise InvalidCursor("invalid cursor value")
+    if value.startswith(DATETIME_PREFIX):
+        start = len(DATETIME_PREFIX)
+        try:
+            return datetime.fromisoformat(value[start:])
+        except ValueError:
+            raise InvalidCursor("invalid cursor date")
+    return value
+
+
+def encode_cursor(instance, ordering):
+    """returns the url safe cursor of the ordering values of an instance"""
+    values = [_dump(getattr(instance, field.lstrip("-"))) for field in ordering]
+    data = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor, ordering):
+    """returns the ordering values of a cursor, raises InvalidCursor"""
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(data)
+    except (binascii.Error, ValueError):
+        raise InvalidCursor("invalid cursor")
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor("invalid cursor")
+    return [_load(value) for value in values]
+
+
+def keyset_condition(ordering, values, after=True):
+    """returns the condition of the rows after (or before) the values
+    in the ordering, as (a < x) or (a = x and b < y) for descending fields"""
+    descending = ordering[0].startswith("-")
+    lookup = "lt" if descending == after else "gt"
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        condition |= Q(**equal, **{f"{name}__{lookup}": value})
+        equal[name] = value
+    # the same rows, bounding the first field lets the index seek to the cursor
+    # instead of scanning from the first page
+    first = ordering[0].lstrip("-")
+    return Q(**{f"{first}__{lookup}e": values[0]}) & condition
+
+
+class CursorPage:
+    """a page of a list paginated by cursor"""
+
+    def __init__(self, items, ordering, has_next, has_previous):
+        self.items = items
+        self.ordering = ordering
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    @property
+    def next_cursor(self):
+        """returns the cursor of the page after this one"""
+        if not self.has_next:
+            return None
+        return encode_cursor(self.items[-1], self.ordering)
+
+    @property
+    def previous_cursor(self):
+        """returns the cursor of the page before this one"""
+        if not self.has_previous:
+            return None
+        return encode_cursor(self.items[0], self.ordering)
+
+
+def paginate_by_cursor(queryset, ordering, per_page, after=None, before=None):
+    """returns the page of the queryset after or before the given cursor,
+    the first page without a cursor, an invalid cursor is the first page too"""
+    if before:
+        cursor, forward = before, False
+    else:
+        cursor, forward = after, True
+    reverse = [field[1:] if field[0] == "-" else f"-{field}" for field in ordering]
+    # the rows before the cursor are read from the nearest one
+    ordered = queryset.order_by(*(ordering if forward else reverse))
+    values = None
+    if cursor:
+        try:
+            values = decode_cursor(cursor, ordering)
+            ordered = ordered.filter(keyset_condition(ordering, values, forward))
+        except (InvalidCursor, ValidationError):
+            values, forward = None, True
+            ordered = queryset.order_by(*ordering)
+
+    # one extra row tells if there is another page in the reading direction
+    items = list(ordered[: per_page + 1])
+    more = len(items) > per_page
+    items = items[:per_page]
+    if forward:
+        return CursorPage(items, ordering, more, values is not None)
+    items.reverse()
+    return CursorPage(items, ordering, True, more)
@@ -0,0 +1,131 @@
+""" A module for serving media files with byte ranges,
+so a video can be seeked without downloading the whole file.
+
+The responses support conditional requests (ETag and Last-Modified),
+and with SENDFILE_HEADER set, the file is handed off to the front proxy
+(X-Accel-Redirect for nginx, X-Sendfile for Apache) which serves the bytes
+and the ranges itself, so no worker is held by a viewer.
+"""
+
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header, size):
+    """returns the (start, end) bytes of a single range header,
+    None to serve the whole file, or raises ValueError if it is unsatisfiable"""
+    match = RANGE_RE.match(header.replace(" ", "")) if header else None
+    if not match or match.group(1) == match.group(2) == "":
+        # multiple and malformed ranges are served as the whole file
+        return None
+    start, end = match.groups()
+    if start == "":
+        # a suffix range: the last bytes of the file
+        length = int(end)
+        if length == 0:
+            raise ValueError("empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError("range out of the file")
+    return start, end
+
+
+def file_etag(stat):
+    """returns the etag of a file from its size and modification time"""
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def if_range_matches(request, etag, last_modified):
+    """checks if the range of the request can be served (RFC 9110 If-Range)"""
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    if if_range.startswith("W/"):
+        # weak etags are not usable for If-Range
+        return False
+    date = parse_http_date_safe(if_range)
+    return date is not None and int(last_modified) <= date
+
+
+def read_range(path, start, length):
+    """yields the bytes of the range of the file in chunks"""
+    with open(path, "rb") as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def sendfile_response(field_file, content_type):
+    """returns an empty response handing the file off to the front proxy"""
+    response = HttpResponse(content_type=content_type)
+    if settings.SENDFILE_HEADER == "X-Accel-Redirect":
+        location = f"{settings.SENDFILE_URL_PREFIX.rstrip('/')}/{field_file.name}"
+    else:
+        location = field_file.path
+    response[settings.SENDFILE_HEADER] = location
+    return response
+
+
+def serve_file(request, field_file):
+    """serves a stored file, or the requested byte range of it"""
+    path = field_file.path
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404("The file does not exist.")
+    etag = file_etag(stat)
+    last_modified = stat.st_mtime
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified)
+    )
+    if response is not None:
+        return response
+
+    if getattr(settings, "SENDFILE_HEADER", None):
+        response = sendfile_response(field_file, content_type)
+    else:
+        byte_range = None
+        if if_range_matches(request, etag, last_modified):
+            try:
+                byte_range = parse_range(request.headers.get("Range"), stat.st_size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{stat.st_size}"
+                return response
+
+        if byte_range is None:
+            response = FileResponse(open(path, "rb"), content_type=content_type)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                read_range(path, start, end - start + 1),
+                status=206,
+                content_type=content_type,
+            )
+            response["Content-Length"] = end - start + 1
+            response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
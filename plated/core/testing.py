@@ -0,0 +1,54 @@
+""" A module for the helpers shared by the tests of the apps,
+the curriculum of a grade down to a lesson and the students of the grade.
+"""
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from curriculum.models import Curriculum, Grade, Semester
+from subjects.models import Chapter, Lesson, Subject, Unit
+from users.models import Student
+
+
+class CurriculumMixin:
+    """creates the curriculum of a grade with one subject, unit, chapter,
+    and lesson in a semester, and the students of the grade"""
+
+    def create_curriculum(
+        self,
+        starting_date=datetime.date(2000, 1, 1),
+        ending_date=datetime.date(2100, 1, 1),
+    ):
+        """creates the curriculum, the semester is running by default"""
+        curriculum = Curriculum.objects.create()
+        self.grade = Grade.objects.create(title="Grade 1", curriculum=curriculum)
+        self.semester = Semester.objects.create(
+            title="First Semester", starting_date=starting_date, ending_date=ending_date
+        )
+        self.subject = Subject.objects.create(title="Mathematics", grade=self.grade)
+        self.unit = Unit.objects.create(title="Algebra", subject=self.subject)
+        self.chapter = Chapter.objects.create(title="Linear Equations", unit=self.unit)
+        self.lesson = Lesson.objects.create(
+            title="Solving Linear Equations",
+            chapter=self.chapter,
+            semester=self.semester,
+        )
+
+    def create_student(self, username="student", **kwargs):
+        """returns a new student of the grade"""
+        user = User.objects.create_user(username, password="password", **kwargs)
+        return Student.objects.create(user=user, grade=self.grade)
+
+
+class StudentTestCase(CurriculumMixin, TestCase):
+    """a test case with the curriculum and a student of its grade logged in"""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.create_curriculum()
+        self.student = self.create_student(first_name="John", last_name="Doe")
+        self.user = self.student.user
+        self.client.force_login(self.user)
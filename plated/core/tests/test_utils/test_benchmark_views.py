@@ -0,0 +1,27 @@
+import datetime
+
+from django.urls import reverse
+from django.utils import timezone
+
+from core.management.commands.benchmark_views import Command
+from core.testing import StudentTestCase
+from exams.models import Exam
+
+
+class BenchmarkViewsTestCase(StudentTestCase):
+    def create_exam(self, deadline=None) -> Exam:
+        return Exam.objects.create(
+            student=self.student,
+            lesson=self.lesson,
+            question_count=1,
+            deadline=deadline,
+        )
+
+    def test_overdue_exams_are_not_benchmarked(self) -> None:
+        self.create_exam(timezone.now() - datetime.timedelta(minutes=5))
+        self.assertNotIn("exam", Command().get_urls(self.student))
+        running = self.create_exam(timezone.now() + datetime.timedelta(minutes=5))
+        self.assertEqual(
+            Command().get_urls(self.student)["exam"],
+            reverse("exam", args=[running.id]),
+        )
@@ -0,0 +1,64 @@
+from django.contrib import messages
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from core.cache import cache_view, get_curriculum_version
+from core.testing import StudentTestCase
+from subjects.models import Chapter, Lesson, Subject, Unit
+
+
+class CacheViewTestCase(StudentTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.other = self.create_student("other")
+        self.calls = 0
+
+    def view(self, request) -> HttpResponse:
+        self.calls += 1
+        if request.GET.get("message"):
+            messages.info(request, "saved")
+        return HttpResponse(f"{request.user.username} {self.calls}")
+
+    def get(self, user, path="/page/", method="get", per_user=True) -> str:
+        """returns the content of the cached view to a request of the user"""
+        request = getattr(RequestFactory(), method)(path)
+        request.user = user
+        request._messages = CookieStorage(request)
+        return cache_view(60, per_user=per_user)(self.view)(request).content.decode()
+
+    def test_per_user_responses(self) -> None:
+        self.assertEqual(self.get(self.user), "student 1")
+        self.assertEqual(self.get(self.other.user), "other 2")
+        self.assertEqual(self.get(self.user), "student 1")
+        self.assertEqual(self.get(self.other.user), "other 2")
+        self.assertEqual(self.get(self.user, "/page/?page=2"), "student 3")
+
+    def test_shared_responses_of_a_grade(self) -> None:
+        self.assertEqual(self.get(self.user, per_user=False), "student 1")
+        self.assertEqual(self.get(self.other.user, per_user=False), "student 1")
+
+    def test_post_responses_are_not_cached(self) -> None:
+        self.assertEqual(self.get(self.user, method="post"), "student 1")
+        self.assertEqual(self.get(self.user, method="post"), "student 2")
+        self.assertEqual(self.get(self.user), "student 3")
+
+    def test_responses_with_messages_are_not_cached(self) -> None:
+        self.assertEqual(self.get(self.user, "/page/?message=1"), "student 1")
+        self.assertEqual(self.get(self.user, "/page/?message=1"), "student 2")
+
+    def test_saved_or_deleted_material_invalidates_the_cache(self) -> None:
+        self.assertEqual(self.get(self.user), "student 1")
+        for instance in (self.subject, self.unit, self.chapter, self.lesson):
+            version = get_curriculum_version()
+            instance.save()
+            self.assertNotEqual(get_curriculum_version(), version)
+        self.assertEqual(self.get(self.user), "student 2")
+
+        # the lesson first, the others would delete it with them
+        for model in (Lesson, Chapter, Unit, Subject):
+            version = get_curriculum_version()
+            model.objects.get().delete()
+            self.assertNotEqual(get_curriculum_version(), version)
+            calls = self.calls
+            self.assertEqual(self.get(self.user), f"student {calls + 1}")
@@ -0,0 +1,100 @@
+import datetime
+import io
+import json
+import uuid
+
+from django.test import TestCase
+
+from core.importer import Importer, read_rows
+from curriculum.models import Curriculum, Grade, Semester
+from questions.models import Answer, Question
+from subjects.models import Lesson, Unit
+
+
+class ImporterTestCase(TestCase):
+    def setUp(self) -> None:
+        curriculum = Curriculum.objects.create()
+        self.grade = Grade.objects.create(title="Grade 1", curriculum=curriculum)
+        self.semester = Semester.objects.create(
+            title="1",
+            starting_date=datetime.date(2000, 1, 1),
+            ending_date=datetime.date(2100, 1, 1),
+        )
+        self.ids = {name: str(uuid.uuid4()) for name in ("subject", "unit", "chapter")}
+        self.lesson_id = str(uuid.uuid4())
+
+    def import_rows(self, text: str, format: str = "jsonl", **kwargs) -> Importer:
+        importer = Importer(batch_size=3)
+        for line, row in read_rows(io.StringIO(text), format):
+            importer.add(row, f"line {line}", **kwargs)
+        importer.finish()
+        return importer
+
+    def curriculum_lines(self) -> str:
+        rows = [
+            {"model": "subject", "id": self.ids["subject"], "title": "Math"},
+            {"model": "unit", "id": self.ids["unit"], "title": "Algebra"},
+            {"model": "chapter", "id": self.ids["chapter"], "title": "Equations"},
+            {"model": "lesson", "id": self.lesson_id, "title": "Linear"},
+        ]
+        rows[0]["grade"] = str(self.grade.id)
+        rows[1]["subject"] = self.ids["subject"]
+        rows[2]["unit"] = self.ids["unit"]
+        rows[3].update(chapter=self.ids["chapter"], semester=str(self.semester.id))
+        return "\n".join(json.dumps(row) for row in rows)
+
+    def test_import_tree_with_nested_answers(self) -> None:
+        question = {
+            "model": "question",
+            "lesson": self.lesson_id,
+            "body": "1 + 1 = ?",
+            "difficulty": "1",
+            "answers": [{"body": "2", "is_correct": True}, {"body": "3"}],
+        }
+        importer = self.import_rows(
+            f"{self.curriculum_lines()}\n{json.dumps(question)}\n"
+        )
+
+        self.assertEqual(importer.errors, [])
+        self.assertEqual(importer.rows, 7)
+        lesson = Lesson.objects.get(id=self.lesson_id)
+        self.assertEqual(lesson.chapter.unit.subject.grade, self.grade)
+        question = Question.objects.get()
+        self.assertEqual((question.lesson, question.difficulty), (lesson, 1))
+        self.assertEqual(
+            set(question.answers.values_list("body", "is_correct")),
+            {("2", True), ("3", False)},
+        )
+
+    def test_upsert_updates_only_given_fields(self) -> None:
+        self.import_rows(self.curriculum_lines())
+        unit = Unit.objects.get(id=self.ids["unit"])
+        text = f"id,title\n{self.ids['unit']},Geometry\n"
+
+        importer = self.import_rows(text, "csv", default_model="unit")
+
+        self.assertEqual((importer.created["unit"], importer.updated["unit"]), (0, 1))
+        updated = Unit.objects.get(id=unit.id)
+        self.assertEqual(updated.title, "Geometry")
+        self.assertEqual(updated.subject_id, unit.subject_id)
+        self.assertGreater(updated.updated_at, unit.updated_at)
+
+    def test_invalid_rows_are_reported(self) -> None:
+        self.import_rows(self.curriculum_lines())
+        rows = [
+            "not json",
+            json.dumps({"model": "unit", "title": "No subject"}),
+            json.dumps({"model": "answer", "question": str(uuid.uuid4())}),
+            json.dumps(
+                {"model": "question", "lesson": self.lesson_id, "difficulty": 9}
+            ),
+            json.dumps({"model": "lesson", "title": "x", "unknown": 1}),
+        ]
+
+        importer = self.import_rows("\n".join(rows))
+
+        self.assertEqual(importer.rows, 0)
+        self.assertEqual(len(importer.errors), 5)
+        self.assertTrue(importer.errors[0].startswith("line 1: invalid JSON"))
+        self.assertFalse(Answer.objects.exists())
+        self.assertEqual(Unit.objects.count(), 1)
@@ -0,0 +1,67 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.instrumentation import fingerprint, measure
+from curriculum.models import Curriculum, Grade
+
+
+class MeasureTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        curriculum = Curriculum.objects.create()
+        for number in range(3):
+            Grade.objects.create(title=f"Grade {number}", curriculum=curriculum)
+
+    def test_duplicate_queries_are_fingerprinted(self) -> None:
+        with measure() as metrics:
+            for grade in Grade.objects.all():
+                # one query per grade, the N+1 pattern
+                grade.curriculum
+        self.assertEqual(metrics.query_count, 4)
+        self.assertEqual(list(metrics.duplicates.values()), [3])
+        with self.assertRaises(AssertionError):
+            metrics.check()
+        metrics.check(max_queries=4, allow_duplicates=True)
+
+        with measure() as metrics:
+            list(Grade.objects.select_related("curriculum"))
+        metrics.check(max_queries=1)
+
+    def test_in_lists_have_one_fingerprint(self) -> None:
+        self.assertEqual(
+            fingerprint('SELECT 1 WHERE "id" IN (%s, %s, %s)'),
+            fingerprint('SELECT 1 WHERE "id" IN (%s)'),
+        )
+
+    def test_cache_hits_and_misses(self) -> None:
+        cache.set("a", 1)
+        with measure() as metrics:
+            cache.get("a")
+            cache.get("b")
+            cache.get_many(["a", "b", "c"])
+            # a miss, then a hit reading back the value it sets
+            cache.get_or_set("d", 2)
+        self.assertEqual((metrics.cache_hits, metrics.cache_misses), (3, 4))
+        # the caller default is returned on a miss
+        self.assertEqual(cache.get("missing", "default"), "default")
+
+
+@override_settings(REQUEST_INSTRUMENTATION=True)
+class InstrumentationMiddlewareTestCase(TestCase):
+    def test_headers_and_log(self) -> None:
+        with self.assertLogs("core.instrumentation", "INFO") as logs:
+            response = self.client.get("/auth/login/")
+        self.assertIn("X-Query-Count", response)
+        self.assertIn("render;dur=", response["Server-Timing"])
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["path"], "/auth/login/")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["queries"], int(response["X-Query-Count"]))
+        self.assertGreater(record["render_ms"], 0)
+
+    @override_settings(REQUEST_INSTRUMENTATION=False)
+    def test_off_by_default(self) -> None:
+        response = self.client.get("/auth/login/")
+        self.assertNotIn("X-Query-Count", response)
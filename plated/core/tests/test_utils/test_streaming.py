@@ -0,0 +1,75 @@
+import os
+import tempfile
+from types import SimpleNamespace
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.streaming import parse_range, serve_file
+
+
+class ParseRangeTestCase(SimpleTestCase):
+    def test_ranges(self) -> None:
+        self.assertEqual(parse_range("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse_range("bytes=900-", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_range("bytes=500-5000", 1000), (500, 999))
+
+    def test_whole_file(self) -> None:
+        self.assertIsNone(parse_range(None, 1000))
+        self.assertIsNone(parse_range("bytes=0-1,5-6", 1000))
+        self.assertIsNone(parse_range("items=0-1", 1000))
+
+    def test_unsatisfiable(self) -> None:
+        with self.assertRaises(ValueError):
+            parse_range("bytes=1000-", 1000)
+        with self.assertRaises(ValueError):
+            parse_range("bytes=-0", 1000)
+
+
+class ServeFileTestCase(SimpleTestCase):
+    def setUp(self) -> None:
+        file = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False)
+        file.write(bytes(range(256)) * 4)
+        file.close()
+        self.addCleanup(os.remove, file.name)
+        self.video = SimpleNamespace(path=file.name, name="videos/lesson.mp4")
+        self.factory = RequestFactory()
+
+    def serve(self, **headers):
+        return serve_file(self.factory.get("/", headers=headers), self.video)
+
+    def test_whole_file(self) -> None:
+        response = self.serve()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(response["Content-Type"], "video/mp4")
+        self.assertEqual(len(b"".join(response.streaming_content)), 1024)
+
+    def test_range(self) -> None:
+        response = self.serve(Range="bytes=256-511")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 256-511/1024")
+        self.assertEqual(response["Content-Length"], "256")
+        self.assertEqual(b"".join(response.streaming_content), bytes(range(256)))
+
+    def test_unsatisfiable_range(self) -> None:
+        response = self.serve(Range="bytes=2048-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */1024")
+
+    def test_conditional_requests(self) -> None:
+        etag = self.serve()["ETag"]
+        self.assertEqual(self.serve(If_None_Match=etag).status_code, 304)
+        response = self.serve(Range="bytes=0-9", If_Range=etag)
+        self.assertEqual(response.status_code, 206)
+        # a changed file is served whole instead of the range
+        response = self.serve(Range="bytes=0-9", If_Range='"changed"')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(
+        SENDFILE_HEADER="X-Accel-Redirect", SENDFILE_URL_PREFIX="/protected/"
+    )
+    def test_sendfile_handoff(self) -> None:
+        response = self.serve(Range="bytes=0-9")
+        self.assertEqual(response["X-Accel-Redirect"], "/protected/videos/lesson.mp4")
+        self.assertEqual(response.content, b"")
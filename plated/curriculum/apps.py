@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CurriculumConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "curriculum"
+
+    def ready(self):
+        import curriculum.signals  # noqa: F401
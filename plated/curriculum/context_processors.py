@@ -1,12 +1,8 @@
-from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 
-from curriculum.models import Semester
-
-CURRENT_SEMESTER = Semester.objects.filter(
-    starting_date__lte=timezone.now(), ending_date__gte=timezone.now()
-).first()
+from curriculum.utils import get_current_semester
 
 
 def current_semester(request):
     """sets the current semester in the context"""
-    return {"semester": CURRENT_SEMESTER}
+    return {"semester": SimpleLazyObject(get_current_semester)}
@@ -22,6 +22,11 @@ class Grade(BaseModel):
         return f"{self.title} - {self.curriculum}"
 
 
+def get_default_grade():
+    """returns the id of the first grade to be the default grade of a subject"""
+    return Grade.objects.values_list("id", flat=True).first()
+
+
 class Semester(BaseModel):
     """semesters table"""
 
@@ -0,0 +1,10 @@
+""" This module defines signals for the curriculum app
+"""
+
+from django.db.models.signals import post_delete, post_save
+
+from curriculum.models import Semester
+from curriculum.utils import invalidate_current_semester
+
+post_save.connect(invalidate_current_semester, sender=Semester)
+post_delete.connect(invalidate_current_semester, sender=Semester)
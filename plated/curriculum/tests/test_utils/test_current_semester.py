@@ -0,0 +1,69 @@
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from curriculum.models import Semester
+from curriculum.utils import CURRENT_SEMESTER_KEY, get_current_semester
+
+# six hours before the end of the 10th of March
+NOW = datetime.datetime(2024, 3, 10, 18, tzinfo=datetime.timezone.utc)
+SIX_HOURS = 6 * 60 * 60
+ONE_DAY = 24 * 60 * 60
+
+
+@override_settings(TIME_ZONE="UTC")
+class CurrentSemesterTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        patcher = mock.patch.object(timezone, "now", return_value=NOW)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_semester(self, starting_date, ending_date) -> Semester:
+        return Semester.objects.create(
+            title="Semester", starting_date=starting_date, ending_date=ending_date
+        )
+
+    def cached_timeout(self) -> int:
+        """returns the timeout the running semester was cached with"""
+        cache.delete(CURRENT_SEMESTER_KEY)
+        with mock.patch.object(cache, "set", wraps=cache.set) as cache_set:
+            get_current_semester()
+        return cache_set.call_args.args[2]
+
+    def test_cached_until_the_running_semester_ends(self) -> None:
+        semester = self.create_semester(
+            datetime.date(2024, 1, 1), datetime.date(2024, 3, 10)
+        )
+        self.assertEqual(self.cached_timeout(), SIX_HOURS)
+        self.assertEqual(get_current_semester(), semester)
+
+    def test_cached_until_the_next_semester_starts(self) -> None:
+        self.create_semester(datetime.date(2024, 3, 11), datetime.date(2024, 6, 1))
+        self.assertEqual(self.cached_timeout(), SIX_HOURS)
+        self.assertIsNone(get_current_semester())
+
+    def test_cached_for_a_day_at_most(self) -> None:
+        self.assertEqual(self.cached_timeout(), ONE_DAY)
+        self.create_semester(datetime.date(2024, 1, 1), datetime.date(2024, 12, 1))
+        self.assertEqual(self.cached_timeout(), ONE_DAY)
+
+    def test_saved_or_deleted_semester_invalidates_the_cache(self) -> None:
+        self.assertIsNone(get_current_semester())
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_current_semester())
+        semester = self.create_semester(
+            datetime.date(2024, 1, 1), datetime.date(2024, 6, 1)
+        )
+        self.assertEqual(get_current_semester(), semester)
+        semester.ending_date = datetime.date(2024, 2, 1)
+        semester.save()
+        self.assertIsNone(get_current_semester())
+        semester.ending_date = datetime.date(2024, 6, 1)
+        semester.save()
+        self.assertEqual(get_current_semester(), semester)
+        semester.delete()
+        self.assertIsNone(get_current_semester())
@@ -0,0 +1,58 @@
+""" A module for resolving the running semester at request time,
+the resolved semester is kept in the shared cache until the semester ends
+(or until the next semester starts if no semester is running),
+and it is removed from the cache whenever a semester is saved or deleted.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+CURRENT_SEMESTER_KEY = "curriculum:current_semester"
+
+# the longest time the resolved semester is kept without checking again
+MAX_SEMESTER_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def seconds_until(date):
+    """returns the seconds from now until the start of the date"""
+    boundary = timezone.make_aware(datetime.combine(date, time.min))
+    return max(int((boundary - timezone.now()).total_seconds()), 1)
+
+
+def resolve_current_semester():
+    """queries the running semester and how long it stays the running one"""
+    from curriculum.models import Semester
+
+    today = timezone.localdate()
+    semester = Semester.objects.filter(
+        starting_date__lte=today, ending_date__gte=today
+    ).first()
+    if semester:
+        boundary = semester.ending_date + timedelta(days=1)
+    else:
+        boundary = (
+            Semester.objects.filter(starting_date__gt=today)
+            .order_by("starting_date")
+            .values_list("starting_date", flat=True)
+            .first()
+        )
+    timeout = seconds_until(boundary) if boundary else MAX_SEMESTER_CACHE_TIMEOUT
+    return semester, min(timeout, MAX_SEMESTER_CACHE_TIMEOUT)
+
+
+def get_current_semester():
+    """returns the running semester or None if there is no running semester"""
+    # the semester is cached in a tuple to cache that no semester is running too
+    cached = cache.get(CURRENT_SEMESTER_KEY)
+    if cached is None:
+        semester, timeout = resolve_current_semester()
+        cached = (semester,)
+        cache.set(CURRENT_SEMESTER_KEY, cached, timeout)
+    return cached[0]
+
+
+def invalidate_current_semester(**kwargs):
+    """removes the resolved semester from the cache"""
+    cache.delete(CURRENT_SEMESTER_KEY)
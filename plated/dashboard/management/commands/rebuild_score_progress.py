@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from dashboard.progress import rebuild_score_progress
+from users.models import Student
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the precomputed score progress of the students from their exams"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "students", nargs="*", help="ids of the students (all students if empty)"
+        )
+
+    def handle(self, *args, **kwargs):
+        students = Student.objects.all()
+        if kwargs["students"]:
+            students = students.filter(pk__in=kwargs["students"])
+        for student in students.iterator():
+            count = rebuild_score_progress(student)
+            self.stdout.write(f"{student}: {count} progresses rebuilt")
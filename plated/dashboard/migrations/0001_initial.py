@@ -0,0 +1,68 @@
+# Generated by Django 5.0.7 on 2026-10-18 18:13
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("users", "0002_alter_student_tagged_lessons"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScoreProgress",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "focus",
+                    models.CharField(
+                        choices=[
+                            ("overall", "overall"),
+                            ("subject", "subject"),
+                            ("unit", "unit"),
+                            ("chapter", "chapter"),
+                            ("lesson", "lesson"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("focus_id", models.UUIDField(blank=True, null=True)),
+                ("exams_count", models.IntegerField(default=0)),
+                ("scores_sum", models.FloatField(default=0)),
+                ("scores", models.JSONField(default=list)),
+                ("averages", models.JSONField(default=list)),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="score_progresses",
+                        related_query_name="score_progress",
+                        to="users.student",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("student", "focus", "focus_id"),
+                        name="unique_student_focus_progress",
+                    )
+                ],
+            },
+        ),
+    ]
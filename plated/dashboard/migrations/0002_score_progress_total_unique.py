@@ -0,0 +1,39 @@
+# Generated by Django 5.0.7 on 2026-10-18 19:32
+
+from django.db import migrations, models
+
+
+def delete_duplicate_progresses(apps, schema_editor):
+    """keeps one progress of each student and focus without focus id,
+    the one of the most exams, the rebuild_score_progress command fixes
+    the counts of these students"""
+    ScoreProgress = apps.get_model("dashboard", "ScoreProgress")
+    kept = set()
+    duplicates = []
+    progresses = ScoreProgress.objects.filter(focus_id__isnull=True).order_by(
+        "student_id", "focus", "-exams_count", "id"
+    )
+    for id, student_id, focus in progresses.values_list("id", "student_id", "focus"):
+        if (student_id, focus) in kept:
+            duplicates.append(id)
+        kept.add((student_id, focus))
+    ScoreProgress.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dashboard", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_progresses, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="scoreprogress",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("focus_id__isnull", True)),
+                fields=("student", "focus"),
+                name="unique_student_focus_total_progress",
+            ),
+        ),
+    ]
@@ -0,0 +1,66 @@
+from django.db import models
+from django.db.models import Q
+
+from core.models import BaseModel
+from users.models import Student
+
+
+class ScoreProgress(BaseModel):
+    """score_progress table
+
+    holds the precomputed score progress of a student for a focus,
+    with focus_id set, it is the progress of one subject, unit, chapter, or lesson,
+    without it, it is the progress of all the exams of this focus (or all exams)
+    """
+
+    FOCUSES = [
+        ("overall", "overall"),
+        ("subject", "subject"),
+        ("unit", "unit"),
+        ("chapter", "chapter"),
+        ("lesson", "lesson"),
+    ]
+    # the number of the latest points kept in the series, so a grading
+    # rewrites a bounded row however many exams the student has solved
+    SERIES_LENGTH = 100
+
+    student = models.ForeignKey(
+        Student,
+        on_delete=models.CASCADE,
+        related_name="score_progresses",
+        related_query_name="score_progress",
+    )
+    focus = models.CharField(max_length=16, choices=FOCUSES)
+    focus_id = models.UUIDField(null=True, blank=True)
+    exams_count = models.IntegerField(default=0)
+    scores_sum = models.FloatField(default=0)
+    # score percentages of the latest solved exams in the order of solving
+    scores = models.JSONField(default=list)
+    # the average score of all the exams after each of the latest solved exams
+    averages = models.JSONField(default=list)
+
+    def add_score(self, score):
+        """adds a score percentage to the progress"""
+        self.exams_count += 1
+        self.scores_sum += score
+        self.scores.append(score)
+        self.averages.append(self.scores_sum / self.exams_count)
+        del self.scores[: -self.SERIES_LENGTH]
+        del self.averages[: -self.SERIES_LENGTH]
+
+    def __str__(self):
+        return f"{self.student} progress on {self.focus} {self.focus_id or ''}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "focus", "focus_id"],
+                name="unique_student_focus_progress",
+            ),
+            # NULL focus ids are distinct in the constraint above
+            models.UniqueConstraint(
+                fields=["student", "focus"],
+                condition=Q(focus_id__isnull=True),
+                name="unique_student_focus_total_progress",
+            ),
+        ]
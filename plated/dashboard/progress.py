@@ -0,0 +1,111 @@
+""" A module for keeping the precomputed score progress of the students,
+the progress is updated incrementally when an exam is graded,
+so the dashboard reads it without going through the exams of the student.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+
+from dashboard.models import ScoreProgress
+
+
+def progress_keys(exam):
+    """returns the (focus, focus_id) of the progresses an exam counts in"""
+    keys = [("overall", None)]
+    if exam.focus:
+        keys += [(exam.focus, None), (exam.focus, exam.focus_id)]
+    return keys
+
+
+def record_exam_score(exam):
+    """adds the score of a graded exam to the progresses of its student"""
+    score = exam.score_percentage
+    keys = progress_keys(exam)
+    condition = Q()
+    for focus, focus_id in keys:
+        condition |= Q(focus=focus, focus_id=focus_id)
+
+    progresses = ScoreProgress.objects.select_for_update().filter(
+        condition, student_id=exam.student_id
+    )
+
+    with transaction.atomic():
+        locked = {
+            (progress.focus, progress.focus_id): progress for progress in progresses
+        }
+        missing = [key for key in keys if key not in locked]
+        if missing:
+            # the rows are created empty before they are locked and updated,
+            # a concurrent first grading creates the same rows, so the rows
+            # one of them has created are left to it
+            ScoreProgress.objects.bulk_create(
+                [
+                    ScoreProgress(
+                        student_id=exam.student_id, focus=focus, focus_id=focus_id
+                    )
+                    for focus, focus_id in missing
+                ],
+                ignore_conflicts=True,
+            )
+            locked = {
+                (progress.focus, progress.focus_id): progress
+                for progress in progresses.all()
+            }
+        for progress in locked.values():
+            progress.add_score(score)
+        ScoreProgress.objects.bulk_update(
+            locked.values(),
+            ["exams_count", "scores_sum", "scores", "averages"],
+        )
+
+
+def rebuild_deleted_exam_progress(student_id):
+    """rebuilds the score progresses of a student after a graded exam was deleted,
+    unless the student is deleted too"""
+    from users.models import Student
+
+    student = Student.objects.filter(pk=student_id).first()
+    if student is not None:
+        rebuild_score_progress(student)
+
+
+def get_averages(student, focuses):
+    """returns the average score progress of all the exams of each focus"""
+    averages = {focus: [] for focus in focuses}
+    averages.update(
+        ScoreProgress.objects.filter(
+            student=student, focus__in=focuses, focus_id__isnull=True
+        ).values_list("focus", "averages")
+    )
+    return averages
+
+
+def get_scores(student, focus, focus_ids):
+    """returns the scores of the exams of each focus instance"""
+    return dict(
+        ScoreProgress.objects.filter(
+            student=student, focus=focus, focus_id__in=focus_ids
+        ).values_list("focus_id", "scores")
+    )
+
+
+def rebuild_score_progress(student):
+    """rebuilds the score progresses of a student from the solved exams"""
+    from exams.models import Exam
+
+    exams = Exam.objects.filter(student=student, score__isnull=False).order_by(
+        "solved_at"
+    )
+    progresses = {}
+    for exam in exams:
+        for focus, focus_id in progress_keys(exam):
+            progress = progresses.setdefault(
+                (focus, focus_id),
+                ScoreProgress(student=student, focus=focus, focus_id=focus_id),
+            )
+            progress.add_score(exam.score_percentage)
+
+    with transaction.atomic():
+        ScoreProgress.objects.filter(student=student).delete()
+        ScoreProgress.objects.bulk_create(progresses.values())
+    return len(progresses)
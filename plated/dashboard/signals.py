@@ -0,0 +1,20 @@
+""" This module defines signals for the dashboard app"""
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from dashboard.progress import rebuild_deleted_exam_progress
+from exams.models import Exam
+
+
+@receiver(post_delete, sender=Exam)
+def remove_exam_score(sender, instance, **kwargs):
+    """rebuild the score progress of the student of a deleted graded exam
+    after the deletion is committed"""
+    if instance.score is not None:
+        transaction.on_commit(
+            partial(rebuild_deleted_exam_progress, instance.student_id)
+        )
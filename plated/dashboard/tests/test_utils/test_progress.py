@@ -0,0 +1,105 @@
+import datetime
+from unittest import mock
+
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from core.testing import StudentTestCase
+from dashboard.models import ScoreProgress
+from dashboard.progress import rebuild_score_progress, record_exam_score
+from exams.models import Exam
+
+
+class ScoreProgressTestCase(StudentTestCase):
+    def record(self, score: int, **focus) -> Exam:
+        """saves a graded exam of 4 questions and records its score"""
+        exam = Exam(
+            student=self.student,
+            question_count=4,
+            solved_at=timezone.now() + datetime.timedelta(seconds=Exam.objects.count()),
+            **(focus or {"lesson": self.lesson}),
+        )
+        exam.set_score(score)
+        exam.save()
+        record_exam_score(exam)
+        return exam
+
+    def progresses(self) -> dict:
+        """returns the saved progresses of the student by (focus, focus id)"""
+        return {
+            (progress.focus, progress.focus_id): (
+                progress.exams_count,
+                progress.scores,
+                progress.averages,
+            )
+            for progress in ScoreProgress.objects.filter(student=self.student)
+        }
+
+    def test_grading_adds_the_score_to_its_progresses(self) -> None:
+        self.record(4)
+        self.record(2, subject=self.subject)
+        self.record(1)
+        self.assertEqual(
+            self.progresses(),
+            {
+                ("overall", None): (3, [100.0, 50.0, 25.0], [100.0, 75.0, 175 / 3]),
+                ("lesson", None): (2, [100.0, 25.0], [100.0, 62.5]),
+                ("lesson", self.lesson.id): (2, [100.0, 25.0], [100.0, 62.5]),
+                ("subject", None): (1, [50.0], [50.0]),
+                ("subject", self.subject.id): (1, [50.0], [50.0]),
+            },
+        )
+
+    def test_rebuild_matches_the_incremental_progress(self) -> None:
+        for score, focus in [(4, {}), (1, {"unit": self.unit}), (3, {}), (0, {})]:
+            self.record(score, **focus)
+        incremental = self.progresses()
+        self.assertEqual(rebuild_score_progress(self.student), 5)
+        self.assertEqual(self.progresses(), incremental)
+
+    def test_series_keep_the_latest_points(self) -> None:
+        with mock.patch.object(ScoreProgress, "SERIES_LENGTH", 2):
+            for score in (4, 0, 2):
+                self.record(score)
+        progress = ScoreProgress.objects.get(student=self.student, focus="overall")
+        self.assertEqual(progress.exams_count, 3)
+        self.assertEqual(progress.scores, [0.0, 50.0])
+        self.assertEqual(progress.averages, [50.0, 50.0])
+
+    def test_one_total_progress_per_focus(self) -> None:
+        ScoreProgress.objects.create(student=self.student, focus="overall")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ScoreProgress.objects.create(student=self.student, focus="overall")
+
+    def test_concurrent_first_grading(self) -> None:
+        create = ScoreProgress.objects.bulk_create
+
+        def create_after_another_grading(progresses, **kwargs):
+            # another first grading of the student commits its rows meanwhile
+            create([ScoreProgress(student=self.student, focus="overall")])
+            ScoreProgress.objects.filter(student=self.student).update(
+                exams_count=1, scores_sum=50, scores=[50.0], averages=[50.0]
+            )
+            return create(progresses, **kwargs)
+
+        with mock.patch.object(
+            ScoreProgress.objects, "bulk_create", create_after_another_grading
+        ):
+            self.record(4)
+        self.assertEqual(
+            self.progresses()[("overall", None)], (2, [50.0, 100.0], [50.0, 75.0])
+        )
+        self.assertEqual(ScoreProgress.objects.filter(focus="overall").count(), 1)
+
+    def test_deleting_a_graded_exam_rebuilds_the_progress(self) -> None:
+        self.record(4)
+        exam = self.record(2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse("delete-exam", args=[exam.id]))
+        self.assertEqual(Exam.objects.score_summary()["count"], 1)
+        self.assertEqual(self.progresses()[("overall", None)], (1, [100.0], [100.0]))
+        # the progress of a deleted student is not rebuilt
+        with self.captureOnCommitCallbacks(execute=True):
+            self.student.delete()
+        self.assertFalse(ScoreProgress.objects.exists())
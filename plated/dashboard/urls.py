@@ -1,10 +1,15 @@
 from django.urls import path
 
 from dashboard.views import (
+    chapter_dashboard_data_view,
     chapter_dashboard_view,
+    lesson_dashboard_data_view,
     lesson_dashboard_view,
+    main_dashboard_data_view,
     main_dashboard_view,
+    subject_dashboard_data_view,
     subject_dashboard_view,
+    unit_dashboard_data_view,
     unit_dashboard_view,
 )
 
@@ -14,4 +19,23 @@ urlpatterns = [
     path("subject/<uuid:id>/units/", unit_dashboard_view, name="units-dashboard"),
     path("unit/<uuid:id>/chapters/", chapter_dashboard_view, name="chapters-dashboard"),
     path("chapter/<uuid:id>/lessons/", lesson_dashboard_view, name="lessons-dashboard"),
+    path("data/", main_dashboard_data_view, name="main-dashboard-data"),
+    path(
+        "subject/data/", subject_dashboard_data_view, name="subjects-dashboard-data"
+    ),
+    path(
+        "subject/<uuid:id>/units/data/",
+        unit_dashboard_data_view,
+        name="units-dashboard-data",
+    ),
+    path(
+        "unit/<uuid:id>/chapters/data/",
+        chapter_dashboard_data_view,
+        name="chapters-dashboard-data",
+    ),
+    path(
+        "chapter/<uuid:id>/lessons/data/",
+        lesson_dashboard_data_view,
+        name="lessons-dashboard-data",
+    ),
 ]
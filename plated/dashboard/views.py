@@ -1,81 +1,40 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
 from django.shortcuts import redirect, render
+from django.urls import reverse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import conditional_page, require_GET
 
-from curriculum.context_processors import CURRENT_SEMESTER
-from dashboard.utils import avg_score_progress, plot, score_progress
-from subjects.models import Chapter, Lesson, Subject, Unit
+from dashboard.utils import avg_score_progress, is_relevant, score_progress
+from subjects.models import Chapter, Subject, Unit
+
+
+def with_urls(focus_scores, url_name):
+    """adds the url of the dashboard of each focus instance to its scores"""
+    for focus in focus_scores:
+        focus["url"] = reverse(url_name, args=[focus["id"]]) if url_name else None
+    return focus_scores
 
 
 @login_required(login_url="login")
 def main_dashboard_view(request):
     """average graphs for overall, subjects, units, chapters, and lessons"""
-    user = request.user
-
-    overall_progress = avg_score_progress(user, {})
-    subjects_progress = avg_score_progress(user, {"subject__isnull": False})
-    units_progress = avg_score_progress(user, {"unit__isnull": False})
-    chapters_progress = avg_score_progress(user, {"chapter__isnull": False})
-    lessons_progress = avg_score_progress(user, {"lesson__isnull": False})
-
-    context = {
-        "overall_plot_url": plot(
-            "overall_avg_score_progress", overall_progress, user.id
-        ),
-        "subjects_plot_url": plot(
-            "subjects_avg_score_progress", subjects_progress, user.id
-        ),
-        "units_plot_url": plot("units_avg_score_progress", units_progress, user.id),
-        "chapters_plot_url": plot(
-            "chapters_avg_score_progress", chapters_progress, user.id
-        ),
-        "lessons_plot_url": plot(
-            "lessons_avg_score_progress", lessons_progress, user.id
-        ),
-    }
-    return render(request, "dashboard/main_dashboard.html", context)
+    return render(
+        request,
+        "dashboard/main_dashboard.html",
+        {"data_url": reverse("main-dashboard-data")},
+    )
 
 
 @login_required(login_url="login")
 def subject_dashboard_view(request):
     """dashboard for subjects score progress"""
-    user = request.user
-
-    # get all scores of all subjects
-    subjects_scores = score_progress(user, "subject", {})
-    context = {
-        "subjects": [
-            {
-                "id": subject["id"],
-                "title": subject["title"],
-                "plot_url": plot(
-                    f"{subject['title']}_score_progress", subject["scores"], user.id
-                ),
-            }
-            for subject in subjects_scores
-        ]
-    }
-    if not context["subjects"]:
-        context = {
-            "subjects": [
-                {
-                    "id": subject.id,
-                    "title": subject.title,
-                    "plot_url": None,
-                }
-                for subject in list(
-                    set(
-                        [
-                            lesson.chapter.unit.subject
-                            for lesson in Lesson.objects.filter(
-                                grade=user.student.grade
-                            )
-                        ]
-                    )
-                )
-            ]
-        }
-    return render(request, "dashboard/subjects_dashboard.html", context)
+    return render(
+        request,
+        "dashboard/subjects_dashboard.html",
+        {"data_url": reverse("subjects-dashboard-data")},
+    )
 
 
 @login_required(login_url="login")
@@ -87,36 +46,17 @@ def unit_dashboard_view(request, id):
         messages.error(request, "This subject does not exist.")
         return redirect("main-dashboard")
 
-    lessons = Lesson.objects.filter(
-        grade=user.student.grade,
-        semester=CURRENT_SEMESTER,
-        chapter__unit__subject__id=id,
-    )
-    subject = lessons.values_list("chapter__unit__subject", flat=True).distinct()
-    if not subject:
+    if not is_relevant(user, "subject", id):
         messages.error(
             request,
             "This subject is not in your curriculum or it is not available to this semester.",
         )
         return redirect("main-dashboard")
 
-    units_scores = score_progress(user, "unit", {"chapter__unit__subject__id": id})
     context = {
         "subject": Subject.objects.get(id=id),
-        "units": [
-            {
-                "id": unit["id"],
-                "title": unit["title"],
-                "plot_url": (
-                    plot(f"{unit['title']}_score_progress", unit["scores"], user.id)
-                    if unit["scores"]
-                    else None
-                ),
-            }
-            for unit in units_scores
-        ],
+        "data_url": reverse("units-dashboard-data", args=[id]),
     }
-
     return render(request, "dashboard/units_dashboard.html", context)
 
 
@@ -129,34 +69,16 @@ def chapter_dashboard_view(request, id):
         messages.error(request, "This unit does not exist.")
         return redirect("main-dashboard")
 
-    lessons = Lesson.objects.filter(
-        grade=user.student.grade, semester=CURRENT_SEMESTER, chapter__unit__id=id
-    )
-    unit = lessons.values_list("chapter__unit", flat=True).distinct()
-    if not unit:
+    if not is_relevant(user, "unit", id):
         messages.error(
             request,
             "This unit is not in your curriculum or it is not available to this semester.",
         )
         return redirect("main-dashboard")
 
-    chapters_scores = score_progress(user, "chapter", {"chapter__unit__id": id})
     context = {
-        "unit": Unit.objects.get(id=id),
-        "chapters": [
-            {
-                "id": chapter["id"],
-                "title": chapter["title"],
-                "plot_url": (
-                    plot(
-                        f"{chapter['title']}_score_progress", chapter["scores"], user.id
-                    )
-                    if chapter["scores"]
-                    else None
-                ),
-            }
-            for chapter in chapters_scores
-        ],
+        "unit": Unit.objects.select_related("subject").get(id=id),
+        "data_url": reverse("chapters-dashboard-data", args=[id]),
     }
     return render(request, "dashboard/chapters_dashboard.html", context)
 
@@ -169,31 +91,74 @@ def lesson_dashboard_view(request, id):
         messages.error(request, "This chapter does not exist.")
         return redirect("main-dashboard")
 
-    lessons = Lesson.objects.filter(
-        grade=user.student.grade, semester=CURRENT_SEMESTER, chapter__id=id
-    )
-    chapter = lessons.values_list("chapter", flat=True).distinct()
-    if not chapter:
+    if not is_relevant(user, "chapter", id):
         messages.error(
             request,
             "This chapter is not in your curriculum or it is not available to this semester.",
         )
         return redirect("main-dashboard")
 
-    lessons_scores = score_progress(user, "lesson", {"chapter__id": id})
     context = {
-        "chapter": Chapter.objects.get(id=id),
-        "lessons": [
-            {
-                "id": lesson["id"],
-                "title": lesson["title"],
-                "plot_url": (
-                    plot(f"{lesson['title']}_score_progress", lesson["scores"], user.id)
-                    if lesson["scores"]
-                    else None
-                ),
-            }
-            for lesson in lessons_scores
-        ],
+        "chapter": Chapter.objects.select_related("unit__subject").get(id=id),
+        "data_url": reverse("lessons-dashboard-data", args=[id]),
     }
     return render(request, "dashboard/lessons_dashboard.html", context)
+
+
+@login_required(login_url="login")
+@require_GET
+@cache_control(private=True, no_cache=True)
+@conditional_page
+def main_dashboard_data_view(request):
+    """average score progress of overall, subjects, units, chapters, and lessons"""
+    return JsonResponse(
+        avg_score_progress(
+            request.user, ["overall", "subject", "unit", "chapter", "lesson"]
+        )
+    )
+
+
+@login_required(login_url="login")
+@require_GET
+@cache_control(private=True, no_cache=True)
+@conditional_page
+def subject_dashboard_data_view(request):
+    """score progress of each subject"""
+    subjects_scores = score_progress(request.user, "subject")
+    return JsonResponse({"subjects": with_urls(subjects_scores, "units-dashboard")})
+
+
+@login_required(login_url="login")
+@require_GET
+@cache_control(private=True, no_cache=True)
+@conditional_page
+def unit_dashboard_data_view(request, id):
+    """score progress of each unit of this subject"""
+    if not is_relevant(request.user, "subject", id):
+        return JsonResponse({"error": "Subject not found"}, status=404)
+    units_scores = score_progress(request.user, "unit", id)
+    return JsonResponse({"units": with_urls(units_scores, "chapters-dashboard")})
+
+
+@login_required(login_url="login")
+@require_GET
+@cache_control(private=True, no_cache=True)
+@conditional_page
+def chapter_dashboard_data_view(request, id):
+    """score progress of each chapter of this unit"""
+    if not is_relevant(request.user, "unit", id):
+        return JsonResponse({"error": "Unit not found"}, status=404)
+    chapters_scores = score_progress(request.user, "chapter", id)
+    return JsonResponse({"chapters": with_urls(chapters_scores, "lessons-dashboard")})
+
+
+@login_required(login_url="login")
+@require_GET
+@cache_control(private=True, no_cache=True)
+@conditional_page
+def lesson_dashboard_data_view(request, id):
+    """score progress of each lesson of this chapter"""
+    if not is_relevant(request.user, "chapter", id):
+        return JsonResponse({"error": "Chapter not found"}, status=404)
+    lessons_scores = score_progress(request.user, "lesson", id)
+    return JsonResponse({"lessons": with_urls(lessons_scores, None)})
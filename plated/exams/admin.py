@@ -12,6 +12,16 @@ class QuestionInline(admin.TabularInline):
 class ExamAdmin(admin.ModelAdmin):
     inlines = [QuestionInline]
 
+    def save_related(self, request, form, formsets, change):
+        """keeps the stored questions count and score percentage
+        in sync with the questions edited in the inline"""
+        super().save_related(request, form, formsets, change)
+        exam = form.instance
+        exam.question_count = exam.questions.count()
+        if exam.score is not None:
+            exam.set_score(exam.score)
+        exam.save(update_fields=["question_count", "score_percentage"])
+
 
 admin.site.register(Exam, ExamAdmin)
 admin.site.register(StudentAnswer)
@@ -0,0 +1,125 @@
+""" A module for enforcing the duration of the exams,
+the deadline of an exam is set when it is opened the first time,
+the answers submitted or autosaved after it (and a short grace period) are refused.
+
+The exams left unsolved after their deadline are closed in batches
+by the close_overdue_exams command, with set-based queries: their autosaved
+answers are saved as the student answers and scored in the database,
+an exam without any saved answer is closed with a zero score.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from dashboard.progress import record_exam_score
+from exams.models import DraftAnswer, Exam, StudentAnswer
+
+
+def get_grace():
+    """returns the time an answer is still accepted after a deadline"""
+    return datetime.timedelta(seconds=settings.EXAM_DEADLINE_GRACE)
+
+
+def start_exam(exam):
+    """sets the start time and the deadline of an exam opened the first time"""
+    if exam.started_at or not exam.duration:
+        return
+    now = timezone.now()
+    started = Exam.objects.filter(pk=exam.pk, started_at__isnull=True).update(
+        started_at=now, deadline=now + exam.duration
+    )
+    if started:
+        exam.started_at, exam.deadline = now, now + exam.duration
+    else:
+        # opened at the same time in another request
+        exam.refresh_from_db(fields=["started_at", "deadline"])
+
+
+def is_overdue(exam, now=None):
+    """checks if the deadline of an exam has passed, with the grace period"""
+    if exam.deadline is None:
+        return False
+    return (now or timezone.now()) > exam.deadline + get_grace()
+
+
+def get_remaining_seconds(exam):
+    """returns the seconds left until the deadline of an exam, None without one,
+    the page counts down from it rather than from the clock of the browser"""
+    if exam.deadline is None:
+        return None
+    return max(int((exam.deadline - timezone.now()).total_seconds()), 0)
+
+
+def close_exams(ids):
+    """closes the unsolved exams with these ids at their deadlines,
+    grading their autosaved answers, returns the number of closed exams"""
+    with transaction.atomic():
+        # locks the exams, a submission at the same time waits and finds them solved
+        ids = list(
+            Exam.objects.select_for_update(skip_locked=True)
+            .filter(pk__in=ids, solved_at__isnull=True)
+            .values_list("pk", flat=True)
+        )
+        if not ids:
+            return 0
+        drafts = DraftAnswer.objects.filter(exam_id__in=ids)
+        StudentAnswer.objects.bulk_create(
+            [
+                StudentAnswer(
+                    exam_id=exam_id, student_id=student_id, answer_id=answer_id
+                )
+                for exam_id, student_id, answer_id in drafts.values_list(
+                    "exam_id", "exam__student_id", "answer_id"
+                )
+            ]
+        )
+        scores = (
+            drafts.filter(exam=OuterRef("pk"), answer__is_correct=True)
+            .values("exam")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        exams = Exam.objects.filter(pk__in=ids)
+        exams.update(
+            score=Coalesce(Subquery(scores), 0),
+            solved_at=F("deadline"),
+            updated_at=timezone.now(),
+        )
+        exams.filter(question_count__gt=0).update(
+            score_percentage=F("score") * 100.0 / F("question_count")
+        )
+        exams.filter(question_count=0).update(score_percentage=0)
+        drafts.delete()
+
+        # the score progress keeps the scores in the order of solving
+        for exam in exams.order_by("solved_at"):
+            record_exam_score(exam)
+    return len(ids)
+
+
+def close_overdue_exams(batch_size=500, now=None):
+    """closes the exams whose deadline has passed in batches,
+    yields the number of exams closed by each batch"""
+    cutoff = (now or timezone.now()) - get_grace()
+    overdue = Exam.objects.filter(solved_at__isnull=True, deadline__lt=cutoff)
+    while True:
+        ids = list(
+            overdue.order_by("deadline").values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return
+        closed = close_exams(ids)
+        if not closed:
+            # all of them are being submitted right now
+            return
+        yield closed
+
+
+def delete_orphan_drafts():
+    """deletes the drafts autosaved while their exam was being closed"""
+    return DraftAnswer.objects.filter(exam__solved_at__isnull=False).delete()[0]
@@ -0,0 +1,218 @@
+""" A module for exporting the exams and the answers of the students
+for offline analysis, the rows are read in chunks with a server side cursor
+(QuerySet.iterator) and written out chunk by chunk, so the memory used
+by an export does not grow with the number of exported rows.
+
+The rows are written as CSV, or as Parquet when pyarrow is installed,
+a columnar file with one row group per chunk.
+"""
+
+import csv
+import io
+import uuid
+from itertools import islice
+
+from django.utils.dateparse import parse_date
+
+from curriculum.models import Semester
+from exams.models import Exam, StudentAnswer
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# the exported columns of each dataset as (name, lookup, type)
+DATASETS = {
+    "exams": (
+        Exam,
+        "",
+        [
+            ("exam_id", "id", "string"),
+            ("student_id", "student_id", "string"),
+            ("grade_id", "student__grade_id", "string"),
+            ("subject_id", "subject_id", "string"),
+            ("unit_id", "unit_id", "string"),
+            ("chapter_id", "chapter_id", "string"),
+            ("lesson_id", "lesson_id", "string"),
+            ("question_count", "question_count", "int"),
+            ("score", "score", "int"),
+            ("score_percentage", "score_percentage", "float"),
+            ("duration", "duration", "duration"),
+            ("created_at", "created_at", "datetime"),
+            ("solved_at", "solved_at", "datetime"),
+        ],
+    ),
+    "answers": (
+        StudentAnswer,
+        "exam__",
+        [
+            ("exam_id", "exam_id", "string"),
+            ("student_id", "student_id", "string"),
+            ("question_id", "answer__question_id", "string"),
+            ("lesson_id", "answer__question__lesson_id", "string"),
+            ("difficulty", "answer__question__difficulty", "int"),
+            ("answer_id", "answer_id", "string"),
+            ("is_correct", "answer__is_correct", "bool"),
+            ("solved_at", "exam__solved_at", "datetime"),
+        ],
+    ),
+}
+
+# converts the values of each column type to be written
+CONVERTERS = {
+    "string": lambda value: None if value is None else str(value),
+    "int": lambda value: value,
+    "float": lambda value: value,
+    "bool": lambda value: value,
+    # durations are exported in seconds
+    "duration": lambda value: None if value is None else value.total_seconds(),
+    "datetime": lambda value: value,
+}
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class ExportError(Exception):
+    """an export that can not be made"""
+
+
+def parquet_available():
+    """checks if pyarrow is installed to write Parquet files"""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def parse_filters(semester_id=None, since=None, until=None):
+    """returns the semester and the dates to filter the exports by,
+    or raises ExportError if any of them is not valid"""
+    filters = {"semester": None, "since": None, "until": None}
+    if semester_id:
+        try:
+            filters["semester"] = Semester.objects.get(pk=uuid.UUID(semester_id))
+        except (ValueError, Semester.DoesNotExist):
+            raise ExportError(f"unknown semester {semester_id!r}")
+    for name, value in (("since", since), ("until", until)):
+        if not value:
+            continue
+        try:
+            filters[name] = parse_date(value)
+        except ValueError:
+            filters[name] = None
+        if filters[name] is None:
+            raise ExportError(f"{name} must be a date as YYYY-MM-DD")
+    return filters
+
+
+def get_queryset(dataset, semester=None, since=None, until=None):
+    """returns the rows of the dataset, only the exams created
+    in the semester or between since and until dates if given"""
+    if dataset not in DATASETS:
+        raise ExportError(f"unknown dataset {dataset!r}")
+    model, exam_prefix, columns = DATASETS[dataset]
+    queryset = model.objects.all()
+    if semester is not None:
+        since = max(since or semester.starting_date, semester.starting_date)
+        until = min(until or semester.ending_date, semester.ending_date)
+    if since:
+        queryset = queryset.filter(**{f"{exam_prefix}created_at__date__gte": since})
+    if until:
+        queryset = queryset.filter(**{f"{exam_prefix}created_at__date__lte": until})
+    # no ordering, the rows are written in the order the database reads them
+    return queryset.order_by().values_list(*[lookup for _, lookup, _ in columns])
+
+
+def export_chunks(dataset, queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """yields the converted rows of the queryset in lists of chunk_size rows"""
+    converters = [CONVERTERS[type] for _, _, type in DATASETS[dataset][2]]
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(rows, chunk_size)):
+        yield [
+            [convert(value) for convert, value in zip(converters, row)]
+            for row in chunk
+        ]
+
+
+def write_csv(dataset, chunks):
+    """yields the CSV text of the chunks, starting with the header"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _, _ in DATASETS[dataset][2]])
+    yield buffer.getvalue()
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+
+
+class ChunkedSink(io.RawIOBase):
+    """a write only file that keeps the written bytes until they are taken"""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def take(self):
+        """returns the bytes written since the last take"""
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def write_parquet(dataset, chunks):
+    """yields the bytes of a Parquet file with a row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {
+        "string": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "duration": pa.float64(),
+        "datetime": pa.timestamp("us", tz="UTC"),
+    }
+    columns = DATASETS[dataset][2]
+    schema = pa.schema([(name, types[type]) for name, _, type in columns])
+
+    sink = ChunkedSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in chunks:
+            arrays = [
+                pa.array(values, type=field.type)
+                for values, field in zip(zip(*chunk), schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.take()
+    yield sink.take()
+
+
+WRITERS = {
+    "csv": write_csv,
+    "parquet": write_parquet,
+}
+
+
+def export(dataset, format, queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    """yields the pieces of the exported file of the queryset rows"""
+    if format not in WRITERS:
+        raise ExportError(f"unknown format {format!r}")
+    if format == "parquet" and not parquet_available():
+        # raised before streaming starts rather than in the middle of a response
+        raise ExportError("Parquet exports need pyarrow to be installed")
+    return WRITERS[format](dataset, export_chunks(dataset, queryset, chunk_size))
@@ -1,3 +1,5 @@
+import uuid
+
 from django import forms
 
 
@@ -7,14 +9,20 @@ class GenerateExamForm(forms.Form):
 
 
 class ExamForm(forms.Form):
+    # a new token for each rendered form, a repeated submit sends the same token
+    submission_token = forms.UUIDField(widget=forms.HiddenInput(), required=False)
+
     def __init__(self, exam=None, *args, **kwargs):
         super(ExamForm, self).__init__(*args, **kwargs)
+        self.fields["submission_token"].initial = uuid.uuid4()
         q_number = 1
         for question in exam.questions.all():
             self.fields["question_%s" % question.id] = forms.ChoiceField(
                 choices=[(answer.id, answer.body) for answer in question.answers.all()],
                 widget=forms.RadioSelect,
                 label=f"{q_number} ) {question.body}",
+                # the autosaved answers are graded with the unanswered ones
+                required=False,
             )
             q_number += 1
 
@@ -0,0 +1,144 @@
+""" A module for grading the submitted exams,
+all the submitted answers are fetched in one query, scored in memory,
+and the student answers are written with one bulk insert in one transaction
+along with the score progress of the student.
+
+An exam is graded once, the submission claims it with a conditional update
+(solved_at IS NULL) before grading, so of two concurrent submissions
+the second waits for the first to commit and finds it solved.
+The token of the submission is saved with the exam to tell a repeated submit
+of the same form from another submission.
+
+While an exam is being solved, the chosen answers are autosaved as drafts,
+a batch of changes is one upsert, the drafts are graded with the submitted form,
+so no answer is lost if the page is reloaded before submitting.
+"""
+
+import logging
+import time
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+
+from dashboard.progress import record_exam_score
+from exams.models import DraftAnswer, Exam, StudentAnswer
+from questions.models import Answer
+
+logger = logging.getLogger(__name__)
+
+
+def get_submitted_answer_ids(cleaned_data):
+    """returns the ids of the answers chosen in a valid ExamForm"""
+    return [
+        answer_id
+        for field, answer_id in cleaned_data.items()
+        if field.startswith("question_") and answer_id
+    ]
+
+
+def parse_draft_answers(data):
+    """returns the {question id: answer id or None} of an autosave request body,
+    or raises ValueError if it is not valid"""
+    answers = data.get("answers") if isinstance(data, dict) else None
+    if not isinstance(answers, dict):
+        raise ValueError("answers must be an object")
+    return {
+        uuid.UUID(question_id): uuid.UUID(answer_id) if answer_id else None
+        for question_id, answer_id in answers.items()
+    }
+
+
+def save_draft_answers(exam, answers):
+    """upserts the draft answers of an exam from {question id: answer id},
+    a None answer clears the draft of its question, the answers that are not
+    of their question in the exam are ignored, returns the number of saved answers"""
+    chosen = {answer_id for answer_id in answers.values() if answer_id}
+    valid = dict(
+        Answer.objects.filter(pk__in=chosen, question__exam=exam).values_list(
+            "pk", "question_id"
+        )
+    )
+    drafts = [
+        DraftAnswer(exam=exam, question_id=question_id, answer_id=answer_id)
+        for question_id, answer_id in answers.items()
+        if answer_id and valid.get(answer_id) == question_id
+    ]
+    cleared = [
+        question_id for question_id, answer_id in answers.items() if not answer_id
+    ]
+    if cleared:
+        DraftAnswer.objects.filter(exam=exam, question_id__in=cleared).delete()
+    DraftAnswer.objects.bulk_create(
+        drafts,
+        update_conflicts=True,
+        unique_fields=["exam", "question"],
+        update_fields=["answer", "updated_at"],
+    )
+    return len(drafts)
+
+
+def get_draft_answers(exam):
+    """returns the draft answer ids of an exam by their question ids"""
+    return dict(
+        DraftAnswer.objects.filter(exam=exam).values_list("question_id", "answer_id")
+    )
+
+
+def is_resubmission(exam, token):
+    """checks if the token is the token of the submission that solved the exam"""
+    return bool(token) and str(exam.submission_token) == str(token)
+
+
+def grade_exam(exam, student, answer_ids, token=None):
+    """scores the submitted answers and saves them with the exam score,
+    returns the score of the exam, an exam that is already solved
+    is not graded again, it is refreshed with its saved result"""
+    started = time.perf_counter()
+
+    with transaction.atomic():
+        now = timezone.now()
+        claimed = Exam.objects.filter(pk=exam.pk, solved_at__isnull=True).update(
+            solved_at=now, submission_token=token, updated_at=now
+        )
+        if not claimed:
+            exam.refresh_from_db(
+                fields=["score", "score_percentage", "solved_at", "submission_token"]
+            )
+            logger.info("exam %s is already solved, not graded again", exam.pk)
+            return exam.score
+
+        # the submitted answers replace the drafts of their questions,
+        # only answers of the exam questions are accepted
+        drafts = get_draft_answers(exam)
+        submitted = {str(answer_id) for answer_id in answer_ids}
+        chosen = {}
+        for answer in Answer.objects.filter(
+            pk__in=[*drafts.values(), *submitted], question__exam=exam
+        ).only("id", "is_correct", "question_id"):
+            if answer.question_id not in chosen or str(answer.pk) in submitted:
+                chosen[answer.question_id] = answer
+        answers = list(chosen.values())
+        score = sum(1 for answer in answers if answer.is_correct)
+        StudentAnswer.objects.bulk_create(
+            [
+                StudentAnswer(exam=exam, student=student, answer=answer)
+                for answer in answers
+            ]
+        )
+        exam.set_score(score)
+        exam.solved_at = now
+        exam.submission_token = token
+        exam.save(update_fields=["score", "score_percentage"])
+        record_exam_score(exam)
+        if drafts:
+            DraftAnswer.objects.filter(exam=exam).delete()
+
+    logger.info(
+        "graded exam %s: %d answers, score %d, in %.2f ms",
+        exam.pk,
+        len(answers),
+        score,
+        (time.perf_counter() - started) * 1000,
+    )
+    return score
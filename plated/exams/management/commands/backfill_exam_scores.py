@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from exams.models import Exam
+
+
+class Command(BaseCommand):
+    help = "Stores the questions count and the score percentage of the existing exams"
+
+    def handle(self, *args, **kwargs):
+        question_counts = (
+            Exam.questions.through.objects.filter(exam=OuterRef("pk"))
+            .values("exam")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        solved_exams = Exam.objects.filter(score__isnull=False)
+        with transaction.atomic():
+            counted = Exam.objects.update(
+                question_count=Coalesce(Subquery(question_counts), 0)
+            )
+            scored = solved_exams.filter(question_count__gt=0).update(
+                score_percentage=F("score") * 100.0 / F("question_count")
+            )
+            scored += solved_exams.filter(question_count=0).update(score_percentage=0)
+        self.stdout.write(f"{counted} exams counted, {scored} exams scored")
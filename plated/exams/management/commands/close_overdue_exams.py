@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from exams.deadlines import close_overdue_exams, delete_orphan_drafts
+
+
+class Command(BaseCommand):
+    help = (
+        "Closes the exams left unsolved after their deadline, grading their"
+        " autosaved answers, meant to run every few minutes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="number of exams closed in one transaction",
+        )
+
+    def handle(self, *args, **kwargs):
+        started = time.perf_counter()
+        closed = 0
+        for count in close_overdue_exams(kwargs["batch_size"]):
+            closed += count
+            self.stdout.write(f"{closed} exams closed")
+        deleted = delete_orphan_drafts()
+        self.stdout.write(
+            f"{closed} overdue exams closed, {deleted} orphan drafts deleted"
+            f" in {time.perf_counter() - started:.1f} s"
+        )
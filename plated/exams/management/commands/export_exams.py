@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from exams.export import (
+    DATASETS,
+    DEFAULT_CHUNK_SIZE,
+    WRITERS,
+    ExportError,
+    export,
+    get_queryset,
+    parse_filters,
+)
+
+
+class Command(BaseCommand):
+    help = "Exports the exams or the answers of the students as CSV or Parquet"
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=DATASETS)
+        parser.add_argument("--format", choices=WRITERS, default="csv")
+        parser.add_argument(
+            "--output", help="the exported file, <dataset>.<format> by default"
+        )
+        parser.add_argument("--semester", help="only the exams of this semester id")
+        parser.add_argument("--since", help="only the exams created since this date")
+        parser.add_argument("--until", help="only the exams created until this date")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="number of rows read from the database at once",
+        )
+
+    def handle(self, *args, **kwargs):
+        dataset, format = kwargs["dataset"], kwargs["format"]
+        output = kwargs["output"] or f"{dataset}.{format}"
+        started = time.perf_counter()
+        try:
+            filters = parse_filters(
+                kwargs["semester"], kwargs["since"], kwargs["until"]
+            )
+            content = export(
+                dataset,
+                format,
+                get_queryset(dataset, **filters),
+                kwargs["chunk_size"],
+            )
+            size = 0
+            with open(output, "wb") as file:
+                for piece in content:
+                    if isinstance(piece, str):
+                        piece = piece.encode()
+                    file.write(piece)
+                    size += len(piece)
+        except ExportError as error:
+            raise CommandError(error)
+        self.stdout.write(
+            f"{output}: {size / 1024 / 1024:.1f} MB"
+            f" in {time.perf_counter() - started:.1f} s"
+        )
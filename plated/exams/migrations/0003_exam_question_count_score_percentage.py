@@ -0,0 +1,23 @@
+# Generated by Django 5.0.7 on 2026-10-18 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0002_alter_exam_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exam",
+            name="question_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="exam",
+            name="score_percentage",
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
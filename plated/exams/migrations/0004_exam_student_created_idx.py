@@ -0,0 +1,19 @@
+# Generated by Django 5.0.7 on 2026-10-18 19:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0003_exam_question_count_score_percentage"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="exam",
+            index=models.Index(
+                fields=["student", "created_at", "id"], name="exam_student_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.0.7 on 2026-10-18 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0004_exam_student_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exam",
+            name="focus_type",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(subject__isnull=False, then=models.Value("subject")),
+                    models.When(unit__isnull=False, then=models.Value("unit")),
+                    models.When(chapter__isnull=False, then=models.Value("chapter")),
+                    models.When(lesson__isnull=False, then=models.Value("lesson")),
+                    default=None,
+                    output_field=models.CharField(max_length=8),
+                ),
+                output_field=models.CharField(max_length=8, null=True),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exam",
+            index=models.Index(
+                fields=["student", "focus_type", "created_at", "id"],
+                name="exam_student_focus_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exam",
+            index=models.Index(
+                condition=models.Q(("solved_at__isnull", False)),
+                fields=["student", "created_at", "id"],
+                name="exam_student_solved_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exam",
+            index=models.Index(
+                condition=models.Q(("solved_at__isnull", True)),
+                fields=["student", "created_at", "id"],
+                name="exam_student_unsolved_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exam",
+            index=models.Index(
+                condition=models.Q(("solved_at__isnull", False)),
+                fields=["student", "focus_type", "created_at", "id"],
+                name="exam_focus_solved_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exam",
+            index=models.Index(
+                condition=models.Q(("solved_at__isnull", True)),
+                fields=["student", "focus_type", "created_at", "id"],
+                name="exam_focus_unsolved_idx",
+            ),
+        ),
+    ]
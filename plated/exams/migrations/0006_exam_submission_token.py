@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-18 19:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0005_exam_focus_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exam",
+            name="submission_token",
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.7 on 2026-10-18 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0007_draft_answer"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exam",
+            name="deadline",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="exam",
+            name="started_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="exam",
+            index=models.Index(
+                condition=models.Q(
+                    ("deadline__isnull", False), ("solved_at__isnull", True)
+                ),
+                fields=["deadline"],
+                name="exam_open_deadline_idx",
+            ),
+        ),
+    ]
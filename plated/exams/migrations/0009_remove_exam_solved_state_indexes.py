@@ -0,0 +1,29 @@
+# Generated by Django 5.0.7 on 2026-10-18 19:50
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exams", "0008_exam_deadline"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="exam",
+            name="exam_student_solved_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="exam",
+            name="exam_student_unsolved_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="exam",
+            name="exam_focus_solved_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="exam",
+            name="exam_focus_unsolved_idx",
+        ),
+    ]
@@ -1,6 +1,8 @@
 from datetime import timedelta
 
 from django.db import models
+from django.db.models import Avg, Case, Count, Max, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 
 from core.models import BaseModel
 from questions.models import Answer, Question
@@ -8,6 +10,29 @@ from subjects.models import Chapter, Lesson, Subject, Unit
 from users.models import Student
 
 
+class ExamQuerySet(models.QuerySet):
+    def score_summary(self):
+        """returns the average, best, and latest score percentage
+        and the count of the solved exams in one aggregate query"""
+        solved = self.filter(score__isnull=False)
+        latest_solved_at = solved.order_by("-solved_at").values("solved_at")[:1]
+        return solved.aggregate(
+            average=Coalesce(Avg("score_percentage"), 0.0),
+            best=Coalesce(Max("score_percentage"), 0.0),
+            latest=Coalesce(
+                Max(
+                    "score_percentage",
+                    filter=Q(solved_at=Subquery(latest_solved_at)),
+                ),
+                0.0,
+            ),
+            count=Count("id"),
+        )
+
+
+FOCUSES = ("subject", "unit", "chapter", "lesson")
+
+
 class Exam(BaseModel):
     """exams table"""
 
@@ -52,25 +77,83 @@ class Exam(BaseModel):
     )
     duration = models.DurationField(default=timedelta(hours=1), null=True, blank=True)
     questions = models.ManyToManyField(Question)
+    # stored with the exam to avoid counting its questions on each access
+    question_count = models.PositiveIntegerField(default=0)
     score = models.IntegerField(null=True, blank=True)
+    score_percentage = models.FloatField(null=True, blank=True)
+    # the token of the form submission that solved the exam
+    submission_token = models.UUIDField(null=True, blank=True, editable=False)
+    # set when the exam is opened the first time, the answers are accepted
+    # until the deadline, then the exam is closed with its autosaved answers
+    started_at = models.DateTimeField(null=True, blank=True)
+    deadline = models.DateTimeField(null=True, blank=True)
+    # computed by the database from the focus column that is set,
+    # to filter the exams of a focus with one index range scan
+    focus_type = models.GeneratedField(
+        expression=Case(
+            *[
+                When(**{f"{focus}__isnull": False}, then=Value(focus))
+                for focus in FOCUSES
+            ],
+            default=None,
+            output_field=models.CharField(max_length=8),
+        ),
+        output_field=models.CharField(max_length=8, null=True),
+        db_persist=True,
+    )
+
+    objects = ExamQuerySet.as_manager()
+
+    @property
+    def focus(self):
+        """returns the focus of the exam (subject, unit, chapter, or lesson)"""
+        for focus in FOCUSES:
+            if getattr(self, f"{focus}_id"):
+                return focus
+        return None
+
+    @property
+    def focus_id(self):
+        """returns the id of the focus instance of the exam"""
+        return getattr(self, f"{self.focus}_id") if self.focus else None
 
     @property
     def max_score(self):
         """returns the maximum score of the exam"""
-        return self.questions.count()
+        return self.question_count
 
-    @property
-    def score_percentage(self):
-        """returns the score as a percentage for the exam"""
-        if self.max_score == 0:
-            return 0
-        return (self.score / self.max_score) * 100
+    def set_score(self, score):
+        """sets the score of the exam and its percentage of the questions count"""
+        self.score = score
+        if self.question_count == 0:
+            self.score_percentage = 0
+        else:
+            self.score_percentage = (score / self.question_count) * 100
 
     def __str__(self):
         return f"Exam on {self.subject or self.unit or self.chapter or self.lesson}"
 
     class Meta:
         ordering = ["-created_at"]
+        # the exam list of a student is read by cursor on (created_at, id),
+        # each filter of the list has an index in this order, the solved state
+        # is filtered on the rows of these ranges
+        indexes = [
+            models.Index(
+                fields=["student", "created_at", "id"],
+                name="exam_student_created_idx",
+            ),
+            models.Index(
+                fields=["student", "focus_type", "created_at", "id"],
+                name="exam_student_focus_idx",
+            ),
+            # the started exams that are not solved yet by their deadline
+            models.Index(
+                fields=["deadline"],
+                condition=Q(solved_at__isnull=True, deadline__isnull=False),
+                name="exam_open_deadline_idx",
+            ),
+        ]
 
 
 class StudentAnswer(models.Model):
@@ -86,3 +169,29 @@ class StudentAnswer(models.Model):
 
     def __str__(self):
         return f"{self.exam.student} answered {self.answer} in {self.exam}"
+
+
+class DraftAnswer(models.Model):
+    """draft_answers table
+
+    holds the answers chosen while an exam is being solved, one row per question,
+    they are graded with the submitted form and deleted when the exam is graded
+    """
+
+    exam = models.ForeignKey(
+        Exam, on_delete=models.CASCADE, related_name="draft_answers"
+    )
+    # only the (exam, question) index is kept, the table holds few rows
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, db_index=False)
+    answer = models.ForeignKey(Answer, on_delete=models.CASCADE, db_index=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["exam", "question"], name="draft_answer_exam_question"
+            ),
+        ]
+
+    def __str__(self):
+        return f"draft {self.answer_id} in {self.exam_id}"
@@ -0,0 +1,51 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from curriculum.models import Curriculum, Grade
+from exams.models import Exam
+from subjects.models import Subject
+from users.models import Student
+
+
+class ExamScoreSummaryTestCase(TestCase):
+    def setUp(self) -> None:
+        curriculum = Curriculum.objects.create()
+        grade = Grade.objects.create(title="Grade 1", curriculum=curriculum)
+        self.subject = Subject.objects.create(title="Mathematics", grade=grade)
+        user = User.objects.create_user("student", password="password")
+        self.student = Student.objects.create(user=user, grade=grade)
+
+    def create_exam(self, score: int | None, days_ago: int = 0) -> Exam:
+        exam = Exam(student=self.student, subject=self.subject, question_count=10)
+        if score is not None:
+            exam.set_score(score)
+            exam.solved_at = timezone.now() - datetime.timedelta(days=days_ago)
+        exam.save()
+        return exam
+
+    def test_set_score(self) -> None:
+        exam = self.create_exam(7)
+        self.assertEqual(exam.score, 7)
+        self.assertEqual(exam.score_percentage, 70)
+        self.assertEqual(exam.max_score, 10)
+
+    def test_score_summary(self) -> None:
+        self.create_exam(9, days_ago=2)
+        self.create_exam(4, days_ago=1)
+        self.create_exam(5, days_ago=0)
+        self.create_exam(None)
+        with self.assertNumQueries(1):
+            summary = Exam.objects.filter(student=self.student).score_summary()
+        self.assertEqual(
+            summary, {"average": 60.0, "best": 90.0, "latest": 50.0, "count": 3}
+        )
+
+    def test_score_summary_without_solved_exams(self) -> None:
+        self.create_exam(None)
+        summary = Exam.objects.filter(student=self.student).score_summary()
+        self.assertEqual(
+            summary, {"average": 0.0, "best": 0.0, "latest": 0.0, "count": 0}
+        )
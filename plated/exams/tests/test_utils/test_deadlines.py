@@ -0,0 +1,136 @@
+import datetime
+import json
+import uuid
+from io import StringIO
+
+from django.contrib.messages import get_messages
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.testing import StudentTestCase
+from dashboard.models import ScoreProgress
+from exams.deadlines import close_overdue_exams
+from exams.models import DraftAnswer, Exam, StudentAnswer
+from questions.models import Answer, Question
+
+
+@override_settings(EXAM_DEADLINE_GRACE=30)
+class DeadlinesTestCase(StudentTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.questions = []
+        for i in range(2):
+            question = Question.objects.create(
+                body=f"Question {i}", difficulty=1, lesson=self.lesson
+            )
+            right = Answer.objects.create(
+                body="right", is_correct=True, question=question
+            )
+            wrong = Answer.objects.create(body="wrong", question=question)
+            self.questions.append((question, right, wrong))
+
+    def create_exam(self, deadline_ago=None, drafts=()) -> Exam:
+        """returns an exam started with its deadline deadline_ago in the past,
+        with the draft answers of the given (question, answer) indexes"""
+        exam = Exam.objects.create(
+            student=self.student,
+            lesson=self.lesson,
+            question_count=len(self.questions),
+            duration=datetime.timedelta(minutes=10),
+        )
+        exam.questions.set([question for question, _, _ in self.questions])
+        if deadline_ago is not None:
+            exam.deadline = timezone.now() - deadline_ago
+            exam.started_at = exam.deadline - exam.duration
+            exam.save(update_fields=["deadline", "started_at"])
+        for question_index, answer_index in drafts:
+            question = self.questions[question_index]
+            DraftAnswer.objects.create(
+                exam=exam, question=question[0], answer=question[answer_index]
+            )
+        return exam
+
+    def test_deadline_is_set_when_the_exam_is_opened(self) -> None:
+        exam = self.create_exam()
+        response = self.client.get(reverse("exam", args=[exam.id]))
+        exam.refresh_from_db()
+        self.assertEqual(exam.deadline - exam.started_at, exam.duration)
+        self.assertEqual(response.context["remaining_seconds"], 599)
+        deadline = exam.deadline
+        # opening it again keeps the deadline
+        self.client.get(reverse("exam", args=[exam.id]))
+        exam.refresh_from_db()
+        self.assertEqual(exam.deadline, deadline)
+
+    def test_late_submit_grades_the_autosaved_answers(self) -> None:
+        exam = self.create_exam(datetime.timedelta(minutes=1), drafts=[(0, 2)])
+        _, right, _ = self.questions[0]
+        response = self.client.post(
+            reverse("exam", args=[exam.id]),
+            {
+                f"question_{right.question_id}": right.id,
+                "submission_token": uuid.uuid4(),
+            },
+        )
+        self.assertRedirects(
+            response,
+            reverse("solved-exam", args=[exam.id]),
+            fetch_redirect_response=False,
+        )
+        levels = [message.level_tag for message in get_messages(response.wsgi_request)]
+        self.assertEqual(levels, ["warning"])
+        exam.refresh_from_db()
+        self.assertEqual(exam.score, 0)
+        self.assertEqual(exam.solved_at, exam.deadline)
+
+    def test_submit_in_the_grace_period(self) -> None:
+        exam = self.create_exam(datetime.timedelta(seconds=10))
+        _, right, _ = self.questions[0]
+        self.client.post(
+            reverse("exam", args=[exam.id]), {f"question_{right.question_id}": right.id}
+        )
+        exam.refresh_from_db()
+        self.assertEqual(exam.score, 1)
+
+    def test_late_autosave_is_refused(self) -> None:
+        exam = self.create_exam(datetime.timedelta(minutes=1))
+        question, right, _ = self.questions[0]
+        response = self.client.post(
+            reverse("exam-autosave", args=[exam.id]),
+            json.dumps({"answers": {str(question.id): str(right.id)}}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(DraftAnswer.objects.exists())
+
+    def test_close_overdue_exams(self) -> None:
+        graded = [
+            self.create_exam(datetime.timedelta(minutes=5), drafts=[(0, 1), (1, 1)]),
+            self.create_exam(datetime.timedelta(minutes=4), drafts=[(0, 1), (1, 2)]),
+            self.create_exam(datetime.timedelta(minutes=3)),
+        ]
+        in_grace = self.create_exam(datetime.timedelta(seconds=10), drafts=[(0, 1)])
+        running = self.create_exam(-datetime.timedelta(minutes=5))
+        not_started = self.create_exam()
+
+        self.assertEqual(list(close_overdue_exams(batch_size=2)), [2, 1])
+        scores = [Exam.objects.get(pk=exam.pk).score for exam in graded]
+        self.assertEqual(scores, [2, 1, 0])
+        for exam in (in_grace, running, not_started):
+            self.assertIsNone(Exam.objects.get(pk=exam.pk).solved_at)
+        self.assertEqual(StudentAnswer.objects.count(), 4)
+        self.assertEqual(DraftAnswer.objects.filter(exam=in_grace).count(), 1)
+        self.assertEqual(DraftAnswer.objects.count(), 1)
+        progress = ScoreProgress.objects.get(student=self.student, focus="overall")
+        self.assertEqual(progress.scores, [100.0, 50.0, 0.0])
+
+    def test_close_overdue_exams_command(self) -> None:
+        exam = self.create_exam(datetime.timedelta(minutes=5), drafts=[(0, 1)])
+        out = StringIO()
+        call_command("close_overdue_exams", stdout=out)
+        self.assertIn("1 overdue exams closed", out.getvalue())
+        exam.refresh_from_db()
+        self.assertEqual(exam.score, 1)
+        self.assertEqual(exam.score_percentage, 50)
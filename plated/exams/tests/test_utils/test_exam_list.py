@@ -0,0 +1,127 @@
+import base64
+import datetime
+
+from django.urls import reverse
+from django.utils import timezone
+
+from core.instrumentation import measure
+from core.pagination import decode_cursor, encode_cursor, paginate_by_cursor
+from core.testing import StudentTestCase
+from exams.models import Exam
+from exams.utils import exam_list_filter
+from exams.views import EXAM_LIST_ORDERING
+
+
+class ExamListTestCase(StudentTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+
+        now = timezone.now()
+        for number in range(30):
+            focus = {"lesson": self.lesson} if number % 2 else {"subject": self.subject}
+            exam = Exam.objects.create(student=self.student, **focus)
+            # every three exams have the same creation time
+            Exam.objects.filter(pk=exam.pk).update(
+                created_at=now - datetime.timedelta(minutes=number // 3)
+            )
+
+    def read_all(self, queryset, per_page: int) -> list:
+        """returns the ids of all the pages read forward"""
+        ids, after = [], None
+        while True:
+            page = paginate_by_cursor(
+                queryset, EXAM_LIST_ORDERING, per_page, after=after
+            )
+            ids += [exam.id for exam in page]
+            if not page.has_next:
+                return ids
+            after = page.next_cursor
+
+    def test_pages_cover_the_list_in_order(self) -> None:
+        exams = Exam.objects.filter(student=self.student)
+        expected = list(
+            exams.order_by(*EXAM_LIST_ORDERING).values_list("id", flat=True)
+        )
+        for per_page in (1, 4, 7, 30, 50):
+            self.assertEqual(self.read_all(exams, per_page), expected)
+
+    def test_previous_page(self) -> None:
+        exams = Exam.objects.filter(student=self.student)
+        first = paginate_by_cursor(exams, EXAM_LIST_ORDERING, 7)
+        self.assertFalse(first.has_previous)
+        second = paginate_by_cursor(
+            exams, EXAM_LIST_ORDERING, 7, after=first.next_cursor
+        )
+        self.assertTrue(second.has_previous)
+        back = paginate_by_cursor(
+            exams, EXAM_LIST_ORDERING, 7, before=second.previous_cursor
+        )
+        self.assertEqual(list(back), list(first))
+        self.assertFalse(back.has_previous)
+
+    def test_cursor_round_trip(self) -> None:
+        exam = Exam.objects.first()
+        values = decode_cursor(encode_cursor(exam, EXAM_LIST_ORDERING), ["a", "b"])
+        self.assertEqual(values[0], exam.created_at)
+        self.assertEqual(values[1], str(exam.id))
+
+    def test_invalid_cursor_is_the_first_page(self) -> None:
+        # a cursor with values of the wrong types
+        tampered = base64.urlsafe_b64encode(b'["x","y"]').decode()
+        for cursor in ("not a cursor", tampered):
+            response = self.client.get(reverse("exams"), {"after": cursor})
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.context["exams"].has_previous)
+
+    def test_view_with_filters(self) -> None:
+        url = reverse("exams")
+        params = {"focus": "lesson", "filter_id": self.lesson.id}
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            page = response.context["exams"]
+            ids += [exam.id for exam in page]
+            self.assertTrue(all(exam.lesson_id == self.lesson.id for exam in page))
+            if not page.has_next:
+                break
+            # the filters are kept in the link to the next page
+            self.assertIn("focus=lesson", response.context["url"])
+            response = self.client.get(url, {**params, "after": page.next_cursor})
+        self.assertEqual(len(ids), 15)
+        self.assertEqual(len(set(ids)), 15)
+
+    def test_deep_page_queries(self) -> None:
+        url = reverse("exams")
+        self.client.get(url)
+        with measure() as first:
+            response = self.client.get(url)
+        after = response.context["exams"].next_cursor
+        response = self.client.get(url, {"after": after})
+        after = response.context["exams"].next_cursor
+        with measure() as deep:
+            self.client.get(url, {"after": after})
+        # no COUNT(*) and no query per exam
+        deep.check(max_queries=first.query_count)
+        self.assertFalse(any("COUNT(" in sql for sql in deep.queries))
+
+    def test_focus_type_is_computed(self) -> None:
+        Exam.objects.bulk_create([Exam(student=self.student, lesson=self.lesson)])
+        for exam in Exam.objects.all():
+            self.assertEqual(exam.focus_type, exam.focus)
+
+    def test_filter_combinations(self) -> None:
+        solved = Exam.objects.filter(lesson=self.lesson).values_list("id", flat=True)[
+            :5
+        ]
+        Exam.objects.filter(id__in=list(solved)).update(solved_at=timezone.now())
+        exams = Exam.objects.filter(student=self.student)
+        for focus in (None, "subject", "lesson"):
+            for is_solved in (None, "true", "false"):
+                expected = {
+                    exam.id
+                    for exam in exams
+                    if focus in (None, exam.focus)
+                    and is_solved in (None, str(exam.solved_at is not None).lower())
+                }
+                filtered = exam_list_filter(exams, focus, None, is_solved)
+                self.assertEqual(set(filtered.values_list("id", flat=True)), expected)
@@ -0,0 +1,88 @@
+import csv
+import datetime
+import io
+import unittest
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from curriculum.models import Curriculum, Grade
+from exams.export import export, get_queryset, parquet_available
+from exams.grading import grade_exam
+from exams.models import Exam
+from questions.models import Answer, Question
+from subjects.models import Chapter, Lesson, Subject, Unit
+from users.models import Student
+
+
+class ExportTestCase(TestCase):
+    def setUp(self) -> None:
+        curriculum = Curriculum.objects.create()
+        grade = Grade.objects.create(title="Grade 1", curriculum=curriculum)
+        subject = Subject.objects.create(title="Mathematics", grade=grade)
+        unit = Unit.objects.create(title="Algebra", subject=subject)
+        chapter = Chapter.objects.create(title="Linear Equations", unit=unit)
+        lesson = Lesson.objects.create(title="Solving", chapter=chapter)
+        user = User.objects.create_user("student", password="password")
+        self.student = Student.objects.create(user=user, grade=grade)
+        self.exams = []
+        for _ in range(3):
+            exam = Exam.objects.create(
+                student=self.student, subject=subject, question_count=2
+            )
+            answer_ids = []
+            for i in range(2):
+                question = Question.objects.create(
+                    body=f"Question {i}", difficulty=2, lesson=lesson
+                )
+                answer = Answer.objects.create(
+                    body="right", is_correct=i == 0, question=question
+                )
+                answer_ids.append(answer.id)
+                exam.questions.add(question)
+            grade_exam(exam, self.student, answer_ids)
+            self.exams.append(exam)
+
+    def read_csv(self, content) -> list[dict]:
+        return list(csv.DictReader(io.StringIO("".join(content))))
+
+    def test_export_answers_csv_in_chunks(self) -> None:
+        content = list(export("answers", "csv", get_queryset("answers"), 2))
+        # the header and one piece per chunk of two rows
+        self.assertEqual(len(content), 4)
+        rows = self.read_csv(content)
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(sum(row["is_correct"] == "True" for row in rows), 3)
+        self.assertEqual({row["difficulty"] for row in rows}, {"2"})
+
+    def test_export_exams_filtered_by_dates(self) -> None:
+        Exam.objects.filter(id=self.exams[0].id).update(
+            created_at=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        )
+        queryset = get_queryset("exams", since=datetime.date(2021, 1, 1))
+        rows = self.read_csv(export("exams", "csv", queryset))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["score_percentage"], "50.0")
+        self.assertEqual(rows[0]["duration"], "3600.0")
+
+    @unittest.skipUnless(parquet_available(), "pyarrow is not installed")
+    def test_export_parquet(self) -> None:
+        import pyarrow.parquet as pq
+
+        content = b"".join(export("answers", "parquet", get_queryset("answers"), 4))
+        table = pq.read_table(io.BytesIO(content))
+        self.assertEqual(table.num_rows, 6)
+        self.assertEqual(pq.ParquetFile(io.BytesIO(content)).num_row_groups, 2)
+
+    def test_export_view_is_for_staff_only(self) -> None:
+        url = reverse("export-exams", args=["exams"])
+        self.client.force_login(self.student.user)
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        staff = User.objects.create_user("staff", password="password", is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.read_csv(map(bytes.decode, response))), 3)
+        self.assertEqual(self.client.get(f"{url}?since=never").status_code, 400)
@@ -0,0 +1,192 @@
+import json
+import uuid
+
+from django.contrib.messages import get_messages
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.http import HttpResponse
+from django.urls import reverse
+
+from core.testing import StudentTestCase
+from dashboard.models import ScoreProgress
+from exams.grading import grade_exam
+from exams.models import DraftAnswer, Exam, StudentAnswer
+from questions.models import Answer, Question
+
+
+class GradeExamTestCase(StudentTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.exam = Exam.objects.create(
+            student=self.student, lesson=self.lesson, question_count=3
+        )
+        self.question_ids, self.correct_ids, self.wrong_ids = [], [], []
+        for i in range(3):
+            question = Question.objects.create(
+                body=f"Question {i}", difficulty=1, lesson=self.lesson
+            )
+            self.correct_ids.append(
+                Answer.objects.create(
+                    body="right", is_correct=True, question=question
+                ).id
+            )
+            self.wrong_ids.append(
+                Answer.objects.create(body="wrong", question=question).id
+            )
+            self.exam.questions.add(question)
+            self.question_ids.append(question.id)
+
+    def submit(self, answer_ids: list, token: str) -> str:
+        """posts the exam form, returns the level of the message it added"""
+        data = {}
+        for answer in Answer.objects.filter(pk__in=answer_ids):
+            data[f"question_{answer.question_id}"] = str(answer.id)
+        response = self.client.post(
+            reverse("exam", args=[self.exam.id]), {**data, "submission_token": token}
+        )
+        self.assertRedirects(
+            response,
+            reverse("solved-exam", args=[self.exam.id]),
+            fetch_redirect_response=False,
+        )
+        return list(get_messages(response.wsgi_request))[-1].level_tag
+
+    def test_grade_exam_saves_the_score_and_the_answers(self) -> None:
+        answer_ids = [*self.correct_ids[:2], self.wrong_ids[2]]
+        self.assertEqual(grade_exam(self.exam, self.student, answer_ids), 2)
+        self.exam.refresh_from_db()
+        self.assertEqual(self.exam.score, 2)
+        self.assertAlmostEqual(self.exam.score_percentage, 200 / 3)
+        self.assertIsNotNone(self.exam.solved_at)
+        self.assertEqual(
+            set(
+                StudentAnswer.objects.filter(
+                    exam=self.exam, student=self.student
+                ).values_list("answer_id", flat=True)
+            ),
+            set(answer_ids),
+        )
+
+    def test_answers_of_other_exams_are_ignored(self) -> None:
+        other = Question.objects.create(body="other", difficulty=1, lesson=self.lesson)
+        other_answer = Answer.objects.create(
+            body="right", is_correct=True, question=other
+        )
+        score = grade_exam(
+            self.exam, self.student, [self.correct_ids[0], other_answer.id]
+        )
+        self.assertEqual(score, 1)
+        self.assertEqual(
+            list(StudentAnswer.objects.values_list("answer_id", flat=True)),
+            [self.correct_ids[0]],
+        )
+
+    def count_grading_queries(self, exam: Exam, answer_ids: list) -> int:
+        """returns the number of queries grading ran, without the savepoints"""
+        with CaptureQueriesContext(connection) as context:
+            grade_exam(exam, self.student, answer_ids)
+        return sum(
+            1 for query in context.captured_queries if "SAVEPOINT" not in query["sql"]
+        )
+
+    def test_grading_queries_do_not_grow_with_the_answers(self) -> None:
+        # claim, drafts, answers, insert, score, progress lock and write,
+        # the first grading of the student also creates the progress rows
+        self.assertEqual(self.count_grading_queries(self.exam, self.correct_ids), 9)
+        exam = Exam.objects.create(
+            student=self.student, lesson=self.lesson, question_count=1
+        )
+        exam.questions.add(self.question_ids[0])
+        self.assertEqual(self.count_grading_queries(exam, self.correct_ids[:1]), 7)
+
+    def test_concurrent_grading_grades_once(self) -> None:
+        # two submissions loaded the exam before any of them solved it
+        first = Exam.objects.get(pk=self.exam.pk)
+        second = Exam.objects.get(pk=self.exam.pk)
+        token = uuid.uuid4()
+        self.assertEqual(grade_exam(first, self.student, self.correct_ids, token), 3)
+        with CaptureQueriesContext(connection) as context:
+            score = grade_exam(second, self.student, self.wrong_ids, uuid.uuid4())
+        # the second one gets the result of the first without grading
+        self.assertEqual(score, 3)
+        self.assertFalse(
+            any(
+                "questions_answer" in query["sql"] for query in context.captured_queries
+            )
+        )
+        self.assertEqual(second.submission_token, token)
+        self.assertEqual(StudentAnswer.objects.filter(exam=self.exam).count(), 3)
+        progress = ScoreProgress.objects.get(student=self.student, focus="overall")
+        self.assertEqual(progress.exams_count, 1)
+
+    def test_repeated_submit_returns_the_first_result(self) -> None:
+        token = str(uuid.uuid4())
+        self.assertEqual(self.submit(self.correct_ids, token), "success")
+        self.assertEqual(self.submit(self.wrong_ids, token), "success")
+        self.exam.refresh_from_db()
+        self.assertEqual(self.exam.score, 3)
+        self.assertEqual(StudentAnswer.objects.filter(exam=self.exam).count(), 3)
+
+    def test_another_submit_of_a_solved_exam(self) -> None:
+        self.submit(self.correct_ids, str(uuid.uuid4()))
+        self.assertEqual(self.submit(self.wrong_ids, str(uuid.uuid4())), "error")
+        self.exam.refresh_from_db()
+        self.assertEqual(self.exam.score, 3)
+
+    def autosave(self, answers: dict) -> HttpResponse:
+        return self.client.post(
+            reverse("exam-autosave", args=[self.exam.id]),
+            json.dumps({"answers": answers}),
+            content_type="application/json",
+        )
+
+    def test_autosaved_answers_are_graded(self) -> None:
+        response = self.autosave({str(self.question_ids[0]): str(self.wrong_ids[0])})
+        self.assertEqual(response.json(), {"success": True, "saved": 1})
+        # a batch of changes is one upsert
+        with CaptureQueriesContext(connection) as context:
+            response = self.autosave(
+                {
+                    str(self.question_ids[0]): str(self.correct_ids[0]),
+                    str(self.question_ids[1]): str(self.correct_ids[1]),
+                }
+            )
+        self.assertEqual(response.json()["saved"], 2)
+        inserts = [
+            q for q in context.captured_queries if "exams_draftanswer" in q["sql"]
+        ]
+        self.assertEqual(len(inserts), 1)
+        # the reloaded page starts with the drafts
+        response = self.client.get(reverse("exam", args=[self.exam.id]))
+        self.assertEqual(
+            response.context["form"].initial[f"question_{self.question_ids[1]}"],
+            self.correct_ids[1],
+        )
+
+        # the submitted answer of the third question is graded with the drafts
+        self.submit([self.wrong_ids[2]], str(uuid.uuid4()))
+        self.exam.refresh_from_db()
+        self.assertEqual(self.exam.score, 2)
+        self.assertEqual(StudentAnswer.objects.filter(exam=self.exam).count(), 3)
+        self.assertFalse(DraftAnswer.objects.exists())
+        self.assertEqual(self.autosave({}).status_code, 409)
+
+    def test_autosave_ignores_answers_of_other_questions(self) -> None:
+        # the answer of the second question as the answer of the first one
+        response = self.autosave({str(self.question_ids[0]): str(self.correct_ids[1])})
+        self.assertEqual(response.json()["saved"], 0)
+        self.autosave({str(self.question_ids[0]): str(self.correct_ids[0])})
+        # null clears the draft of the question
+        self.autosave({str(self.question_ids[0]): None})
+        self.assertFalse(DraftAnswer.objects.exists())
+
+    def test_autosave_invalid_requests(self) -> None:
+        self.assertEqual(self.autosave({"not a uuid": "x"}).status_code, 400)
+        response = self.client.post(
+            reverse("exam-autosave", args=[self.exam.id]),
+            "[]",
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.client.force_login(self.create_student("other").user)
+        self.assertEqual(self.autosave({}).status_code, 404)
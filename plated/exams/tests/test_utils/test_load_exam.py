@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.testing import StudentTestCase
+from curriculum.utils import get_current_semester
+from exams.grading import grade_exam
+from exams.models import Exam
+from exams.utils import get_solved_questions, load_exam
+from questions.models import Answer, Question
+
+
+class LoadExamTestCase(StudentTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        # resolve the running semester before counting the queries of the views
+        get_current_semester()
+
+    def create_exam(self, questions_count: int) -> Exam:
+        exam = Exam.objects.create(
+            student=self.student,
+            subject=self.subject,
+            question_count=questions_count,
+        )
+        for i in range(questions_count):
+            question = Question.objects.create(
+                body=f"Question {i}", difficulty=1, lesson=self.lesson
+            )
+            Answer.objects.create(body="right", is_correct=True, question=question)
+            Answer.objects.create(body="wrong", question=question)
+            exam.questions.add(question)
+        return exam
+
+    def solve_exam(self, exam: Exam) -> None:
+        answer_ids = [
+            question.answers.get(is_correct=True).id
+            for question in exam.questions.all()
+        ]
+        grade_exam(exam, self.student, answer_ids)
+
+    def count_queries(self, func) -> int:
+        with CaptureQueriesContext(connection) as context:
+            func()
+        return len(context.captured_queries)
+
+    def test_load_exam_queries(self) -> None:
+        exam = self.create_exam(5)
+        self.solve_exam(exam)
+        with self.assertNumQueries(4):
+            loaded = load_exam(exam.id)
+            questions = get_solved_questions(loaded)
+            for question in questions:
+                self.assertEqual(len(question["answers"]), 2)
+                self.assertTrue(question["student_answer"].answer.is_correct)
+            self.assertEqual(loaded.max_score, 5)
+            self.assertEqual(loaded.student.first_name, "John")
+            self.assertEqual(loaded.subject, self.subject)
+
+    def test_exam_view_queries_do_not_grow_with_questions(self) -> None:
+        small_exam = self.create_exam(2)
+        large_exam = self.create_exam(50)
+        small = self.count_queries(
+            lambda: self.client.get(reverse("exam", args=[small_exam.id]))
+        )
+        large = self.count_queries(
+            lambda: self.client.get(reverse("exam", args=[large_exam.id]))
+        )
+        self.assertEqual(small, large)
+
+    def test_solved_exam_view_queries_do_not_grow_with_questions(self) -> None:
+        small_exam = self.create_exam(2)
+        large_exam = self.create_exam(50)
+        self.solve_exam(small_exam)
+        self.solve_exam(large_exam)
+        small = self.count_queries(
+            lambda: self.client.get(reverse("solved-exam", args=[small_exam.id]))
+        )
+        large = self.count_queries(
+            lambda: self.client.get(reverse("solved-exam", args=[large_exam.id]))
+        )
+        self.assertEqual(small, large)
+
+    def test_solved_exam_view_renders_student_answers(self) -> None:
+        exam = self.create_exam(3)
+        self.solve_exam(exam)
+        response = self.client.get(reverse("solved-exam", args=[exam.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "alert-success", count=3)
+        self.assertNotContains(response, "alert-danger")
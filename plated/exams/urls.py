@@ -1,9 +1,11 @@
 from django.urls import path
 
 from exams.views import (
+    autosave_exam,
     delete_exam,
     exam,
     exam_list,
+    export_exams,
     generate_exam,
     get_focus_instances,
     solved_exam,
@@ -15,5 +17,7 @@ urlpatterns = [
     path("<uuid:id>/solved/", solved_exam, name="solved-exam"),
     path("<uuid:id>/delete/", delete_exam, name="delete-exam"),
     path("<uuid:id>/", exam, name="exam"),
+    path("<uuid:id>/autosave/", autosave_exam, name="exam-autosave"),
     path("get-focus-instances/", get_focus_instances, name="get-focus-instances"),
+    path("export/<str:dataset>/", export_exams, name="export-exams"),
 ]
@@ -1,11 +1,15 @@
-import random
 from datetime import timedelta
 
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 
+from curriculum.utils import get_current_semester
+from questions.models import Question
+from questions.sampling import get_sampler
 from subjects.models import Chapter, Lesson, Subject, Unit
+from subjects.tree import get_curriculum_tree
 
-from .models import Exam
+from .models import Exam, StudentAnswer
 
 # model mapper
 models = {
@@ -39,39 +43,64 @@ def exam_kwargs(student, focus, id):
     return kwargs
 
 
-# gets all the questions related to the focus (lesson, chapter, unit, or subject)
-def get_all_relevant_questions(grade, focus, id):
-    focus_instance = get_object_or_404(models[focus], pk=id)
-    return focus_instance.questions
-
-
 # pass only a specific number of questions to the exam
-def get_exam_questions(grade, focus, id):
-    """gets random questions for the new exam"""
+def get_exam_questions(focus, id, seed=None):
+    """gets random question ids for the new exam"""
     questions_per_exam = {
         "subject": 50,
         "unit": 40,
         "chapter": 25,
         "lesson": 10,
     }
-    all_questions = get_all_relevant_questions(grade, focus, id)
-    if len(all_questions) < questions_per_exam[focus]:
-        return all_questions
-    return all_questions.limit(questions_per_exam[focus])
+    return get_sampler().sample(focus, id, questions_per_exam[focus], seed=seed)
 
 
 # generate a new exam
 def new_exam(student, focus, id):
     """create and return a new exam"""
-    questions = get_exam_questions(student.grade, focus, id)
-    if not questions.exists():
+    exam = Exam(**exam_kwargs(student, focus, id))
+    # seed the sampler with the exam id so its questions can be reproduced
+    questions = get_exam_questions(focus, getattr(exam, focus).pk, seed=exam.id.int)
+    if not questions:
         return None
-    exam = Exam.objects.create(**exam_kwargs(student, focus, id))
-    exam.questions.set(questions)
+    exam.question_count = len(questions)
     exam.save()
+    exam.questions.set(questions)
     return exam
 
 
+def load_exam(id):
+    """returns the exam with its student, focus, questions, their answers,
+    and the answers of the student in a constant number of queries"""
+    exams = Exam.objects.select_related(
+        "student__user", "subject", "unit", "chapter", "lesson"
+    ).prefetch_related(
+        Prefetch("questions", queryset=Question.objects.prefetch_related("answers")),
+        Prefetch(
+            "studentanswer_set",
+            queryset=StudentAnswer.objects.select_related("answer"),
+            to_attr="student_answers",
+        ),
+    )
+    return get_object_or_404(exams, pk=id)
+
+
+def get_solved_questions(exam):
+    """returns the questions of a loaded exam with the answer of the student to each"""
+    student_answers = {
+        student_answer.answer.question_id: student_answer
+        for student_answer in exam.student_answers
+    }
+    return [
+        {
+            "body": question.body,
+            "answers": question.answers.all(),
+            "student_answer": student_answers.get(question.id),
+        }
+        for question in exam.questions.all()
+    ]
+
+
 def get_exam_title(exam):
     """returns a title for the exam"""
     exam_by = f"{exam.student.first_name} {exam.student.last_name}"
@@ -86,35 +115,15 @@ def get_exam_title(exam):
 # get the options for the for input based on the focus
 def get_options(grade, focus):
     """returns instance for the for input options based on focus"""
-    from curriculum.context_processors import CURRENT_SEMESTER
-
-    lessons = Lesson.objects.filter(grade=grade, semester=CURRENT_SEMESTER)
-    focus_instances = {
-        "subject": {
-            lesson.chapter.unit.subject
-            for lesson in lessons.select_related("chapter__unit__subject")
-        },
-        "unit": {
-            lesson.chapter.unit for lesson in lessons.select_related("chapter__unit")
-        },
-        "chapter": {lesson.chapter for lesson in lessons.select_related("chapter")},
-        "lesson": lessons,
-    }
-    return focus_instances[focus]
+    return get_curriculum_tree(grade, get_current_semester()).instances(focus)
 
 
 def exam_list_filter(exams, focus, on, is_solved):
     """apply the filter to exams list"""
-    focus_condition = {
-        "subject": {"unit": None, "chapter": None, "lesson": None},
-        "unit": {"subject": None, "chapter": None, "lesson": None},
-        "chapter": {"unit": None, "subject": None, "lesson": None},
-        "lesson": {"unit": None, "chapter": None, "subject": None},
-    }
-    if focus:
-        exams = exams.filter(**focus_condition[focus])
+    if focus in models:
+        exams = exams.filter(focus_type=focus)
         if on:
-            exams = exams.filter(**{focus: models[focus].objects.get(pk=on)})
+            exams = exams.filter(**{f"{focus}_id": on})
     if is_solved == "true":
         exams = exams.filter(solved_at__isnull=False)
     elif is_solved == "false":
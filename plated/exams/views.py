@@ -1,19 +1,46 @@
+import json
+
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
-from django.http import JsonResponse
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils import timezone
-from django.views.decorators.cache import cache_page
+from django.views.decorators.http import require_POST, require_safe
 
+from core.cache import cache_view
+from core.pagination import paginate_by_cursor
+from exams.deadlines import (
+    close_exams,
+    get_remaining_seconds,
+    is_overdue,
+    start_exam,
+)
+from exams.export import CONTENT_TYPES, ExportError, export, get_queryset, parse_filters
 from exams.forms import ExamForm
-from exams.models import Exam, StudentAnswer
-from exams.utils import exam_list_filter, get_exam_title, get_options, new_exam
-from questions.models import Answer
+from exams.grading import (
+    get_draft_answers,
+    get_submitted_answer_ids,
+    grade_exam,
+    is_resubmission,
+    parse_draft_answers,
+    save_draft_answers,
+)
+from exams.models import Exam
+from exams.utils import (
+    exam_list_filter,
+    get_exam_title,
+    get_options,
+    get_solved_questions,
+    load_exam,
+    new_exam,
+)
+
+EXAM_LIST_PAGE_SIZE = 12
+# the newest exams first, the id breaks the ties of the same creation time
+EXAM_LIST_ORDERING = ("-created_at", "-id")
 
 
 @login_required(login_url="login")
-@cache_page(60 * 60)
 def generate_exam(request):
     focus = request.POST.get("focus")
     id = request.POST.get("id")
@@ -29,52 +56,104 @@ def generate_exam(request):
 
 
 @login_required(login_url="login")
-@cache_page(60 * 60)
 def exam(request, id):
     """view for solving the exam"""
-    exam = get_object_or_404(Exam, pk=id)
+    exam = load_exam(id)
     if exam.student != request.user.student:
         messages.error(request, "You are not allowed to view this exam.")
         return redirect("exams")
+    token = request.POST.get("submission_token")
     if exam.solved_at:
-        messages.error(request, "This exam has already been solved.")
+        if request.method == "POST" and is_resubmission(exam, token):
+            # a repeated submit of the same form gets the result of the first one
+            messages.success(request, "Your answers have been corrected successfully.")
+        else:
+            messages.error(request, "This exam has already been solved.")
+        return redirect("solved-exam", id=exam.id)
+    if is_overdue(exam):
+        # only the answers autosaved before the deadline are graded
+        close_exams([exam.id])
+        messages.warning(
+            request,
+            "The time of this exam is over, the answers saved before it were graded.",
+        )
         return redirect("solved-exam", id=exam.id)
     if request.method == "POST":
         form = ExamForm(exam, request.POST)
         if form.is_valid():
-            score = 0
-            for question in exam.questions.all():
-                answer_id = form.cleaned_data["question_%s" % question.id]
-                answer = get_object_or_404(Answer, pk=answer_id)
-                student_answer = StudentAnswer.objects.create(
-                    exam=exam, student=request.user.student, answer=answer
+            token = form.cleaned_data["submission_token"]
+            grade_exam(
+                exam,
+                request.user.student,
+                get_submitted_answer_ids(form.cleaned_data),
+                token,
+            )
+            # the exam may have been solved by another submission meanwhile
+            if is_resubmission(exam, token):
+                messages.success(
+                    request, "Your answers have been corrected successfully."
                 )
-                student_answer.save()
-                if answer.is_correct:
-                    score += 1
-            exam.score = score
-            exam.solved_at = timezone.now()
-            exam.save()
-            messages.success(request, "Your answers have been corrected successfully.")
+            else:
+                messages.error(request, "This exam has already been solved.")
             return redirect("solved-exam", id=exam.id)
         else:
             messages.error(
-                "Something went wrong while correcting your answers. Please try again later."
+                request,
+                "Something went wrong while correcting your answers. Please try again later.",
             )
             return redirect("exams")
 
+    start_exam(exam)
+    # the form starts with the autosaved answers after the page is reloaded
+    initial = {
+        f"question_{question_id}": answer_id
+        for question_id, answer_id in get_draft_answers(exam).items()
+    }
     return render(
         request,
         "exams/exam.html",
-        {"exam": exam, "title": get_exam_title(exam), "form": ExamForm(exam)},
+        {
+            "exam": exam,
+            "title": get_exam_title(exam),
+            "form": ExamForm(exam, initial=initial),
+            "remaining_seconds": get_remaining_seconds(exam),
+        },
     )
 
 
 @login_required(login_url="login")
-@cache_page(60 * 60)
+@require_POST
+def autosave_exam(request, id):
+    """view to save the answers of an exam being solved as drafts,
+    the body is {"answers": {question id: answer id or null}}"""
+    exam = get_object_or_404(
+        Exam.objects.only("id", "solved_at", "deadline"),
+        pk=id,
+        student__user=request.user,
+    )
+    if exam.solved_at:
+        return JsonResponse(
+            {"success": False, "error": "This exam has already been solved."},
+            status=409,
+        )
+    if is_overdue(exam):
+        return JsonResponse(
+            {"success": False, "error": "The time of this exam is over."},
+            status=409,
+        )
+    try:
+        answers = parse_draft_answers(json.loads(request.body))
+    except (ValueError, TypeError, AttributeError):
+        return JsonResponse({"success": False, "error": "Invalid answers"}, status=400)
+    saved = save_draft_answers(exam, answers)
+    return JsonResponse({"success": True, "saved": saved})
+
+
+@login_required(login_url="login")
+@cache_view(60 * 60)
 def solved_exam(request, id):
     """view a soleved exam"""
-    exam = Exam.objects.get(id=id)
+    exam = load_exam(id)
     if exam.student != request.user.student:
         messages.error(request, "You are not allowed to view this exam.")
         return redirect("exams")
@@ -84,47 +163,40 @@ def solved_exam(request, id):
     context = {
         "exam": exam,
         "title": get_exam_title(exam),
-        "questions": [
-            {
-                "body": question.body,
-                "answers": question.answers.all(),
-                "student_answer": StudentAnswer.objects.filter(
-                    student=request.user.student, exam=exam, answer__question=question
-                ).first(),
-            }
-            for question in exam.questions.all()
-        ],
+        "questions": get_solved_questions(exam),
     }
     return render(request, "exams/solved_exam.html", context)
 
 
 @login_required(login_url="login")
 def exam_list(request):
-    print(request.build_absolute_uri().split("page=")[0])
+    """view for the exams of the student, paginated by cursor"""
     focus = request.GET.get("focus")
     on = request.GET.get("filter_id")
     is_solved = request.GET.get("is_solved")
-    all_exams = Exam.objects.filter(student=request.user.student).order_by(
-        "-created_at"
+    all_exams = Exam.objects.filter(student=request.user.student).select_related(
+        "subject", "unit", "chapter", "lesson"
     )
     if focus or on or is_solved:
         all_exams = exam_list_filter(all_exams, focus, on, is_solved)
-    paginator = Paginator(all_exams, 12)
-    page_number = request.GET.get("page")
-    page_exams = paginator.get_page(page_number)
-    url = request.build_absolute_uri().split("page=")[0]
-    if url.endswith("/"):
-        url = url + "?"
-    elif url.endswith("?") or url.endswith("&"):
-        url = url
-    else:
-        url = url + "&"
+    page_exams = paginate_by_cursor(
+        all_exams,
+        EXAM_LIST_ORDERING,
+        EXAM_LIST_PAGE_SIZE,
+        after=request.GET.get("after"),
+        before=request.GET.get("before"),
+    )
+    # the filters are kept in the links to the other pages
+    query = request.GET.copy()
+    for key in ("after", "before", "page"):
+        query.pop(key, None)
+    url = f"?{query.urlencode()}&" if query else "?"
     return render(
         request,
         "exams/exam_list.html",
         {
             "exams": page_exams,
-            "grade_id": request.user.student.grade.id,
+            "grade_id": request.user.student.grade_id,
             "url": url,
         },
     )
@@ -137,16 +209,34 @@ def delete_exam(request, id):
     return redirect("exams")
 
 
-@cache_page(60 * 60)
+@cache_view(60 * 60, per_user=False)
 def get_focus_instances(request):
     """view to update the for input options according to the focus input sellected option"""
     from curriculum.models import Grade
 
     focus = request.GET.get("focus")
     grade_id = request.GET.get("grade")
-    print(focus, grade_id)
     grade = get_object_or_404(Grade, pk=grade_id)
     options = get_options(grade, focus)
     return JsonResponse(
         {"options": [{"id": option.id, "name": str(option)} for option in options]}
     )
+
+
+@staff_member_required(login_url="login")
+@require_safe
+def export_exams(request, dataset):
+    """view to stream the exams or the answers of the students as CSV or Parquet"""
+    format = request.GET.get("format", "csv")
+    try:
+        filters = parse_filters(
+            request.GET.get("semester"),
+            request.GET.get("since"),
+            request.GET.get("until"),
+        )
+        content = export(dataset, format, get_queryset(dataset, **filters))
+    except ExportError as error:
+        return HttpResponseBadRequest(str(error))
+    response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[format])
+    response["Content-Disposition"] = f'attachment; filename="{dataset}.{format}"'
+    return response
@@ -0,0 +1,20 @@
+from django.urls import reverse
+
+from core.instrumentation import measure
+from core.testing import StudentTestCase
+from exams.models import Exam
+
+
+class HomeTestCase(StudentTestCase):
+    def test_exam_focuses_are_loaded_with_the_exams(self) -> None:
+        for focus in ("subject", "unit", "chapter", "lesson"):
+            Exam.objects.create(student=self.student, **{focus: getattr(self, focus)})
+            solved = Exam(student=self.student, question_count=2)
+            setattr(solved, focus, getattr(self, focus))
+            solved.set_score(1)
+            solved.save()
+        self.client.get(reverse("home"))
+        with measure() as metrics:
+            response = self.client.get(reverse("home"))
+        self.assertContains(response, self.chapter.title)
+        metrics.check()
@@ -2,7 +2,6 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect, render
 
-from dashboard.utils import avg
 from exams.models import Exam
 
 
@@ -14,7 +13,10 @@ def home(request):
         messages.error("This user has no students.")
         redirect("login")
     student = request.user.student
-    all_exams = Exam.objects.filter(student=student)
+    # the cards show the focus of each exam
+    all_exams = Exam.objects.filter(student=student).select_related(
+        "subject", "unit", "chapter", "lesson"
+    )
 
     # get recent 3 solved exams
     solved_exams = all_exams.filter(score__isnull=False).order_by("-solved_at")
@@ -24,8 +26,7 @@ def home(request):
     unsolved_exams = all_exams.filter(score__isnull=True).order_by("-created_at")[:6]
 
     # get average score of all solved exams by this student and color it based on the score
-    average_scores = [exam.score_percentage for exam in solved_exams]
-    average_score = avg(average_scores)
+    average_score = all_exams.score_summary()["average"]
     score_color = "red" if average_score < 75 else "green"
 
     return render(
@@ -57,6 +57,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # first to measure the whole request, only used with REQUEST_INSTRUMENTATION
+    "core.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -103,6 +105,20 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": env(
+            "CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": env("CACHE_LOCATION", default="plated"),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -147,6 +163,39 @@ STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 MEDIA_URL = "/media/"
 
+# the header handing the media files off to the front proxy,
+# "X-Accel-Redirect" (nginx) or "X-Sendfile" (Apache), None to serve them from django
+SENDFILE_HEADER = env("SENDFILE_HEADER", default=None)
+# the internal location of MEDIA_ROOT in the front proxy for X-Accel-Redirect
+SENDFILE_URL_PREFIX = env("SENDFILE_URL_PREFIX", default="/protected-media/")
+
+# the number of worker processes resizing the uploaded covers,
+# 0 resizes them in the process saving the cover
+IMAGE_PROCESSING_WORKERS = env.int("IMAGE_PROCESSING_WORKERS", default=2)
+
+# the seconds an exam answer is still accepted after the deadline of the exam,
+# for the answers sent right before it
+EXAM_DEADLINE_GRACE = env.int("EXAM_DEADLINE_GRACE", default=30)
+
+# the seconds the item statistics wait before counting the answers of a graded exam,
+# longer than a grading transaction so its answers are committed by then
+ITEM_STATISTICS_LAG = env.int("ITEM_STATISTICS_LAG", default=300)
+
+# records the queries, cache lookups, and render time of each request,
+# in the response headers and in the logs of the "core.instrumentation" logger
+REQUEST_INSTRUMENTATION = env.bool("REQUEST_INSTRUMENTATION", default=False)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core.instrumentation": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
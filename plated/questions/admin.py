@@ -1,7 +1,7 @@
 import nested_admin
 from django.contrib import admin
 
-from .models import Answer, Question
+from .models import Answer, Question, QuestionStatistics
 
 
 # make answers nestable in questions
@@ -23,5 +23,16 @@ class QuestionInline(nested_admin.NestedTabularInline):
     extra = 0
 
 
+# the item statistics are computed by the item_statistics command
+class QuestionStatisticsAdmin(admin.ModelAdmin):
+    list_display = ["question", "responses", "p_value", "discrimination", "updated_at"]
+    ordering = ["discrimination"]
+    readonly_fields = ["question", "choices", "p_value", "discrimination"]
+
+    def has_add_permission(self, request):
+        return False
+
+
 admin.site.register(Question, QuestionAdmin)
 admin.site.register(Answer)
+admin.site.register(QuestionStatistics, QuestionStatisticsAdmin)
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from questions.models import QuestionStatistics
+from questions.statistics import DEFAULT_CHUNK_SIZE, ItemStatisticsJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Adds the answers given since the last run to the item statistics"
+        " (p value, discrimination, and choices) of their questions"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="compute the statistics again from all the answers",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="number of answers read from the database at once",
+        )
+
+    def handle(self, *args, **kwargs):
+        started = time.perf_counter()
+        job = ItemStatisticsJob(kwargs["chunk_size"])
+        if kwargs["rebuild"]:
+            # the deleted answers can only be taken out of the sums by a rebuild
+            QuestionStatistics.objects.all().delete()
+        answers = job.run()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{answers} answers of {len(job.questions.index)} questions counted"
+            f" in {elapsed:.1f} s, up to answer {job.last_answer_id}"
+        )
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.7 on 2026-10-18 10:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("questions", "0002_alter_question_options_alter_answer_body"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="question",
+            options={},
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.7 on 2026-10-18 18:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("questions", "0003_alter_question_options"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuestionStatistics",
+            fields=[
+                (
+                    "question",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="statistics",
+                        serialize=False,
+                        to="questions.question",
+                    ),
+                ),
+                ("responses", models.PositiveIntegerField(default=0)),
+                ("correct", models.PositiveIntegerField(default=0)),
+                ("rest_responses", models.PositiveIntegerField(default=0)),
+                ("rest_correct", models.PositiveIntegerField(default=0)),
+                ("rest_score_sum", models.FloatField(default=0)),
+                ("rest_score_squares", models.FloatField(default=0)),
+                ("correct_rest_score_sum", models.FloatField(default=0)),
+                ("choices", models.JSONField(default=dict)),
+                ("p_value", models.FloatField(blank=True, null=True)),
+                ("discrimination", models.FloatField(blank=True, null=True)),
+                ("last_answer_id", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "question statistics",
+            },
+        ),
+    ]
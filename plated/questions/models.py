@@ -19,12 +19,16 @@ class Question(BaseModel):
     )
     graph = models.ImageField(upload_to="questions_graphs/", null=True, blank=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # the loaded lesson tells which lesson a moved question leaves
+        instance._loaded_lesson_id = dict(zip(field_names, values)).get("lesson_id")
+        return instance
+
     def __str__(self):
         return self.body[:50]
 
-    class Meta:
-        ordering = ["?"]
-
 
 class Answer(BaseModel):
     """answers table"""
@@ -38,3 +42,41 @@ class Answer(BaseModel):
 
     def __str__(self):
         return self.body
+
+
+class QuestionStatistics(models.Model):
+    """question_statistics table, updated by the item_statistics command"""
+
+    question = models.OneToOneField(
+        Question,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="statistics",
+    )
+    # the running sums the statistics are computed from
+    responses = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    # the same over the answers in exams of more than one question,
+    # with the score percentage of the rest of the exam
+    rest_responses = models.PositiveIntegerField(default=0)
+    rest_correct = models.PositiveIntegerField(default=0)
+    rest_score_sum = models.FloatField(default=0)
+    rest_score_squares = models.FloatField(default=0)
+    correct_rest_score_sum = models.FloatField(default=0)
+    # the number of times each answer was chosen by its id
+    choices = models.JSONField(default=dict)
+
+    # the correct rate of the question
+    p_value = models.FloatField(null=True, blank=True)
+    # the point-biserial correlation of answering correctly and the rest score
+    discrimination = models.FloatField(null=True, blank=True)
+
+    # the last student answer counted in the sums
+    last_answer_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "question statistics"
+
+    def __str__(self):
+        return f"Statistics of {self.question}"
@@ -0,0 +1,245 @@
+""" A module for sampling random questions of a lesson, chapter, unit, or subject
+without sorting the questions table randomly (ORDER BY RANDOM()).
+
+The ids of the questions of each scope are cached, and the sample is picked
+from the cached list by a random generator seeded per exam, so the same seed
+reproduces the same questions.
+
+The stratified sampler (the default) spreads the questions of an exam
+over the lessons of its scope and the difficulty levels, from the cached
+ids of the questions of each lesson bucketed by difficulty.
+"""
+
+import math
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+from questions.models import Question
+
+# scope condition mapper
+scope_condition = {
+    "subject": "lesson__chapter__unit__subject",
+    "unit": "lesson__chapter__unit",
+    "chapter": "lesson__chapter",
+    "lesson": "lesson",
+}
+
+
+def question_ids_cache_key(scope, scope_id):
+    """returns the cache key of the question ids of a scope"""
+    return f"questions:ids:{scope}:{scope_id}"
+
+
+class CachedIdSampler:
+    """samples question ids from a cached list of the scope question ids"""
+
+    timeout = 60 * 60 * 24
+
+    def get_question_ids(self, scope, scope_id):
+        """returns the ids of all the questions of the scope"""
+        key = question_ids_cache_key(scope, scope_id)
+        question_ids = cache.get(key)
+        if question_ids is None:
+            question_ids = list(
+                Question.objects.filter(**{scope_condition[scope]: scope_id})
+                .order_by("id")
+                .values_list("id", flat=True)
+            )
+            cache.set(key, question_ids, self.timeout)
+        return question_ids
+
+    def sample(self, scope, scope_id, count, seed=None):
+        """returns at most count random question ids of the scope"""
+        question_ids = self.get_question_ids(scope, scope_id)
+        if len(question_ids) <= count:
+            return list(question_ids)
+        return random.Random(seed).sample(question_ids, count)
+
+
+# the share of each difficulty level in an exam
+DIFFICULTY_MIX = {1: 0.3, 2: 0.4, 3: 0.2, 4: 0.1}
+
+# lesson condition mapper
+lesson_condition = {
+    "subject": "chapter__unit__subject",
+    "unit": "chapter__unit",
+    "chapter": "chapter",
+}
+
+
+def question_buckets_cache_key(lesson_id):
+    """returns the cache key of the question ids of a lesson by difficulty"""
+    return f"questions:buckets:{lesson_id}"
+
+
+def apportion(total, weights, capacities):
+    """splits total over the cells in proportion to their weights
+    without giving any cell more than its capacity,
+    the shares are fractions in the order of the cells"""
+    shares = {}
+    cells = {cell for cell, weight in weights.items() if weight and capacities[cell]}
+    left = min(total, sum(capacities[cell] for cell in cells))
+    while cells:
+        weight_sum = sum(weights[cell] for cell in cells)
+        full = {
+            cell
+            for cell in cells
+            if left * weights[cell] / weight_sum >= capacities[cell]
+        }
+        if not full:
+            for cell in cells:
+                shares[cell] = left * weights[cell] / weight_sum
+            break
+        # the full cells take their capacity and the rest is split again
+        for cell in full:
+            shares[cell] = capacities[cell]
+            left -= capacities[cell]
+        cells -= full
+    return {cell: shares[cell] for cell in weights if cell in shares}
+
+
+def round_shares(shares, rng):
+    """rounds the fractional shares to counts of the same total,
+    each share rounded up or down with the chance of its fraction
+    (systematic sampling), so small shares are not always rounded away"""
+    counts = {}
+    offset = rng.random()
+    start = 0
+    cumulative = 0.0
+    for cell, share in shares.items():
+        cumulative = round(cumulative + share, 9)
+        end = math.ceil(cumulative - offset)
+        counts[cell] = end - start
+        start = end
+    return counts
+
+
+class StratifiedSampler:
+    """samples question ids spread over the lessons of the scope equally
+    and over the difficulty levels by DIFFICULTY_MIX,
+    from cached buckets of the question ids of each lesson and difficulty"""
+
+    timeout = 60 * 60 * 24
+
+    def get_lesson_ids(self, scope, scope_id):
+        """returns the ids of the lessons of the scope in syllabus order"""
+        from core.cache import get_curriculum_version
+        from subjects.models import Lesson
+
+        if scope == "lesson":
+            return [Lesson._meta.pk.to_python(scope_id)]
+        key = f"questions:lessons:{scope}:{scope_id}:{get_curriculum_version()}"
+        lesson_ids = cache.get(key)
+        if lesson_ids is None:
+            lesson_ids = list(
+                Lesson.objects.filter(**{lesson_condition[scope]: scope_id})
+                .order_by(
+                    "chapter__unit__order_in_syllabus",
+                    "chapter__order_in_syllabus",
+                    "order_in_syllabus",
+                    "id",
+                )
+                .values_list("id", flat=True)
+            )
+            cache.set(key, lesson_ids, self.timeout)
+        return lesson_ids
+
+    def get_buckets(self, lesson_ids):
+        """returns the question ids of each lesson by difficulty,
+        the lessons missing from the cache are loaded with one query"""
+        keys = {question_buckets_cache_key(id): id for id in lesson_ids}
+        cached = cache.get_many(keys)
+        buckets = {keys[key]: lesson_buckets for key, lesson_buckets in cached.items()}
+        missing = [id for key, id in keys.items() if key not in cached]
+        if missing:
+            loaded = {id: {} for id in missing}
+            questions = (
+                Question.objects.filter(lesson_id__in=missing)
+                .order_by("id")
+                .values_list("lesson_id", "difficulty", "id")
+            )
+            for lesson_id, difficulty, id in questions:
+                loaded[lesson_id].setdefault(difficulty, []).append(id)
+            cache.set_many(
+                {question_buckets_cache_key(id): loaded[id] for id in missing},
+                self.timeout,
+            )
+            buckets.update(loaded)
+        return buckets
+
+    def get_shares(self, lesson_ids, buckets, count):
+        """returns the fractional number of questions of each lesson and difficulty,
+        the lessons get equal shares which are split by the difficulty mix"""
+        mix = getattr(settings, "QUESTION_DIFFICULTY_MIX", DIFFICULTY_MIX)
+        lesson_shares = apportion(
+            count,
+            {lesson_id: 1 for lesson_id in lesson_ids},
+            {
+                lesson_id: sum(map(len, buckets[lesson_id].values()))
+                for lesson_id in lesson_ids
+            },
+        )
+        shares = {}
+        for lesson_id, lesson_share in lesson_shares.items():
+            difficulties = sorted(buckets[lesson_id])
+            difficulty_shares = apportion(
+                lesson_share,
+                # a difficulty out of the mix is only used if the others run out
+                {
+                    difficulty: mix.get(difficulty) or 1e-6
+                    for difficulty in difficulties
+                },
+                {
+                    difficulty: len(buckets[lesson_id][difficulty])
+                    for difficulty in difficulties
+                },
+            )
+            for difficulty, share in difficulty_shares.items():
+                shares[(lesson_id, difficulty)] = share
+        return shares
+
+    def sample(self, scope, scope_id, count, seed=None):
+        """returns at most count random question ids of the scope"""
+        lesson_ids = self.get_lesson_ids(scope, scope_id)
+        buckets = self.get_buckets(lesson_ids)
+        rng = random.Random(seed)
+        counts = round_shares(self.get_shares(lesson_ids, buckets, count), rng)
+        question_ids = []
+        for (lesson_id, difficulty), cell_count in counts.items():
+            if cell_count:
+                bucket = buckets[lesson_id][difficulty]
+                question_ids += rng.sample(bucket, cell_count)
+        return question_ids
+
+
+def get_sampler():
+    """returns the sampler set in QUESTION_SAMPLER setting"""
+    sampler = getattr(
+        settings, "QUESTION_SAMPLER", "questions.sampling.StratifiedSampler"
+    )
+    return import_string(sampler)()
+
+
+def invalidate_question_ids(lesson_id):
+    """removes the cached question ids of a lesson and all its parents,
+    and the question buckets of the lesson"""
+    from subjects.models import Lesson
+
+    parents = (
+        Lesson.objects.filter(pk=lesson_id)
+        .values_list("chapter_id", "chapter__unit_id", "chapter__unit__subject_id")
+        .first()
+    )
+    keys = [
+        question_ids_cache_key("lesson", lesson_id),
+        question_buckets_cache_key(lesson_id),
+    ]
+    if parents:
+        keys += [
+            question_ids_cache_key(scope, scope_id)
+            for scope, scope_id in zip(("chapter", "unit", "subject"), parents)
+        ]
+    cache.delete_many(keys)
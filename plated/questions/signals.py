@@ -0,0 +1,19 @@
+""" This module defines signals for the questions app
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from questions.models import Question
+from questions.sampling import invalidate_question_ids
+
+
+@receiver([post_save, post_delete], sender=Question)
+def invalidate_lesson_question_ids(sender, instance, **kwargs):
+    """drop the cached question ids of the question lesson and its parents,
+    and of the lesson it was moved from"""
+    loaded_lesson_id = getattr(instance, "_loaded_lesson_id", None)
+    if loaded_lesson_id is not None and loaded_lesson_id != instance.lesson_id:
+        invalidate_question_ids(loaded_lesson_id)
+    invalidate_question_ids(instance.lesson_id)
+    instance._loaded_lesson_id = instance.lesson_id
@@ -0,0 +1,243 @@
+""" A module for computing the item statistics of the questions
+from the answers of the students, for each question:
+- p_value: the rate of the correct answers
+- discrimination: the point-biserial correlation of answering it correctly
+  and the score percentage of the student in the rest of the exam
+- choices: the number of times each of its answers was chosen
+
+The answers of the solved exams are streamed from the database in id order
+and summed per question with NumPy, chunk by chunk. Only the running sums are
+stored with the statistics, so each run adds the answers after the last counted
+answer (the watermark) to the stored sums and computes the statistics again.
+The answers of the exams graded in the last ITEM_STATISTICS_LAG seconds, and all
+the answers after them, wait for a later run: a grading still in progress can
+commit answers with lower ids than the answers already committed, and they
+would be left behind the watermark.
+"""
+
+import datetime
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from exams.models import StudentAnswer
+from questions.models import QuestionStatistics
+
+DEFAULT_CHUNK_SIZE = 50000
+SAVE_BATCH_SIZE = 1000
+
+# the running sums of each question in the order of the summed columns
+SUMS = (
+    "responses",
+    "correct",
+    "rest_responses",
+    "rest_correct",
+    "rest_score_sum",
+    "rest_score_squares",
+    "correct_rest_score_sum",
+)
+COUNTS = ("responses", "correct", "rest_responses", "rest_correct")
+
+
+def get_watermark():
+    """returns the id of the last student answer counted in the statistics"""
+    watermark = QuestionStatistics.objects.aggregate(watermark=Max("last_answer_id"))
+    return watermark["watermark"] or 0
+
+
+def get_ceiling(now=None):
+    """returns the id of the last student answer that can be counted,
+    the one before the first answer of an exam graded within the lag"""
+    cutoff = (now or timezone.now()) - datetime.timedelta(
+        seconds=settings.ITEM_STATISTICS_LAG
+    )
+    ids = StudentAnswer.objects.aggregate(
+        first_recent=Min("pk", filter=Q(exam__updated_at__gt=cutoff)),
+        last=Max("pk"),
+    )
+    if ids["first_recent"] is not None:
+        return ids["first_recent"] - 1
+    return ids["last"] or 0
+
+
+def chunk_sums(is_correct, scores, question_counts):
+    """returns the summed columns of a chunk of answers as an (answers, SUMS) array,
+    the rest score of an answer is the score percentage of the other questions"""
+    x = np.asarray(is_correct, dtype=np.float64)
+    scores = np.asarray(scores, dtype=np.float64)
+    counts = np.asarray(question_counts, dtype=np.float64)
+    # the answers of one question exams have no rest to be correlated with
+    has_rest = (counts > 1).astype(np.float64)
+    y = (scores - x) / np.maximum(counts - 1, 1) * 100 * has_rest
+    return np.column_stack(
+        (np.ones_like(x), x, has_rest, x * has_rest, y, y * y, x * y)
+    )
+
+
+def item_statistics(sums):
+    """returns the p values and the discriminations of an (questions, SUMS) array,
+    NaN where they can not be computed"""
+    sums = dict(zip(SUMS, sums.T))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_values = sums["correct"] / sums["responses"]
+        n = sums["rest_responses"]
+        x, y = sums["rest_correct"], sums["rest_score_sum"]
+        covariance = n * sums["correct_rest_score_sum"] - x * y
+        variance = (n * x - x * x) * (n * sums["rest_score_squares"] - y * y)
+        discriminations = np.where(variance > 0, covariance / np.sqrt(variance), np.nan)
+    return p_values, discriminations
+
+
+class KeyedSums:
+    """a growing array of summed columns per key, in the order keys are added"""
+
+    def __init__(self, columns):
+        self.index = {}
+        self.sums = np.zeros((1024, columns))
+
+    def codes(self, keys):
+        """returns the rows of the keys, adding the new keys"""
+        index = self.index
+        codes = np.fromiter(
+            (index.setdefault(key, len(index)) for key in keys),
+            dtype=np.int64,
+            count=len(keys),
+        )
+        if len(index) > len(self.sums):
+            grown = np.zeros((max(len(index), 2 * len(self.sums)), self.sums.shape[1]))
+            grown[: len(self.sums)] = self.sums
+            self.sums = grown
+        return codes
+
+    def add(self, keys, values):
+        """adds the (len(keys), columns) values to the sums of their keys"""
+        codes = self.codes(keys)
+        for column in range(values.shape[1]):
+            self.sums[: len(self.index), column] += np.bincount(
+                codes, weights=values[:, column], minlength=len(self.index)
+            )
+
+    def get(self, key):
+        return self.sums[self.index[key]]
+
+
+class ItemStatisticsJob:
+    """adds the answers after the watermark to the statistics of their questions"""
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.questions = KeyedSums(len(SUMS))
+        self.choices = KeyedSums(1)
+        # the question of each chosen answer
+        self.answer_questions = {}
+        self.answers = 0
+        self.last_answer_id = 0
+
+    def get_answers(self, watermark, ceiling):
+        """returns the answers after the watermark up to the ceiling
+        in the solved exams"""
+        return (
+            StudentAnswer.objects.filter(
+                pk__gt=watermark, pk__lte=ceiling, exam__score__isnull=False
+            )
+            .order_by("pk")
+            .values_list(
+                "pk",
+                "answer__question_id",
+                "answer_id",
+                "answer__is_correct",
+                "exam__score",
+                "exam__question_count",
+            )
+        )
+
+    def add_chunk(self, rows):
+        """adds a chunk of answers to the sums of their questions and choices"""
+        ids, questions, answers, is_correct, scores, counts = zip(*rows)
+        self.questions.add(questions, chunk_sums(is_correct, scores, counts))
+        self.choices.add(answers, np.ones((len(answers), 1)))
+        for answer, question in zip(answers, questions):
+            self.answer_questions.setdefault(answer, question)
+        self.answers += len(rows)
+        self.last_answer_id = ids[-1]
+
+    def save_batch(self, question_ids, question_choices, now):
+        """adds the sums to the stored statistics of a batch of questions"""
+        stored = QuestionStatistics.objects.select_for_update().in_bulk(question_ids)
+        statistics = [
+            stored.get(id) or QuestionStatistics(question_id=id) for id in question_ids
+        ]
+        sums = np.array([self.questions.get(id) for id in question_ids])
+        sums += np.array(
+            [[getattr(item, name) for name in SUMS] for item in statistics]
+        )
+        p_values, discriminations = item_statistics(sums)
+
+        for item, row, p_value, discrimination in zip(
+            statistics, sums, p_values, discriminations
+        ):
+            for name, value in zip(SUMS, row):
+                setattr(item, name, round(value) if name in COUNTS else float(value))
+            for answer in question_choices[item.question_id]:
+                key = str(answer)
+                item.choices[key] = item.choices.get(key, 0) + int(
+                    self.choices.get(answer)[0]
+                )
+            item.p_value = None if np.isnan(p_value) else float(p_value)
+            item.discrimination = (
+                None if np.isnan(discrimination) else float(discrimination)
+            )
+            item.last_answer_id = self.last_answer_id
+            item.updated_at = now
+
+        QuestionStatistics.objects.bulk_create(
+            [item for item in statistics if item.question_id not in stored]
+        )
+        QuestionStatistics.objects.bulk_update(
+            [item for item in statistics if item.question_id in stored],
+            [
+                *SUMS,
+                "choices",
+                "p_value",
+                "discrimination",
+                "last_answer_id",
+                "updated_at",
+            ],
+        )
+
+    def save(self):
+        """saves the statistics of the questions of the counted answers"""
+        question_ids = list(self.questions.index)
+        question_choices = defaultdict(list)
+        for answer, question in self.answer_questions.items():
+            question_choices[question].append(answer)
+        now = timezone.now()
+        with transaction.atomic():
+            for start in range(0, len(question_ids), SAVE_BATCH_SIZE):
+                end = start + SAVE_BATCH_SIZE
+                self.save_batch(question_ids[start:end], question_choices, now)
+
+    def run(self, watermark=None, now=None):
+        """streams the answers after the watermark and saves the statistics,
+        returns the number of counted answers"""
+        if watermark is None:
+            watermark = get_watermark()
+        self.last_answer_id = watermark
+        answers = self.get_answers(watermark, get_ceiling(now)).iterator(
+            chunk_size=self.chunk_size
+        )
+        chunk = []
+        for row in answers:
+            chunk.append(row)
+            if len(chunk) == self.chunk_size:
+                self.add_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.add_chunk(chunk)
+        if self.answers:
+            self.save()
+        return self.answers
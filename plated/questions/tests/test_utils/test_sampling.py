@@ -0,0 +1,164 @@
+import random
+from collections import Counter
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from curriculum.models import Curriculum, Grade
+from questions.models import Question
+from questions.sampling import (
+    CachedIdSampler,
+    StratifiedSampler,
+    apportion,
+    round_shares,
+)
+from subjects.models import Chapter, Lesson, Subject, Unit
+
+
+class ApportionTestCase(TestCase):
+    def test_shares_are_capped_and_redistributed(self) -> None:
+        shares = apportion(10, {"a": 1, "b": 1, "c": 2}, {"a": 1, "b": 10, "c": 10})
+        self.assertEqual(list(shares), ["a", "b", "c"])
+        self.assertEqual(shares["a"], 1)
+        self.assertAlmostEqual(shares["b"], 3)
+        self.assertAlmostEqual(shares["c"], 6)
+
+    def test_total_over_capacity(self) -> None:
+        self.assertEqual(apportion(10, {"a": 1, "b": 1}, {"a": 2, "b": 0}), {"a": 2})
+
+    def test_rounding_keeps_the_total(self) -> None:
+        shares = {cell: 0.3 for cell in range(10)}
+        for seed in range(20):
+            counts = round_shares(shares, random.Random(seed))
+            self.assertEqual(sum(counts.values()), 3)
+            self.assertLessEqual(max(counts.values()), 1)
+
+
+class CachedIdSamplerTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        curriculum = Curriculum.objects.create()
+        grade = Grade.objects.create(title="Grade 1", curriculum=curriculum)
+        subject = Subject.objects.create(title="Mathematics", grade=grade)
+        unit = Unit.objects.create(title="Algebra", subject=subject)
+        chapter = Chapter.objects.create(title="Equations", unit=unit)
+        self.lesson = Lesson.objects.create(title="Lesson", chapter=chapter)
+        other = Lesson.objects.create(title="Other lesson", chapter=chapter)
+        self.questions = Question.objects.bulk_create(
+            Question(body="question", difficulty=1, lesson=self.lesson)
+            for _ in range(20)
+        )
+        self.other_questions = Question.objects.bulk_create(
+            Question(body="question", difficulty=1, lesson=other) for _ in range(5)
+        )
+        self.sampler = CachedIdSampler()
+
+    def test_sampled_counts(self) -> None:
+        ids = self.sampler.sample("lesson", self.lesson.id, 8, seed=1)
+        self.assertEqual(len(ids), 8)
+        self.assertEqual(len(set(ids)), 8)
+        # a scope with fewer questions than asked gives all of them
+        ids = self.sampler.sample("lesson", self.lesson.id, 50, seed=1)
+        self.assertEqual(set(ids), {question.id for question in self.questions})
+
+    def test_questions_out_of_the_scope_are_excluded(self) -> None:
+        ids = self.sampler.sample("lesson", self.lesson.id, 50, seed=1)
+        self.assertFalse(set(ids) & {question.id for question in self.other_questions})
+        chapter_ids = self.sampler.sample("chapter", self.lesson.chapter_id, 50)
+        self.assertEqual(len(chapter_ids), 25)
+
+    def test_same_seed_same_questions_from_cache(self) -> None:
+        first = self.sampler.sample("lesson", self.lesson.id, 8, seed=7)
+        with self.assertNumQueries(0):
+            second = self.sampler.sample("lesson", self.lesson.id, 8, seed=7)
+        self.assertEqual(first, second)
+
+    def test_deleted_questions_are_excluded(self) -> None:
+        self.sampler.sample("chapter", self.lesson.chapter_id, 50)
+        deleted_id = self.questions[0].id
+        self.questions[0].delete()
+        for scope, scope_id in (
+            ("lesson", self.lesson.id),
+            ("chapter", self.lesson.chapter_id),
+        ):
+            ids = self.sampler.sample(scope, scope_id, 50)
+            self.assertNotIn(deleted_id, ids)
+            self.assertEqual(len(ids), 19 if scope == "lesson" else 24)
+
+
+class StratifiedSamplerTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        curriculum = Curriculum.objects.create()
+        grade = Grade.objects.create(title="Grade 1", curriculum=curriculum)
+        self.subject = Subject.objects.create(title="Mathematics", grade=grade)
+        unit = Unit.objects.create(title="Algebra", subject=self.subject)
+        chapter = Chapter.objects.create(title="Equations", unit=unit)
+        self.lessons = [
+            Lesson.objects.create(title=f"Lesson {i}", chapter=chapter)
+            for i in range(4)
+        ]
+        for lesson in self.lessons:
+            Question.objects.bulk_create(
+                Question(body="question", difficulty=difficulty, lesson=lesson)
+                for difficulty in (1, 2, 3, 4)
+                for _ in range(10)
+            )
+        self.sampler = StratifiedSampler()
+
+    def sample(self, count: int, seed: int = 1) -> list[Question]:
+        ids = self.sampler.sample("subject", self.subject.id, count, seed=seed)
+        self.assertEqual(len(ids), len(set(ids)))
+        return list(Question.objects.filter(id__in=ids))
+
+    def test_questions_are_spread_over_lessons_and_difficulties(self) -> None:
+        questions = self.sample(40)
+        self.assertEqual(len(questions), 40)
+        self.assertEqual(
+            Counter(question.lesson_id for question in questions),
+            {lesson.id: 10 for lesson in self.lessons},
+        )
+        self.assertEqual(
+            Counter(question.difficulty for question in questions),
+            {1: 12, 2: 16, 3: 8, 4: 4},
+        )
+
+    def test_short_lessons_are_filled_by_the_others(self) -> None:
+        Question.objects.filter(lesson=self.lessons[0]).exclude(difficulty=1).delete()
+        cache.clear()
+        questions = self.sample(80)
+        counts = Counter(question.lesson_id for question in questions)
+        self.assertEqual(len(questions), 80)
+        self.assertEqual(counts[self.lessons[0].id], 10)
+        # the 70 questions left are split over the other three lessons
+        for lesson in self.lessons[1:]:
+            self.assertIn(counts[lesson.id], (23, 24))
+
+    def test_same_seed_same_questions_from_cache(self) -> None:
+        first = self.sampler.sample("subject", self.subject.id, 15, seed=7)
+        with self.assertNumQueries(0):
+            second = self.sampler.sample("subject", self.subject.id, 15, seed=7)
+        self.assertEqual(first, second)
+        other = self.sampler.sample("subject", self.subject.id, 15, seed=8)
+        self.assertNotEqual(first, other)
+
+    def test_new_question_invalidates_its_lesson_bucket(self) -> None:
+        lesson = self.lessons[0]
+        self.assertEqual(len(self.sampler.sample("lesson", str(lesson.id), 100)), 40)
+        Question.objects.create(body="new", difficulty=1, lesson=lesson)
+        self.assertEqual(len(self.sampler.sample("lesson", str(lesson.id), 100)), 41)
+
+    def test_moved_question_invalidates_both_lessons(self) -> None:
+        old, new = self.lessons[0], self.lessons[1]
+        self.assertEqual(len(self.sampler.sample("lesson", str(old.id), 100)), 40)
+        self.assertEqual(len(self.sampler.sample("lesson", str(new.id), 100)), 40)
+        question = Question.objects.filter(lesson=old).first()
+        question.lesson = new
+        question.save()
+        self.assertEqual(len(self.sampler.sample("lesson", str(old.id), 100)), 39)
+        self.assertEqual(len(self.sampler.sample("lesson", str(new.id), 100)), 41)
+        # and back, from the same instance
+        question.lesson = old
+        question.save()
+        self.assertEqual(len(self.sampler.sample("lesson", str(old.id), 100)), 40)
+        self.assertEqual(len(self.sampler.sample("lesson", str(new.id), 100)), 40)
@@ -0,0 +1,120 @@
+import datetime
+import random
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from curriculum.models import Curriculum, Grade
+from exams.models import Exam, StudentAnswer
+from questions.models import Answer, Question, QuestionStatistics
+from questions.statistics import ItemStatisticsJob, get_watermark
+from subjects.models import Chapter, Lesson, Subject, Unit
+from users.models import Student
+
+
+@override_settings(ITEM_STATISTICS_LAG=0)
+class ItemStatisticsTestCase(TestCase):
+    def setUp(self) -> None:
+        curriculum = Curriculum.objects.create()
+        self.grade = Grade.objects.create(title="Grade 1", curriculum=curriculum)
+        self.subject = Subject.objects.create(title="Mathematics", grade=self.grade)
+        unit = Unit.objects.create(title="Algebra", subject=self.subject)
+        chapter = Chapter.objects.create(title="Equations", unit=unit)
+        lesson = Lesson.objects.create(title="Linear", chapter=chapter)
+        self.questions = []
+        for i in range(4):
+            question = Question.objects.create(
+                body=f"Q{i}", difficulty=1, lesson=lesson
+            )
+            answers = [
+                Answer.objects.create(body=str(k), is_correct=k == 0, question=question)
+                for k in range(3)
+            ]
+            self.questions.append((question, answers))
+        self.rng = random.Random(1)
+        self.students = 0
+
+    def solve_exams(self, count: int, first_answer_id: int | None = None) -> None:
+        """creates solved exams of all the questions with random answers,
+        with the answer ids from first_answer_id if given"""
+        for _ in range(count):
+            self.students += 1
+            user = User.objects.create_user(f"student{self.students}")
+            student = Student.objects.create(user=user, grade=self.grade)
+            exam = Exam.objects.create(
+                student=student, subject=self.subject, question_count=4
+            )
+            chosen = [self.rng.choice(answers) for _, answers in self.questions]
+            StudentAnswer.objects.bulk_create(
+                StudentAnswer(
+                    pk=first_answer_id and first_answer_id + i,
+                    exam=exam,
+                    student=student,
+                    answer=answer,
+                )
+                for i, answer in enumerate(chosen)
+            )
+            if first_answer_id:
+                first_answer_id += len(chosen)
+            exam.set_score(sum(answer.is_correct for answer in chosen))
+            exam.save()
+
+    def expected_statistics(self, question: Question) -> tuple[float, float]:
+        """computes the p value and the discrimination of a question directly"""
+        x, y = [], []
+        for answer in StudentAnswer.objects.filter(answer__question=question):
+            correct = answer.answer.is_correct
+            x.append(correct)
+            y.append((answer.exam.score - correct) / 3 * 100)
+        return np.mean(x), np.corrcoef(x, y)[0, 1]
+
+    def test_incremental_runs_match_a_full_computation(self) -> None:
+        self.solve_exams(15)
+        self.assertEqual(ItemStatisticsJob(chunk_size=7).run(), 60)
+        watermark = get_watermark()
+        self.assertEqual(watermark, StudentAnswer.objects.latest("pk").pk)
+
+        self.solve_exams(10)
+        job = ItemStatisticsJob(chunk_size=7)
+        # only the new answers are read
+        self.assertEqual(job.run(), 40)
+        self.assertEqual(ItemStatisticsJob().run(), 0)
+
+        for question, answers in self.questions:
+            statistics = QuestionStatistics.objects.get(question=question)
+            p_value, discrimination = self.expected_statistics(question)
+            self.assertEqual(statistics.responses, 25)
+            self.assertAlmostEqual(statistics.p_value, p_value)
+            self.assertAlmostEqual(statistics.discrimination, discrimination)
+            self.assertEqual(sum(statistics.choices.values()), 25)
+            self.assertEqual(
+                statistics.choices.get(str(answers[0].id), 0),
+                round(p_value * 25),
+            )
+
+    def test_unsolved_exams_are_not_counted(self) -> None:
+        self.solve_exams(2)
+        Exam.objects.update(score=None)
+        self.assertEqual(ItemStatisticsJob().run(), 0)
+        self.assertFalse(QuestionStatistics.objects.exists())
+
+    @override_settings(ITEM_STATISTICS_LAG=60)
+    def test_answers_committed_out_of_order_are_counted(self) -> None:
+        self.solve_exams(1)
+        Exam.objects.update(updated_at=timezone.now() - datetime.timedelta(minutes=2))
+        watermark = StudentAnswer.objects.latest("pk").pk
+        # a grading commits the answers after the ids of a grading still running
+        self.solve_exams(1, first_answer_id=watermark + 5)
+        self.assertEqual(ItemStatisticsJob().run(), 4)
+        self.assertEqual(get_watermark(), watermark)
+
+        # the running grading commits its answers before the watermark passes them
+        self.solve_exams(1, first_answer_id=watermark + 1)
+        self.assertEqual(ItemStatisticsJob().run(), 0)
+        later = timezone.now() + datetime.timedelta(minutes=2)
+        self.assertEqual(ItemStatisticsJob().run(now=later), 8)
+        for question, _ in self.questions:
+            statistics = QuestionStatistics.objects.get(question=question)
+            self.assertEqual(statistics.responses, 3)
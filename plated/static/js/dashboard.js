@@ -0,0 +1,99 @@
+// draws the score progress charts of the dashboard from its json data
+
+function drawScoreChart(canvas, scores) {
+    // add 0 as the first point of the data to start counting from 1
+    const data = [0, ...scores];
+    return new Chart(canvas, {
+        type: 'line',
+        data: {
+            labels: data.map((_, i) => i),
+            datasets: [{
+                data: data,
+                borderColor: 'rgba(128, 128, 128, 0.4)',
+                borderWidth: 3,
+                pointRadius: 4,
+                pointBackgroundColor: 'black',
+            }],
+        },
+        options: {
+            animation: false,
+            plugins: {legend: {display: false}},
+            scales: {
+                x: {title: {display: true, text: 'Number of Exams'}},
+                y: {min: 0, max: 100, ticks: {stepSize: 10}, title: {display: true, text: 'Average Score (%)'}},
+            },
+        },
+    });
+}
+
+function chartSection(focus, item) {
+    const plotId = `${focus}-${item.id}-plot`;
+    const section = document.createElement('section');
+    section.className = 'lesson';
+    section.style = 'width: fit-content; min-width: 12in';
+    section.innerHTML = `
+        <div class="lesson-header">
+            <h3></h3>
+            <button class="btn btn-light" type="button" data-toggle="collapse" data-target="#${plotId}" aria-expanded="false" aria-controls="${plotId}">
+                <i class="bi bi-chevron-down"></i>
+            </button>
+        </div>
+        <div id="${plotId}" class="lesson-content collapse show"></div>`;
+
+    const title = section.querySelector('h3');
+    title.textContent = `${item.title} Score Progress`;
+    if (item.url) {
+        const link = document.createElement('a');
+        link.href = item.url;
+        link.className = 'text-decoration-none';
+        title.replaceWith(link);
+        link.appendChild(title);
+    }
+
+    const content = section.querySelector('.lesson-content');
+    if (item.scores.length) {
+        content.innerHTML = `
+            <div class="d-flex flex-row flex-wrap justify-content-sm-center">
+                <canvas id="${plotId}-chart" width="1152" height="480"></canvas>
+            </div>
+            <a href="#" data-chart="${plotId}-chart" class="btn btn-primary chart-download">
+                <i class="fa fa-download" aria-hidden="false"></i>
+            </a>`;
+        content.querySelector('.chart-download').download = `${item.title}_progress.png`;
+        drawScoreChart(content.querySelector('canvas'), item.scores);
+    } else {
+        content.innerHTML = `
+            <div class="d-flex flex-row flex-wrap justify-content-sm-center">
+                <p>No plot available for this ${focus}</p>
+            </div>`;
+    }
+    return section;
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const charts = document.getElementById('charts');
+    if (!charts) {
+        return;
+    }
+    fetch(charts.dataset.url)
+    .then(response => response.json())
+    .then(data => {
+        // a list of focus instances, each in its own section
+        if (charts.dataset.list) {
+            for (const item of data[charts.dataset.list]) {
+                charts.appendChild(chartSection(charts.dataset.focus, item));
+            }
+        }
+        // a fixed chart for each series of the data
+        for (const canvas of charts.querySelectorAll('canvas[data-series]')) {
+            drawScoreChart(canvas, data[canvas.dataset.series]);
+        }
+    });
+});
+
+document.addEventListener('click', function(event) {
+    const button = event.target.closest('.chart-download');
+    if (button) {
+        button.href = document.getElementById(button.dataset.chart).toDataURL('image/png');
+    }
+});
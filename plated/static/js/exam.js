@@ -0,0 +1,82 @@
+// autosaves the answers of the exam being solved, the changed answers
+// are sent together a few seconds after the first change, and right away
+// when the page is hidden, a failed batch is sent again with the next one
+
+const AUTOSAVE_DELAY = 3000;
+
+const examForm = document.getElementById('exam-form');
+const autosaveUrl = examForm.dataset.autosaveUrl;
+const csrftoken = examForm.querySelector('input[name="csrfmiddlewaretoken"]').value;
+let pendingAnswers = {};
+let autosaveTimer = null;
+
+function saveAnswers(keepalive) {
+    clearTimeout(autosaveTimer);
+    autosaveTimer = null;
+    if (Object.keys(pendingAnswers).length === 0) {
+        return;
+    }
+    const answers = pendingAnswers;
+    pendingAnswers = {};
+    fetch(autosaveUrl, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': csrftoken,
+        },
+        body: JSON.stringify({answers: answers}),
+        keepalive: keepalive,
+    })
+    .then(response => {
+        if (response.status >= 500) {
+            throw new Error(response.statusText);
+        }
+    })
+    .catch(() => {
+        // the answers changed meanwhile are newer than the failed ones
+        pendingAnswers = {...answers, ...pendingAnswers};
+    });
+}
+
+examForm.addEventListener('change', function(event) {
+    const name = event.target.name;
+    if (!name || !name.startsWith('question_')) {
+        return;
+    }
+    pendingAnswers[name.slice('question_'.length)] = event.target.value || null;
+    if (autosaveTimer === null) {
+        autosaveTimer = setTimeout(() => saveAnswers(false), AUTOSAVE_DELAY);
+    }
+});
+
+document.addEventListener('visibilitychange', function() {
+    if (document.visibilityState === 'hidden') {
+        saveAnswers(true);
+    }
+});
+
+// the submitted form has all the answers, the pending ones are not sent
+examForm.addEventListener('submit', function() {
+    clearTimeout(autosaveTimer);
+    pendingAnswers = {};
+});
+
+// counts down the time left and submits the answers when it is over
+const examTimer = document.getElementById('exam-timer');
+if (examTimer) {
+    const endsAt = Date.now() + Number(examTimer.dataset.remainingSeconds) * 1000;
+    const showTimeLeft = function() {
+        const left = Math.max(Math.round((endsAt - Date.now()) / 1000), 0);
+        const minutes = Math.floor(left / 60);
+        const seconds = String(left % 60).padStart(2, '0');
+        examTimer.textContent = `${minutes}:${seconds}`;
+        if (left === 0) {
+            clearInterval(timerInterval);
+            clearTimeout(autosaveTimer);
+            pendingAnswers = {};
+            examForm.submit();
+        }
+    };
+    const timerInterval = setInterval(showTimeLeft, 1000);
+    showTimeLeft();
+}
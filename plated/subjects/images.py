@@ -0,0 +1,138 @@
+""" A module for processing the cover images of the curriculum material
+off the request thread, in a bounded process pool.
+
+Each processed cover gets thumbnail, card, and full renditions in WebP and JPEG,
+saved next to it as covers/<model>/<id>/<size>.<format>,
+then the cover itself is replaced by its card size to be served by the pages.
+The full rendition is the uploaded image downscaled to 1200 pixels at most,
+the process_covers command reprocesses the covers from it.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+
+# the longest edge of each rendition in pixels
+COVER_SIZES = {
+    "thumbnail": 150,
+    "card": 400,
+    "full": 1200,
+}
+COVER_FORMATS = {
+    "webp": "WEBP",
+    "jpg": "JPEG",
+}
+
+logger = logging.getLogger(__name__)
+
+_image_pool = None
+_lock = threading.Lock()
+
+
+def get_image_pool():
+    """returns the process pool processing the covers, creating it at first use,
+    or None to process the covers in the same process"""
+    global _image_pool
+    workers = getattr(settings, "IMAGE_PROCESSING_WORKERS", 2)
+    if not workers:
+        return None
+    with _lock:
+        if _image_pool is None:
+            _image_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _image_pool
+
+
+def rendition_name(cover_name, size, extension="webp"):
+    """returns the name of a rendition of the cover"""
+    root = os.path.splitext(cover_name)[0]
+    return f"{root}/{size}.{extension}"
+
+
+def save_image(image, path, format):
+    """saves the image in a temporary file first so it is never served half written"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    image.save(tmp_path, format=format, quality=85)
+    os.replace(tmp_path, path)
+
+
+def process_cover(cover_path, source_path=None):
+    """creates the renditions of the cover from the source image
+    and replaces the cover by its card size, returns the created renditions"""
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(source_path or cover_path) as image:
+            cover_format = image.format or "JPEG"
+            source = ImageOps.exif_transpose(image)
+            source.load()
+    except OSError:
+        return []
+
+    root = os.path.splitext(cover_path)[0]
+    renditions = []
+    # the source is already loaded, so it can be one of the rewritten renditions
+    for size, edge in COVER_SIZES.items():
+        rendition = source.copy()
+        rendition.thumbnail((edge, edge))
+        for extension, format in COVER_FORMATS.items():
+            path = os.path.join(root, f"{size}.{extension}")
+            save_image(rendition, path, format)
+            renditions.append(path)
+        if size == "card":
+            save_image(rendition, cover_path, cover_format)
+    return renditions
+
+
+def remove_files(paths):
+    """removes the files and their renditions if they exist"""
+    for path in paths:
+        root = os.path.splitext(path)[0]
+        renditions = [
+            os.path.join(root, f"{size}.{extension}")
+            for size in COVER_SIZES
+            for extension in COVER_FORMATS
+        ]
+        for file_path in [path, *renditions]:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+
+def log_failure(future):
+    """logs the error of a failed image task"""
+    error = future.exception()
+    if error is not None:
+        logger.error("image processing failed", exc_info=error)
+
+
+def run_in_pool(func, *args):
+    """runs the function in the image pool after the current transaction commits,
+    or in the same process if there are no workers"""
+    pool = get_image_pool()
+    if pool is None:
+        transaction.on_commit(lambda: func(*args))
+        return
+    transaction.on_commit(
+        lambda: pool.submit(func, *args).add_done_callback(log_failure)
+    )
+
+
+def schedule_cover_processing(cover, stale_name=None):
+    """sends a newly saved cover to the pipeline,
+    along with the cover it replaced to be removed"""
+    storage = cover.storage
+    if stale_name and stale_name != cover.name and storage.exists(stale_name):
+        run_in_pool(remove_files, [storage.path(stale_name)])
+    run_in_pool(process_cover, cover.path)
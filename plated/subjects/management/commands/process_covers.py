@@ -0,0 +1,59 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from subjects.images import process_cover, rendition_name
+from subjects.models import Chapter, Lesson, Subject, Unit
+from subjects.models.base import DEFAULT_COVER
+
+
+class Command(BaseCommand):
+    help = "Creates the renditions of the covers of the curriculum material in bulk"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="only process the covers that have no renditions yet",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="number of worker processes",
+        )
+
+    def get_covers(self, missing):
+        """returns the (cover path, source path) of the covers to process"""
+        covers = []
+        for model in (Subject, Unit, Chapter, Lesson):
+            storage = model._meta.get_field("cover").storage
+            for cover in model.objects.exclude(cover=DEFAULT_COVER).values_list(
+                "cover", flat=True
+            ):
+                if not cover:
+                    continue
+                full = rendition_name(cover, "full", "jpg")
+                has_renditions = storage.exists(full)
+                if missing and has_renditions:
+                    continue
+                # the full rendition keeps the uploaded image once processed
+                source = storage.path(full) if has_renditions else None
+                covers.append((storage.path(cover), source))
+        return covers
+
+    def handle(self, *args, **kwargs):
+        covers = self.get_covers(kwargs["missing"])
+        processed = 0
+        with ProcessPoolExecutor(max_workers=kwargs["workers"]) as pool:
+            futures = {
+                pool.submit(process_cover, cover, source): cover
+                for cover, source in covers
+            }
+            for future in as_completed(futures):
+                if future.result():
+                    processed += 1
+                else:
+                    self.stderr.write(f"could not process {futures[future]}")
+        self.stdout.write(f"{processed} of {len(covers)} covers processed")
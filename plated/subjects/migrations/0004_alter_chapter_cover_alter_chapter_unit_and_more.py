@@ -0,0 +1,106 @@
+# Generated by Django 5.0.7 on 2026-10-18 18:20
+
+import curriculum.models
+import django.db.models.deletion
+import subjects.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("curriculum", "0001_initial"),
+        ("subjects", "0003_alter_subject_grade"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="chapter",
+            name="cover",
+            field=models.ImageField(
+                default="default.jpg",
+                upload_to=subjects.utils.get_upload_path,
+                verbose_name="cover image",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="chapter",
+            name="unit",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="chapters",
+                related_query_name="chapter",
+                to="subjects.unit",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="lesson",
+            name="chapter",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="lessons",
+                related_query_name="lesson",
+                to="subjects.chapter",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="lesson",
+            name="cover",
+            field=models.ImageField(
+                default="default.jpg",
+                upload_to=subjects.utils.get_upload_path,
+                verbose_name="cover image",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="lesson",
+            name="semester",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="lessons",
+                related_query_name="lesson",
+                to="curriculum.semester",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="subject",
+            name="cover",
+            field=models.ImageField(
+                default="default.jpg",
+                upload_to=subjects.utils.get_upload_path,
+                verbose_name="cover image",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="subject",
+            name="grade",
+            field=models.ForeignKey(
+                default=curriculum.models.get_default_grade,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="subjects",
+                related_query_name="subject",
+                to="curriculum.grade",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="unit",
+            name="cover",
+            field=models.ImageField(
+                default="default.jpg",
+                upload_to=subjects.utils.get_upload_path,
+                verbose_name="cover image",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="unit",
+            name="subject",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="units",
+                related_query_name="unit",
+                to="subjects.subject",
+            ),
+        ),
+    ]
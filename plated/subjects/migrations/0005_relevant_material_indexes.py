@@ -0,0 +1,24 @@
+# Generated by Django 5.0.7 on 2026-10-18 18:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("curriculum", "0001_initial"),
+        ("subjects", "0004_alter_chapter_cover_alter_chapter_unit_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chapter",
+            index=models.Index(fields=["unit", "id"], name="chapter_unit_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="lesson",
+            index=models.Index(
+                fields=["semester", "chapter"], name="lesson_semester_chapter_idx"
+            ),
+        ),
+    ]
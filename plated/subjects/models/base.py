@@ -1,12 +1,15 @@
 """ A module for defining the base model for all the models of subjects app,
-in which, save method is edited to remove old cover pic and rename pased on the id of the instance
-it also resizes the cover to save memory and reduce the sending time to client.
+in which, save method sends a newly uploaded cover to the image pipeline
+that resizes it off the request thread and removes the cover it replaced
+once the transaction commits.
 """
 
 from core.models import BaseModel
-import os
 from django.db import models
-from subjects.utils import resize_image, get_upload_path
+from subjects.images import COVER_SIZES, rendition_name, schedule_cover_processing
+from subjects.utils import get_upload_path
+
+DEFAULT_COVER = "default.jpg"
 
 
 class MaterialBaseModel(BaseModel):
@@ -16,7 +19,7 @@ class MaterialBaseModel(BaseModel):
 
     cover = models.ImageField(
         "cover image",
-        default="default.jpg",
+        default=DEFAULT_COVER,
         upload_to=get_upload_path,  # file name : id.jpg (changes before saving in save method)
     )
 
@@ -34,27 +37,44 @@ class MaterialBaseModel(BaseModel):
     def __str__(self):
         return f"{self.title}"
 
-    def save(self, *args, **kwargs):
-        """changes the name of the cover and remove older one before saving"""
-        if self.cover:
-            root, ext = os.path.splitext(self.cover.name)
-            new_img_name = f"{self.pk}{ext}"
-            if not self.cover.name.endswith(new_img_name):
-                self.cover.name = new_img_name
-        # If updating the cover image, remove the old one first, else do nothing
-        if self.pk:
-            try:
-                old_cover = self.__class__.objects.get(pk=self.pk).cover
-                if old_cover and old_cover.name != self.cover.name:
-                    if os.path.isfile(old_cover.path):
-                        os.remove(old_cover.path)
-            except self.__class__.DoesNotExist:
-                pass
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # the loaded cover tells which cover is replaced without querying it again
+        instance._loaded_cover = dict(zip(field_names, values)).get("cover")
+        return instance
 
+    def save(self, *args, **kwargs):
+        """saves the instance and sends a newly uploaded cover to the image pipeline"""
+        is_new_cover = bool(self.cover) and not self.cover._committed
+        # the upload is saved under a new name if the cover name is taken,
+        # the replaced cover is only removed when the transaction commits
         super().save(*args, **kwargs)
 
-        # resize after saving
-        resize_image(self.cover.path)
+        if is_new_cover:
+            stale_cover = getattr(self, "_loaded_cover", None)
+            schedule_cover_processing(
+                self.cover, None if stale_cover == DEFAULT_COVER else stale_cover
+            )
+            self._loaded_cover = self.cover.name
+
+    def cover_url(self, size="card", extension="webp"):
+        """returns the url of a rendition of the cover"""
+        return self.cover.storage.url(rendition_name(self.cover.name, size, extension))
+
+    @property
+    def has_cover_renditions(self):
+        """checks if the renditions of the cover are created,
+        the full JPEG is the last one the pipeline writes"""
+        name = rendition_name(self.cover.name, "full", "jpg")
+        return bool(self.cover) and self.cover.storage.exists(name)
+
+    @property
+    def cover_srcset(self):
+        """returns the srcset of the WebP renditions of the cover"""
+        return ", ".join(
+            f"{self.cover_url(size)} {edge}w" for size, edge in COVER_SIZES.items()
+        )
 
     class Meta:
         abstract = True
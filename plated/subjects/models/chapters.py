@@ -2,15 +2,23 @@
 """
 
 from django.db import models
+from django.db.models import Exists, OuterRef
 from django.urls import reverse
 from subjects.models.base import MaterialBaseModel
-from curriculum.context_processors import CURRENT_SEMESTER
+from curriculum.utils import get_current_semester
 from .units import Unit
 
 
 class RelevantChapterManager(models.Manager):
     def get_queryset(self):
-        return super().get_queryset().filter(lesson__semester=CURRENT_SEMESTER)
+        from subjects.models import Lesson
+
+        semester = get_current_semester()
+        if semester is None:
+            return super().get_queryset().none()
+        # an EXISTS subquery does not duplicate a chapter once per lesson as a JOIN does
+        lessons = Lesson.objects.filter(chapter=OuterRef("pk"), semester=semester)
+        return super().get_queryset().filter(Exists(lessons))
 
 
 class Chapter(MaterialBaseModel):
@@ -26,6 +34,12 @@ class Chapter(MaterialBaseModel):
     objects = models.Manager()
     relevant = RelevantChapterManager()
 
+    class Meta(MaterialBaseModel.Meta):
+        indexes = [
+            # finds the chapters of a unit without reading the table
+            models.Index(fields=["unit", "id"], name="chapter_unit_id_idx"),
+        ]
+
     def get_absolute_url(self):
         return reverse("lessons-list", kwargs={"pk": self.pk})
 
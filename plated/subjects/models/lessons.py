@@ -6,12 +6,15 @@ from django.urls import reverse
 from subjects.models.base import MaterialBaseModel
 from .chapters import Chapter
 from curriculum.models import Semester
-from curriculum.context_processors import CURRENT_SEMESTER
+from curriculum.utils import get_current_semester
 
 
 class RelevantLessonManager(models.Manager):
     def get_queryset(self):
-        return super().get_queryset().filter(semester=CURRENT_SEMESTER)
+        semester = get_current_semester()
+        if semester is None:
+            return super().get_queryset().none()
+        return super().get_queryset().filter(semester=semester)
 
 
 class Lesson(MaterialBaseModel):
@@ -58,5 +61,13 @@ class Lesson(MaterialBaseModel):
     objects = models.Manager()
     relevant = RelevantLessonManager()
 
+    class Meta(MaterialBaseModel.Meta):
+        indexes = [
+            # answers the relevant lessons of a chapter in a semester from the index
+            models.Index(
+                fields=["semester", "chapter"], name="lesson_semester_chapter_idx"
+            ),
+        ]
+
     def get_absolute_url(self):
         return reverse("lesson-details", kwargs={"pk": self.pk})
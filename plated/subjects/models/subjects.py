@@ -4,7 +4,7 @@
 from django.urls import reverse
 from subjects.models.base import MaterialBaseModel
 from django.db import models
-from curriculum.models import Grade
+from curriculum.models import Grade, get_default_grade
 
 
 class Subject(MaterialBaseModel):
@@ -15,7 +15,7 @@ class Subject(MaterialBaseModel):
         on_delete=models.CASCADE,
         related_name="subjects",
         related_query_name="subject",
-        default=Grade.objects.first().id,
+        default=get_default_grade,
     )
     order_in_syllabus = None
     number = None
@@ -2,15 +2,23 @@
 """
 
 from django.db import models
+from django.db.models import Exists, OuterRef
 from django.urls import reverse
 from subjects.models.base import MaterialBaseModel
 from .subjects import Subject
-from curriculum.context_processors import CURRENT_SEMESTER
+from curriculum.utils import get_current_semester
 
 
 class RelevantUnitManager(models.Manager):
     def get_queryset(self):
-        return super().get_queryset().filter(chapter__lesson__semester=CURRENT_SEMESTER)
+        from subjects.models import Lesson
+
+        semester = get_current_semester()
+        if semester is None:
+            return super().get_queryset().none()
+        # an EXISTS subquery does not duplicate a unit once per lesson as a JOIN does
+        lessons = Lesson.objects.filter(chapter__unit=OuterRef("pk"), semester=semester)
+        return super().get_queryset().filter(Exists(lessons))
 
 
 class Unit(MaterialBaseModel):
@@ -0,0 +1,12 @@
+""" This module defines signals for the subjects app
+"""
+
+from django.db.models.signals import post_delete, post_save
+
+from core.cache import invalidate_curriculum_cache
+from subjects.models import Chapter, Lesson, Subject, Unit
+
+# any change in the curriculum material invalidates the cached views
+for model in (Subject, Unit, Chapter, Lesson):
+    post_save.connect(invalidate_curriculum_cache, sender=model)
+    post_delete.connect(invalidate_curriculum_cache, sender=model)
@@ -0,0 +1,47 @@
+import datetime
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.testing import CurriculumMixin
+from curriculum.models import Semester
+from curriculum.utils import get_current_semester
+from subjects.models import Chapter, Lesson, Unit
+
+
+class RelevantManagersTestCase(CurriculumMixin, TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.create_curriculum()
+        # a second lesson of the chapter would duplicate a JOIN
+        self.lessons = [
+            self.lesson,
+            Lesson.objects.create(
+                title="Lesson 2", chapter=self.chapter, semester=self.semester
+            ),
+        ]
+        old_semester = Semester.objects.create(
+            title="Old Semester",
+            starting_date=datetime.date(1990, 1, 1),
+            ending_date=datetime.date(1990, 6, 1),
+        )
+        old_unit = Unit.objects.create(title="Geometry", subject=self.subject)
+        old_chapter = Chapter.objects.create(title="Shapes", unit=old_unit)
+        Lesson.objects.create(
+            title="Triangles", chapter=old_chapter, semester=old_semester
+        )
+        get_current_semester()
+
+    def test_unique_rows_of_the_running_semester(self) -> None:
+        with self.assertNumQueries(1):
+            self.assertEqual(list(Unit.relevant.all()), [self.unit])
+        with self.assertNumQueries(1):
+            self.assertEqual(list(Chapter.relevant.all()), [self.chapter])
+        self.assertEqual(set(Lesson.relevant.all()), set(self.lessons))
+        self.assertEqual(Unit.relevant.filter(subject=self.subject).count(), 1)
+
+    def test_nothing_is_relevant_without_a_running_semester(self) -> None:
+        self.semester.ending_date = datetime.date(2000, 6, 1)
+        self.semester.save()
+        for model in (Unit, Chapter, Lesson):
+            self.assertFalse(model.relevant.exists())
@@ -0,0 +1,76 @@
+import io
+import os
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+
+from core.testing import StudentTestCase
+
+
+def upload(color: str) -> SimpleUploadedFile:
+    """returns an uploaded image of one color"""
+    content = io.BytesIO()
+    Image.new("RGB", (800, 600), color).save(content, format="JPEG")
+    return SimpleUploadedFile("cover.jpg", content.getvalue(), "image/jpeg")
+
+
+class CoverTestCase(StudentTestCase):
+    def setUp(self) -> None:
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = override_settings(MEDIA_ROOT=media_root, IMAGE_PROCESSING_WORKERS=0)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        super().setUp()
+
+    def set_cover(self, color: str) -> str:
+        """uploads a new cover of the subject, returns its path"""
+        self.subject.cover = upload(color)
+        self.subject.save()
+        return self.subject.cover.path
+
+    def test_cover_is_processed_after_commit(self) -> None:
+        self.assertFalse(self.subject.has_cover_renditions)
+        with self.captureOnCommitCallbacks(execute=True):
+            path = self.set_cover("red")
+            self.assertFalse(self.subject.has_cover_renditions)
+        self.assertTrue(self.subject.has_cover_renditions)
+        with Image.open(path) as cover:
+            self.assertEqual(cover.size, (400, 300))
+        srcset = self.subject.cover_srcset.split(", ")
+        self.assertEqual(len(srcset), 3)
+        self.assertTrue(srcset[1].endswith("/card.webp 400w"))
+
+        response = self.client.get(reverse("subjects-list"))
+        self.assertContains(response, 'type="image/webp"', count=1)
+
+    def test_rolled_back_cover_keeps_the_current_one(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            current = self.set_cover("red")
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.set_cover("blue")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertTrue(os.path.exists(current))
+        self.subject.refresh_from_db()
+        self.assertEqual(self.subject.cover.path, current)
+        self.assertTrue(self.subject.has_cover_renditions)
+
+    def test_replaced_cover_is_removed_after_commit(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            replaced = self.set_cover("red")
+        with self.captureOnCommitCallbacks(execute=True):
+            current = self.set_cover("blue")
+            self.assertTrue(os.path.exists(replaced))
+        self.assertNotEqual(current, replaced)
+        self.assertFalse(os.path.exists(replaced))
+        self.assertTrue(os.path.exists(current))
+        self.assertTrue(self.subject.has_cover_renditions)
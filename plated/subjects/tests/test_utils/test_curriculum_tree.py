@@ -0,0 +1,70 @@
+import datetime
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.testing import CurriculumMixin
+from curriculum.models import Grade, Semester
+from subjects.models import Chapter, Lesson, Subject, Unit
+from subjects.tree import get_curriculum_tree
+
+
+class CurriculumTreeTestCase(CurriculumMixin, TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.create_curriculum(ending_date=datetime.date(2000, 6, 1))
+        other_grade = Grade.objects.create(
+            title="Grade 2", curriculum=self.grade.curriculum
+        )
+        other_semester = Semester.objects.create(
+            title="Second Semester",
+            starting_date=datetime.date(2000, 6, 2),
+            ending_date=datetime.date(2000, 12, 1),
+        )
+        self.lesson.order_in_syllabus = 2
+        self.lesson.save()
+        self.lessons = [
+            self.lesson,
+            Lesson.objects.create(
+                title="Lesson 1",
+                chapter=self.chapter,
+                semester=self.semester,
+                order_in_syllabus=1,
+            ),
+        ]
+        # neither in the semester nor in the grade
+        later_unit = Unit.objects.create(title="Geometry", subject=self.subject)
+        later_chapter = Chapter.objects.create(title="Shapes", unit=later_unit)
+        Lesson.objects.create(
+            title="Triangles", chapter=later_chapter, semester=other_semester
+        )
+        other_subject = Subject.objects.create(title="Science", grade=other_grade)
+        other_unit = Unit.objects.create(title="Matter", subject=other_subject)
+        other_chapter = Chapter.objects.create(title="Atoms", unit=other_unit)
+        Lesson.objects.create(
+            title="Electrons", chapter=other_chapter, semester=self.semester
+        )
+
+    def test_tree_of_grade_and_semester(self) -> None:
+        with self.assertNumQueries(1):
+            tree = get_curriculum_tree(self.grade, self.semester)
+        self.assertEqual(tree.instances("subject"), [self.subject])
+        self.assertEqual(tree.instances("unit", self.subject.id), [self.unit])
+        self.assertEqual(tree.instances("chapter", self.unit.id), [self.chapter])
+        self.assertEqual(tree.instances("lesson", self.chapter.id), self.lessons[::-1])
+        self.assertTrue(tree.contains("lesson", self.lessons[0].id))
+        self.assertEqual(tree.instances("chapter", self.subject.id), [])
+
+    def test_tree_is_cached_until_material_is_saved(self) -> None:
+        get_curriculum_tree(self.grade, self.semester)
+        with self.assertNumQueries(0):
+            get_curriculum_tree(self.grade, self.semester)
+        self.unit.title = "Algebra I"
+        self.unit.save()
+        tree = get_curriculum_tree(self.grade, self.semester)
+        self.assertEqual(tree.get("unit", self.unit.id).title, "Algebra I")
+
+    def test_empty_tree_without_semester(self) -> None:
+        with self.assertNumQueries(0):
+            tree = get_curriculum_tree(self.grade, None)
+        self.assertEqual(tree.instances("subject"), [])
@@ -0,0 +1,99 @@
+""" A module for resolving the curriculum tree of a grade in a semester,
+the subjects, units, chapters, and lessons that have lessons in the semester
+are loaded with one query and kept in the shared cache per grade and semester.
+
+The cache key holds the curriculum version, so the cached trees are not used
+anymore once any curriculum material is saved or deleted.
+"""
+
+from django.core.cache import cache
+
+from core.cache import get_curriculum_version
+from curriculum.utils import get_current_semester
+
+CURRICULUM_TREE_TIMEOUT = 60 * 60
+
+# the levels of the tree from the root to the leaves
+FOCUSES = ("subject", "unit", "chapter", "lesson")
+
+
+class CurriculumTree:
+    """the relevant subject -> unit -> chapter -> lesson tree"""
+
+    def __init__(self, lessons=()):
+        self.nodes = {focus: {} for focus in FOCUSES}
+        self.children = {focus: {} for focus in FOCUSES}
+        for lesson in lessons:
+            chapter = lesson.chapter
+            unit = chapter.unit
+            self.add("subject", unit.subject)
+            self.add("unit", unit, unit.subject)
+            self.add("chapter", chapter, unit)
+            self.add("lesson", lesson, chapter)
+
+    def add(self, focus, node, parent=None):
+        """adds a focus instance to the tree under its parent (one level up)"""
+        if node.id in self.nodes[focus]:
+            return
+        self.nodes[focus][node.id] = node
+        if parent is not None:
+            self.children[focus].setdefault(parent.id, []).append(node)
+
+    def get(self, focus, id):
+        """returns the focus instance with this id or None if it is not relevant"""
+        return self.nodes[focus].get(id)
+
+    def contains(self, focus, id):
+        """checks if the focus instance with this id is relevant"""
+        return id in self.nodes[focus]
+
+    def instances(self, focus, parent_id=None):
+        """returns the relevant focus instances,
+        only the children of the parent (one level up) if parent_id is given"""
+        if parent_id is None:
+            return list(self.nodes[focus].values())
+        return self.children[focus].get(parent_id, [])
+
+
+def curriculum_tree_key(grade_id, semester_id):
+    """returns the cache key of the curriculum tree of a grade in a semester"""
+    return f"curriculum:tree:{grade_id}:{semester_id}:{get_curriculum_version()}"
+
+
+def build_curriculum_tree(grade_id, semester_id):
+    """queries the relevant lessons with their ancestors and builds the tree"""
+    from subjects.models import Lesson
+
+    lessons = (
+        Lesson.objects.filter(
+            chapter__unit__subject__grade_id=grade_id, semester_id=semester_id
+        )
+        .select_related("chapter__unit__subject")
+        .order_by(
+            "chapter__unit__subject__title",
+            "chapter__unit__order_in_syllabus",
+            "chapter__order_in_syllabus",
+            "order_in_syllabus",
+        )
+    )
+    return CurriculumTree(lessons)
+
+
+def get_curriculum_tree(grade, semester):
+    """returns the curriculum tree of the grade in the semester,
+    an empty tree if there is no running semester"""
+    if grade is None or semester is None:
+        return CurriculumTree()
+    grade_id = getattr(grade, "pk", grade)
+    semester_id = getattr(semester, "pk", semester)
+    key = curriculum_tree_key(grade_id, semester_id)
+    tree = cache.get(key)
+    if tree is None:
+        tree = build_curriculum_tree(grade_id, semester_id)
+        cache.set(key, tree, CURRICULUM_TREE_TIMEOUT)
+    return tree
+
+
+def get_student_tree(student):
+    """returns the curriculum tree of the student grade in the running semester"""
+    return get_curriculum_tree(student.grade_id, get_current_semester())
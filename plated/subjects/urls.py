@@ -3,6 +3,7 @@ from django.urls import path
 from .views import (
     chapters_view,
     lesson_details_view,
+    lesson_video_view,
     lessons_view,
     subjects_view,
     tag_lesson_view,
@@ -16,4 +17,5 @@ urlpatterns = [
     path("chapter/<uuid:id>/", lessons_view, name="lessons-list"),
     path("lesson/<uuid:id>/", lesson_details_view, name="lesson-details"),
     path("lesson/<uuid:id>/tag/", tag_lesson_view, name="tag-lesson"),
+    path("lesson/<uuid:id>/<str:video>/", lesson_video_view, name="lesson-video"),
 ]
@@ -2,27 +2,27 @@ import json
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.cache import cache_page
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import require_safe
 
-from curriculum.context_processors import CURRENT_SEMESTER
+from core.cache import cache_view
+from core.streaming import serve_file
+from curriculum.utils import get_current_semester
 from exams.forms import GenerateExamForm
 from subjects.models import Chapter, Lesson, Subject, Unit
-from subjects.utils import (
-    get_relevant_chapter_lessons,
-    get_relevant_subject_units,
-    get_relevant_unit_chapters,
-)
+from subjects.tree import get_curriculum_tree
 
 
-@cache_page(60 * 60)
 @login_required(login_url="login")
+@cache_view(60 * 60)
 def subjects_view(request):
     """lists all the related subjects"""
 
     # if there is no running semester, show a message
-    if not CURRENT_SEMESTER:
+    semester = get_current_semester()
+    if not semester:
         messages.error(request, "There is no running semester right now.")
         return render(request, "subjects/subjects.html")
 
@@ -37,11 +37,13 @@ def subjects_view(request):
 
 
 @login_required(login_url="login")
+@cache_view(60 * 60)
 def units_view(request, id):
     """lists all the related units of the subject with id=id"""
 
     # if there is no running semester, show a message
-    if not CURRENT_SEMESTER:
+    semester = get_current_semester()
+    if not semester:
         messages.error(request, "There is no running semester right now.")
         return redirect("subjects-list")
 
@@ -51,10 +53,12 @@ def units_view(request, id):
         messages.error(request, "This subject is not available for your grade.")
         return redirect("subjects-list")
 
-    units = Unit.relevant.filter(subject=subject)
+    units = get_curriculum_tree(subject.grade_id, semester).instances(
+        "unit", subject.id
+    )
 
     # if there are no related units in this subject, show a message
-    if not units.exists():
+    if not units:
         messages.error(request, "This subject has no units for the running semester.")
         return render(
             request,
@@ -74,11 +78,12 @@ def units_view(request, id):
     return render(request, "subjects/units.html", context)
 
 
-@cache_page(60 * 60)
 @login_required(login_url="login")
+@cache_view(60 * 60)
 def chapters_view(request, id):
     """lists all the related chapters of the unit with id=id"""
-    if not CURRENT_SEMESTER:
+    semester = get_current_semester()
+    if not semester:
         return render(
             request,
             "subjects/chapters.html",
@@ -86,8 +91,8 @@ def chapters_view(request, id):
         )
 
     unit = get_object_or_404(Unit, pk=id)
-    chapters = get_relevant_unit_chapters(
-        id, request.user.student.grade, CURRENT_SEMESTER
+    chapters = get_curriculum_tree(request.user.student.grade_id, semester).instances(
+        "chapter", unit.id
     )
 
     # if there are no related chapters in this unit, show a message
@@ -112,11 +117,12 @@ def chapters_view(request, id):
     return render(request, "subjects/chapters.html", context)
 
 
-@cache_page(60 * 60)
 @login_required(login_url="login")
+@cache_view(60 * 60)
 def lessons_view(request, id):
     """lists all the related lessons of the chapter with id=id"""
-    if not CURRENT_SEMESTER:
+    semester = get_current_semester()
+    if not semester:
         return render(
             request,
             "subjects/chapters.html",
@@ -124,8 +130,8 @@ def lessons_view(request, id):
         )
 
     chapter = get_object_or_404(Chapter, pk=id)
-    lessons = get_relevant_chapter_lessons(
-        id, request.user.student.grade, CURRENT_SEMESTER
+    lessons = get_curriculum_tree(request.user.student.grade_id, semester).instances(
+        "lesson", chapter.id
     )
 
     # if there are no related lessons in this chapter, show a message
@@ -156,7 +162,8 @@ def lesson_details_view(request, id):
     """show the details of a lesson"""
 
     # if there is no running semester, show a message
-    if not CURRENT_SEMESTER:
+    semester = get_current_semester()
+    if not semester:
         return render(
             request,
             "subjects/lesson_details.html",
@@ -166,10 +173,8 @@ def lesson_details_view(request, id):
     lesson = get_object_or_404(Lesson, pk=id)
 
     # if the lesson is not related, show a message
-    if (
-        lesson.grade != request.user.student.grade
-        or lesson.semester != CURRENT_SEMESTER
-    ):
+    tree = get_curriculum_tree(request.user.student.grade_id, semester)
+    if not tree.contains("lesson", lesson.id):
         return render(
             request,
             "subjects/lesson_details.html",
@@ -188,7 +193,21 @@ def lesson_details_view(request, id):
     return render(request, "subjects/lesson_details.html", context)
 
 
-@cache_page(60 * 60)
+@login_required(login_url="login")
+@require_safe
+@cache_control(private=True)
+def lesson_video_view(request, id, video):
+    """streams the lecture or section video of a lesson with byte ranges"""
+    if video not in ("lecture", "section"):
+        raise Http404("There is no such video.")
+    lesson = get_object_or_404(Lesson.objects.only("id", f"{video}_video"), pk=id)
+    tree = get_curriculum_tree(request.user.student.grade_id, get_current_semester())
+    video_file = getattr(lesson, f"{video}_video")
+    if not tree.contains("lesson", lesson.id) or not video_file:
+        raise Http404("This video is not available.")
+    return serve_file(request, video_file)
+
+
 @login_required(login_url="login")
 def tag_lesson_view(request, id):
     """tag/untag a lesson when the bookmark button is clicked"""
@@ -0,0 +1,243 @@
+""" This file is to instrument the requests, turned on by REQUEST_INSTRUMENTATION,
+for each request it records:
+- the number of SQL queries and their total time
+- the queries run more than once (the N+1 patterns), by their fingerprint,
+  the SQL without its parameters
+- the cache hits and misses
+- the time spent rendering templates
+
+The numbers are added to the response headers (Server-Timing and X-*) and logged
+as one JSON line per request by the "core.instrumentation" logger.
+The same numbers can be measured and checked in the tests with measure().
+"""
+
+import contextvars
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Iterator
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+# the metrics of the request being measured in this thread or task
+_current_metrics: contextvars.ContextVar["RequestMetrics | None"] = (
+    contextvars.ContextVar("request_metrics", default=None)
+)
+_missing = object()
+_hooks_installed: bool = False
+
+# IN (%s, %s, ...) lists of any length have the same fingerprint
+IN_LIST_RE = re.compile(r"\(%s(?:, %s)*\)")
+
+
+def fingerprint(sql: str) -> str:
+    """returns the SQL of a query without the number of its parameters"""
+    return IN_LIST_RE.sub("(...)", sql)
+
+
+class RequestMetrics:
+    """the queries, cache lookups, and render time of a request"""
+
+    def __init__(self) -> None:
+        self.queries: Counter[str] = Counter()
+        self.query_count: int = 0
+        self.sql_ms: float = 0.0
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        self.render_ms: float = 0.0
+        self.total_ms: float = 0.0
+        self.rendering: bool = False
+        self.in_get_many: bool = False
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        """returns the fingerprints of the queries run more than once"""
+        return {sql: count for sql, count in self.queries.items() if count > 1}
+
+    def record_query(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:
+        """a database execute wrapper timing the queries"""
+        started: float = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_ms += (time.perf_counter() - started) * 1000
+            self.query_count += 1
+            self.queries[fingerprint(sql)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "queries": self.query_count,
+            "sql_ms": round(self.sql_ms, 2),
+            "duplicate_queries": sum(self.duplicates.values()),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "render_ms": round(self.render_ms, 2),
+            "total_ms": round(self.total_ms, 2),
+        }
+
+    def check(
+        self, max_queries: int | None = None, allow_duplicates: bool = False
+    ) -> None:
+        """raises AssertionError if there are more queries than max_queries,
+        or if any query was run more than once"""
+        errors: list[str] = []
+        if max_queries is not None and self.query_count > max_queries:
+            errors.append(f"{self.query_count} queries, expected {max_queries} or less")
+        if not allow_duplicates:
+            errors += [
+                f"{count} times: {sql}" for sql, count in self.duplicates.items()
+            ]
+        if errors:
+            raise AssertionError("\n".join(errors))
+
+
+def instrument_cache(cache_class: Any) -> None:
+    """counts the hits and misses of the get and get_many of a cache backend"""
+    if getattr(cache_class, "_instrumented", False):
+        return
+    get, get_many = cache_class.get, cache_class.get_many
+
+    def instrumented_get(
+        self: Any, key: str, default: Any = None, version: int | None = None
+    ) -> Any:
+        metrics = _current_metrics.get()
+        # the get_many of some backends looks the keys up with get
+        if metrics is None or metrics.in_get_many:
+            return get(self, key, default, version)
+        value = get(self, key, _missing, version)
+        if value is _missing:
+            metrics.cache_misses += 1
+            return default
+        metrics.cache_hits += 1
+        return value
+
+    def instrumented_get_many(
+        self: Any, keys: Any, version: int | None = None
+    ) -> dict[str, Any]:
+        metrics = _current_metrics.get()
+        if metrics is None or metrics.in_get_many:
+            return get_many(self, keys, version)  # type: ignore
+        keys = list(keys)
+        metrics.in_get_many = True
+        try:
+            values: dict[str, Any] = get_many(self, keys, version)
+        finally:
+            metrics.in_get_many = False
+        metrics.cache_hits += len(values)
+        metrics.cache_misses += len(keys) - len(values)
+        return values
+
+    cache_class.get = instrumented_get
+    cache_class.get_many = instrumented_get_many
+    cache_class._instrumented = True
+
+
+def instrument_templates() -> None:
+    """times the rendering of the django templates"""
+    from django.template.backends.django import Template
+
+    render = Template.render
+
+    def instrumented_render(self: Any, *args: Any, **kwargs: Any) -> str:
+        metrics = _current_metrics.get()
+        # the templates rendered by a template are timed with it
+        if metrics is None or metrics.rendering:
+            return render(self, *args, **kwargs)
+        metrics.rendering = True
+        started: float = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            metrics.render_ms += (time.perf_counter() - started) * 1000
+            metrics.rendering = False
+
+    Template.render = instrumented_render  # type: ignore[method-assign]
+
+
+def install_hooks() -> None:
+    """instruments the cache backends and the templates once,
+    they only record anything while a request is measured"""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    for alias in settings.CACHES:
+        instrument_cache(type(caches[alias]))
+    instrument_templates()
+    _hooks_installed = True
+
+
+@contextmanager
+def measure() -> Iterator[RequestMetrics]:
+    """measures the queries, cache lookups, and render time of the block"""
+    install_hooks()
+    metrics: RequestMetrics = RequestMetrics()
+    token = _current_metrics.set(metrics)
+    started: float = time.perf_counter()
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(metrics.record_query))
+            yield metrics
+    finally:
+        metrics.total_ms = (time.perf_counter() - started) * 1000
+        _current_metrics.reset(token)
+
+
+def add_headers(response: HttpResponse, metrics: RequestMetrics) -> None:
+    """adds the metrics to the response headers"""
+    response["Server-Timing"] = ", ".join(
+        [
+            f'sql;dur={metrics.sql_ms:.1f};desc="{metrics.query_count} queries"',
+            f"render;dur={metrics.render_ms:.1f}",
+            f"total;dur={metrics.total_ms:.1f}",
+        ]
+    )
+    response["X-Query-Count"] = str(metrics.query_count)
+    response["X-Duplicate-Queries"] = str(sum(metrics.duplicates.values()))
+    response["X-Cache-Hits"] = str(metrics.cache_hits)
+    response["X-Cache-Misses"] = str(metrics.cache_misses)
+
+
+class InstrumentationMiddleware:
+    """records the metrics of each request, when REQUEST_INSTRUMENTATION is on"""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not getattr(settings, "REQUEST_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with measure() as metrics:
+            response: HttpResponse = self.get_response(request)
+        add_headers(response, metrics)
+
+        match = request.resolver_match
+        record: dict[str, Any] = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            **metrics.as_dict(),
+            "duplicates": [
+                {"count": count, "sql": sql[:300]}
+                for sql, count in metrics.duplicates.items()
+            ],
+        }
+        logger.info(json.dumps(record))
+        return response
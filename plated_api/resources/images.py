@@ -0,0 +1,121 @@
+""" This file is to process the cover images of the resources
+off the request thread, in a bounded process pool.
+
+Each processed cover gets thumbnail, card, and full renditions in WebP and JPEG,
+saved next to it as <cover name without extension>/<size>.<format>,
+then the cover itself is replaced by its card size.
+The full rendition is the uploaded image downscaled to 1200 pixels at most,
+so the covers reprocessed from it are never larger than that.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.fields.files import FieldFile
+from PIL import Image
+
+# the longest edge of each rendition in pixels
+COVER_SIZES: dict[str, int] = {
+    "thumbnail": 150,
+    "card": 300,
+    "full": 1200,
+}
+COVER_FORMATS: dict[str, str] = {
+    "webp": "WEBP",
+    "jpg": "JPEG",
+}
+
+logger = logging.getLogger(__name__)
+
+_image_pool: ProcessPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def get_image_pool() -> ProcessPoolExecutor | None:
+    """returns the process pool processing the covers, creating it at first use,
+    or None to process the covers in the same process"""
+    global _image_pool
+    workers: int = getattr(settings, "IMAGE_PROCESSING_WORKERS", 2)
+    if not workers:
+        return None
+    with _lock:
+        if _image_pool is None:
+            _image_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _image_pool
+
+
+def rendition_name(cover_name: str, size: str, extension: str = "webp") -> str:
+    """returns the name of a rendition of the cover"""
+    root: str = os.path.splitext(cover_name)[0]
+    return f"{root}/{size}.{extension}"
+
+
+def save_image(image: Image.Image, path: str, format: str) -> None:
+    """saves the image in a temporary file first so it is never served half written"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path: str = f"{path}.{os.getpid()}.tmp"
+    if format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    image.save(tmp_path, format=format, quality=85)
+    os.replace(tmp_path, path)
+
+
+def process_cover(cover_path: str, source_path: str | None = None) -> list[str]:
+    """creates the renditions of the cover from the source image
+    and replaces the cover by its card size, returns the created renditions"""
+    from PIL import ImageOps
+
+    try:
+        with Image.open(source_path or cover_path) as image:
+            cover_format: str = image.format or "JPEG"
+            source: Image.Image = ImageOps.exif_transpose(image) or image
+            source.load()
+    except OSError:
+        return []
+
+    root: str = os.path.splitext(cover_path)[0]
+    renditions: list[str] = []
+    # the source is already loaded, so it can be one of the rewritten renditions
+    for size, edge in COVER_SIZES.items():
+        rendition: Image.Image = source.copy()
+        rendition.thumbnail((edge, edge))
+        for extension, format in COVER_FORMATS.items():
+            path: str = os.path.join(root, f"{size}.{extension}")
+            save_image(rendition, path, format)
+            renditions.append(path)
+        if size == "card":
+            save_image(rendition, cover_path, cover_format)
+    return renditions
+
+
+def log_failure(future: Future) -> None:
+    """logs the error of a failed image task"""
+    error: BaseException | None = future.exception()
+    if error is not None:
+        logger.error("image processing failed", exc_info=error)
+
+
+def run_in_pool(func: Callable[..., Any], *args: Any) -> None:
+    """runs the function in the image pool after the current transaction commits,
+    or in the same process if there are no workers"""
+    pool: ProcessPoolExecutor | None = get_image_pool()
+    if pool is None:
+        transaction.on_commit(lambda: func(*args))
+        return
+    transaction.on_commit(
+        lambda: pool.submit(func, *args).add_done_callback(log_failure)
+    )
+
+
+def schedule_cover_processing(cover: FieldFile) -> None:
+    """sends a newly saved cover to the pipeline"""
+    run_in_pool(process_cover, cover.path)
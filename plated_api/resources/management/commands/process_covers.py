@@ -0,0 +1,57 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from resources.images import process_cover, rendition_name
+from resources.models import Chapter, Lesson, TextBook, Unit
+
+
+class Command(BaseCommand):
+    help = "Create the renditions of the resources covers in bulk"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="only process the covers that have no renditions yet",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="number of worker processes",
+        )
+
+    def get_covers(self, missing: bool) -> list[tuple[str, str | None]]:
+        """returns the (cover path, source path) of the covers to process"""
+        covers: list[tuple[str, str | None]] = []
+        for model in (TextBook, Unit, Chapter, Lesson):
+            storage = model._meta.get_field("cover").storage
+            for cover in model.objects.exclude(cover="").values_list(
+                "cover", flat=True
+            ):
+                if not cover:
+                    continue
+                full: str = rendition_name(cover, "full", "jpg")
+                has_renditions: bool = storage.exists(full)
+                if missing and has_renditions:
+                    continue
+                # the full rendition keeps the uploaded image once processed
+                source: str | None = storage.path(full) if has_renditions else None
+                covers.append((storage.path(cover), source))
+        return covers
+
+    def handle(self, *args, **kwargs):
+        covers = self.get_covers(kwargs["missing"])
+        processed: int = 0
+        with ProcessPoolExecutor(max_workers=kwargs["workers"]) as pool:
+            futures = {
+                pool.submit(process_cover, cover, source): cover
+                for cover, source in covers
+            }
+            for future in as_completed(futures):
+                if future.result():
+                    processed += 1
+                else:
+                    self.stderr.write(f"Could not process {futures[future]}")
+        self.stdout.write(f"Processed {processed} of {len(covers)} covers")
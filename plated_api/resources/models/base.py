@@ -5,7 +5,7 @@ import os
 from core.models import BaseModel
 from django.db import models
 from django.utils.text import slugify
-from PIL import Image
+from resources.images import schedule_cover_processing
 
 
 def cover_path(instance, filename: str) -> str:
@@ -37,13 +37,10 @@ class ResourceBase(BaseModel):
         ordering = ["syllabus_order"]
 
     def save(self, *args, **kwargs) -> None:
-        """downsize the cover images before saving and updating"""
+        """send a newly uploaded cover to the image pipeline after saving,
+        which downsizes it off the request thread"""
+        is_new_cover: bool = bool(self.cover) and not self.cover._committed
         super().save(*args, **kwargs)
 
-        try:
-            image = Image.open(self.cover.path)
-            if image.height > 300 or image.width > 300:
-                image.thumbnail((300, 300))
-                image.save(self.cover.path)
-        except (FileNotFoundError, ValueError):
-            pass
+        if is_new_cover:
+            schedule_cover_processing(self.cover)
@@ -0,0 +1,80 @@
+import os
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import TestCase, override_settings
+from PIL import Image
+from resources.images import COVER_FORMATS, COVER_SIZES, rendition_name
+from resources.models import Subject, TextBook
+
+
+def create_image(
+    name: str = "default.png", size: tuple[int, int] = (100, 100)
+) -> SimpleUploadedFile:
+    file: BytesIO = BytesIO()
+    image: Image.Image = Image.new("RGB", size=size)
+    image.save(file, "png")
+    file.name = name
+    file.seek(0)
+    return SimpleUploadedFile(
+        name=file.name, content=file.read(), content_type="image/png"
+    )
+
+
+class TestProcessCover(TestCase):
+    def setUp(self) -> None:
+        self.math: Subject = Subject.objects.create(name="Math")
+
+    def create_textbook(self, size: tuple[int, int]) -> TextBook:
+        return TextBook.objects.create(
+            subject=self.math,
+            title="Math Book",
+            cover=create_image(name="mathBook.png", size=size),
+        )
+
+    @override_settings(IMAGE_PROCESSING_WORKERS=0)
+    def test_renditions_after_saving(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            textbook: TextBook = self.create_textbook((2000, 1000))
+        storage = textbook.cover.storage
+        for size, edge in COVER_SIZES.items():
+            for extension in COVER_FORMATS:
+                name: str = rendition_name(textbook.cover.name, size, extension)
+                self.assertTrue(storage.exists(name))
+                with Image.open(storage.path(name)) as image:
+                    self.assertEqual(image.size, (edge, edge // 2))
+        with Image.open(textbook.cover.path) as image:
+            self.assertEqual(image.size, (300, 150))
+            self.assertEqual(image.format, "PNG")
+
+    @override_settings(IMAGE_PROCESSING_WORKERS=1)
+    def test_cover_is_processed_after_commit(self) -> None:
+        with self.captureOnCommitCallbacks() as callbacks:
+            textbook: TextBook = self.create_textbook((600, 600))
+        # the save returns before the cover is processed
+        with Image.open(textbook.cover.path) as image:
+            self.assertEqual(image.size, (600, 600))
+        self.assertEqual(len(callbacks), 1)
+        full: str = rendition_name(textbook.cover.name, "full", "jpg")
+        self.assertFalse(os.path.exists(textbook.cover.storage.path(full)))
+
+    @override_settings(IMAGE_PROCESSING_WORKERS=0)
+    def test_rolled_back_cover_is_not_processed(self) -> None:
+        with self.captureOnCommitCallbacks() as callbacks:
+            try:
+                with transaction.atomic():
+                    textbook: TextBook = self.create_textbook((600, 600))
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        with Image.open(textbook.cover.path) as image:
+            self.assertEqual(image.size, (600, 600))
+
+    @override_settings(IMAGE_PROCESSING_WORKERS=0)
+    def test_saving_without_new_cover_does_not_process(self) -> None:
+        textbook: TextBook = TextBook.objects.create(subject=self.math, title="Book")
+        textbook.title = "Another Book"
+        textbook.save()
+        self.assertFalse(textbook.cover)
@@ -5,7 +5,7 @@ from uuid import UUID
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db.models.query import QuerySet
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from PIL import Image
 from resources.models import Chapter, Subject, TextBook, Unit
 
@@ -23,126 +23,129 @@ def create_image(
     )
 
 
+# the covers are resized in the same process after the commit of setUp
+@override_settings(IMAGE_PROCESSING_WORKERS=0)
 class TestUnit(TestCase):
     def setUp(self) -> None:
-        self.math: Subject = Subject.objects.create(name="Math")
-        self.physics: Subject = Subject.objects.create(name="Physics")
-        self.math_book1: TextBook = TextBook.objects.create(
-            subject=self.math,
-            title="Math Book 1",
-            caption="This textbook is number 1 for math subject",
-            cover=create_image(name="mathBook1.png", size=(100, 100)),
-        )
-        self.physics_book1: TextBook = TextBook.objects.create(
-            subject=self.physics,
-            title="Physics Book 1",
-            caption="This textbook is number 1 for physics subject",
-            cover=create_image(name="physicsBook1.png", size=(200, 200)),
-        )
-        self.math_book2: TextBook = TextBook.objects.create(
-            subject=self.math,
-            title="Math Book 2",
-            caption="This textbook is number 2 for math subject",
-            cover=create_image(name="mathBook2.png", size=(300, 300)),
-        )
-        self.physics_book2: TextBook = TextBook.objects.create(
-            subject=self.physics,
-            title="Biology Book 2",
-            caption="This textbook is number 2 for physics subject",
-            cover=create_image(name="physicsBook.png", size=(301, 301)),
-        )
-        self.mechanics: Unit = Unit.objects.create(
-            text_book=self.physics_book1,
-            title="Mechanics",
-            caption="This unit is about classical mechanics",
-            cover=create_image(name="mechanics.png", size=(100, 400)),
-            syllabus_order=1,
-        )
-        self.electricity: Unit = Unit.objects.create(
-            text_book=self.physics_book1,
-            title="Electricity",
-            caption="This unit is about electricity",
-            cover=create_image(name="electricity.png", size=(200, 300)),
-            syllabus_order=2,
-        )
-        self.waves: Unit = Unit.objects.create(
-            text_book=self.physics_book2,
-            title="Waves",
-            caption="This unit is about waves",
-            cover=create_image(name="waves.png", size=(300, 200)),
-            syllabus_order=1,
-        )
-        self.optics: Unit = Unit.objects.create(
-            text_book=self.physics_book2,
-            title="Optics",
-            caption="This unit is about optics",
-            cover=create_image(name="optics.png", size=(400, 100)),
-            syllabus_order=2,
-        )
-        self.algebra: Unit = Unit.objects.create(
-            text_book=self.math_book1,
-            title="Algebra",
-            caption="This unit is about algebra",
-            cover=create_image(name="algebra.png", size=(100, 100)),
-            syllabus_order=1,
-        )
-        self.geometry: Unit = Unit.objects.create(
-            text_book=self.math_book1,
-            title="Geometry",
-            caption="This unit is about geometry",
-            cover=create_image(name="geometry.png", size=(200, 200)),
-            syllabus_order=2,
-        )
-        self.calculus: Unit = Unit.objects.create(
-            text_book=self.math_book2,
-            title="Calculus",
-            caption="This unit is about calculus",
-            cover=create_image(name="calculus.png", size=(300, 300)),
-            syllabus_order=1,
-        )
-        self.trigonometry: Unit = Unit.objects.create(
-            text_book=self.math_book2,
-            title="Trigonometry",
-            caption="This unit is about trigonometry",
-            cover=create_image(name="trigonometry.png", size=(400, 400)),
-            syllabus_order=2,
-        )
-        self.motion_1D: Chapter = Chapter.objects.create(
-            unit=self.mechanics,
-            title="motion in one dimension",
-            caption="In this chapter,"
-            + " we introduce the concept of motion in one dimension",
-            cover=create_image(name="motion_in_1D.png", size=(100, 100)),
-            syllabus_order=1,
-        )
-        self.kinematic: Chapter = Chapter.objects.create(
-            unit=self.mechanics,
-            title="Kinematic equations",
-            caption="This chapter focuses on kinematic equations",
-            cover=create_image(name="kinematic_equations.png", size=(200, 200)),
-            syllabus_order=2,
-        )
-        self.newton: Chapter = Chapter.objects.create(
-            unit=self.mechanics,
-            title="Newton's laws",
-            caption="This chapter focuses on Newton's laws of motion",
-            cover=create_image(name="newton.png", size=(300, 300)),
-            syllabus_order=3,
-        )
-        self.coloumb: Chapter = Chapter.objects.create(
-            unit=self.electricity,
-            title="Coloumb's law",
-            caption="This chapter focuses on Coloumb's law",
-            cover=create_image(name="coloumb.png", size=(400, 400)),
-            syllabus_order=1,
-        )
-        self.gauss: Chapter = Chapter.objects.create(
-            unit=self.electricity,
-            title="Gauss's law",
-            caption="This chapter focuses on Gauss's law",
-            cover=create_image(name="gauss.png", size=(500, 500)),
-            syllabus_order=2,
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.math: Subject = Subject.objects.create(name="Math")
+            self.physics: Subject = Subject.objects.create(name="Physics")
+            self.math_book1: TextBook = TextBook.objects.create(
+                subject=self.math,
+                title="Math Book 1",
+                caption="This textbook is number 1 for math subject",
+                cover=create_image(name="mathBook1.png", size=(100, 100)),
+            )
+            self.physics_book1: TextBook = TextBook.objects.create(
+                subject=self.physics,
+                title="Physics Book 1",
+                caption="This textbook is number 1 for physics subject",
+                cover=create_image(name="physicsBook1.png", size=(200, 200)),
+            )
+            self.math_book2: TextBook = TextBook.objects.create(
+                subject=self.math,
+                title="Math Book 2",
+                caption="This textbook is number 2 for math subject",
+                cover=create_image(name="mathBook2.png", size=(300, 300)),
+            )
+            self.physics_book2: TextBook = TextBook.objects.create(
+                subject=self.physics,
+                title="Biology Book 2",
+                caption="This textbook is number 2 for physics subject",
+                cover=create_image(name="physicsBook.png", size=(301, 301)),
+            )
+            self.mechanics: Unit = Unit.objects.create(
+                text_book=self.physics_book1,
+                title="Mechanics",
+                caption="This unit is about classical mechanics",
+                cover=create_image(name="mechanics.png", size=(100, 400)),
+                syllabus_order=1,
+            )
+            self.electricity: Unit = Unit.objects.create(
+                text_book=self.physics_book1,
+                title="Electricity",
+                caption="This unit is about electricity",
+                cover=create_image(name="electricity.png", size=(200, 300)),
+                syllabus_order=2,
+            )
+            self.waves: Unit = Unit.objects.create(
+                text_book=self.physics_book2,
+                title="Waves",
+                caption="This unit is about waves",
+                cover=create_image(name="waves.png", size=(300, 200)),
+                syllabus_order=1,
+            )
+            self.optics: Unit = Unit.objects.create(
+                text_book=self.physics_book2,
+                title="Optics",
+                caption="This unit is about optics",
+                cover=create_image(name="optics.png", size=(400, 100)),
+                syllabus_order=2,
+            )
+            self.algebra: Unit = Unit.objects.create(
+                text_book=self.math_book1,
+                title="Algebra",
+                caption="This unit is about algebra",
+                cover=create_image(name="algebra.png", size=(100, 100)),
+                syllabus_order=1,
+            )
+            self.geometry: Unit = Unit.objects.create(
+                text_book=self.math_book1,
+                title="Geometry",
+                caption="This unit is about geometry",
+                cover=create_image(name="geometry.png", size=(200, 200)),
+                syllabus_order=2,
+            )
+            self.calculus: Unit = Unit.objects.create(
+                text_book=self.math_book2,
+                title="Calculus",
+                caption="This unit is about calculus",
+                cover=create_image(name="calculus.png", size=(300, 300)),
+                syllabus_order=1,
+            )
+            self.trigonometry: Unit = Unit.objects.create(
+                text_book=self.math_book2,
+                title="Trigonometry",
+                caption="This unit is about trigonometry",
+                cover=create_image(name="trigonometry.png", size=(400, 400)),
+                syllabus_order=2,
+            )
+            self.motion_1D: Chapter = Chapter.objects.create(
+                unit=self.mechanics,
+                title="motion in one dimension",
+                caption="In this chapter,"
+                + " we introduce the concept of motion in one dimension",
+                cover=create_image(name="motion_in_1D.png", size=(100, 100)),
+                syllabus_order=1,
+            )
+            self.kinematic: Chapter = Chapter.objects.create(
+                unit=self.mechanics,
+                title="Kinematic equations",
+                caption="This chapter focuses on kinematic equations",
+                cover=create_image(name="kinematic_equations.png", size=(200, 200)),
+                syllabus_order=2,
+            )
+            self.newton: Chapter = Chapter.objects.create(
+                unit=self.mechanics,
+                title="Newton's laws",
+                caption="This chapter focuses on Newton's laws of motion",
+                cover=create_image(name="newton.png", size=(300, 300)),
+                syllabus_order=3,
+            )
+            self.coloumb: Chapter = Chapter.objects.create(
+                unit=self.electricity,
+                title="Coloumb's law",
+                caption="This chapter focuses on Coloumb's law",
+                cover=create_image(name="coloumb.png", size=(400, 400)),
+                syllabus_order=1,
+            )
+            self.gauss: Chapter = Chapter.objects.create(
+                unit=self.electricity,
+                title="Gauss's law",
+                caption="This chapter focuses on Gauss's law",
+                cover=create_image(name="gauss.png", size=(500, 500)),
+                syllabus_order=2,
+            )
 
     def test_str(self) -> None:
         self.assertEqual(str(self.motion_1D), "motion in one dimension")
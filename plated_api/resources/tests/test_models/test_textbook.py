@@ -5,7 +5,7 @@ from uuid import UUID
 from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db.models.query import QuerySet
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from PIL import Image
 from resources.models import Subject, TextBook
 
@@ -23,71 +23,76 @@ def create_image(
     )
 
 
+# the covers are resized in the same process after the commit of setUp
+@override_settings(IMAGE_PROCESSING_WORKERS=0)
 class TestTextBook(TestCase):
     def setUp(self) -> None:
-        self.math: Subject = Subject.objects.create(name="Math")
-        self.physics: Subject = Subject.objects.create(name="Physics")
-        self.english: Subject = Subject.objects.create(name="English")
-        self.biology: Subject = Subject.objects.create(name="Biology")
-        self.chemistry: Subject = Subject.objects.create(name="Chemistry")
-        self.history: Subject = Subject.objects.create(name="History")
-        self.geography: Subject = Subject.objects.create(name="Geography")
-        self.computer_science: Subject = Subject.objects.create(name="Computer Science")
-        self.economics: Subject = Subject.objects.create(name="Economics")
-        self.math_book: TextBook = TextBook.objects.create(
-            subject=self.math,
-            title="Math Book",
-            caption="This textbook is for math subject",
-            cover=create_image(name="mathBook.png", size=(100, 100)),
-        )
-        self.physics_book: TextBook = TextBook.objects.create(
-            subject=self.physics,
-            title="Physics Book",
-            caption="This textbook is for physics subject",
-            cover=create_image(name="physicsBook.png", size=(200, 200)),
-        )
-        self.english_book: TextBook = TextBook.objects.create(
-            subject=self.english,
-            title="English Book",
-            caption="This textbook is for english subject",
-            cover=create_image(name="englishBook.png", size=(300, 300)),
-        )
-        self.biology_book: TextBook = TextBook.objects.create(
-            subject=self.biology,
-            title="Biology Book",
-            caption="This textbook is for biology subject",
-            cover=create_image(name="biologyBook.png", size=(301, 301)),
-        )
-        self.chemistry_book: TextBook = TextBook.objects.create(
-            subject=self.chemistry,
-            title="Chemistry Book",
-            caption="This textbook is for chemistry subject",
-            cover=create_image(name="chemistryBook.png", size=(400, 400)),
-        )
-        self.history_book: TextBook = TextBook.objects.create(
-            subject=self.history,
-            title="History Book",
-            caption="This textbook is for history subject",
-            cover=create_image(name="historyBook.png", size=(500, 500)),
-        )
-        self.geography_book: TextBook = TextBook.objects.create(
-            subject=self.geography,
-            title="Geography Book",
-            caption="This textbook is for geography subject",
-            cover=create_image(name="geographyBook.png", size=(50, 50)),
-        )
-        self.computer_science_book: TextBook = TextBook.objects.create(
-            subject=self.computer_science,
-            title="Computer Science Book",
-            caption="This textbook is for computer science subject",
-            cover=create_image(name="computer_sience_book.png", size=(299, 299)),
-        )
-        self.economics_book: TextBook = TextBook.objects.create(
-            subject=self.economics,
-            title="Economics Book",
-            caption="This textbook is for economics subject",
-            cover=create_image(name="economicsBook.png", size=(300, 300)),
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.math: Subject = Subject.objects.create(name="Math")
+            self.physics: Subject = Subject.objects.create(name="Physics")
+            self.english: Subject = Subject.objects.create(name="English")
+            self.biology: Subject = Subject.objects.create(name="Biology")
+            self.chemistry: Subject = Subject.objects.create(name="Chemistry")
+            self.history: Subject = Subject.objects.create(name="History")
+            self.geography: Subject = Subject.objects.create(name="Geography")
+            self.computer_science: Subject = Subject.objects.create(
+                name="Computer Science"
+            )
+            self.economics: Subject = Subject.objects.create(name="Economics")
+            self.math_book: TextBook = TextBook.objects.create(
+                subject=self.math,
+                title="Math Book",
+                caption="This textbook is for math subject",
+                cover=create_image(name="mathBook.png", size=(100, 100)),
+            )
+            self.physics_book: TextBook = TextBook.objects.create(
+                subject=self.physics,
+                title="Physics Book",
+                caption="This textbook is for physics subject",
+                cover=create_image(name="physicsBook.png", size=(200, 200)),
+            )
+            self.english_book: TextBook = TextBook.objects.create(
+                subject=self.english,
+                title="English Book",
+                caption="This textbook is for english subject",
+                cover=create_image(name="englishBook.png", size=(300, 300)),
+            )
+            self.biology_book: TextBook = TextBook.objects.create(
+                subject=self.biology,
+                title="Biology Book",
+                caption="This textbook is for biology subject",
+                cover=create_image(name="biologyBook.png", size=(301, 301)),
+            )
+            self.chemistry_book: TextBook = TextBook.objects.create(
+                subject=self.chemistry,
+                title="Chemistry Book",
+                caption="This textbook is for chemistry subject",
+                cover=create_image(name="chemistryBook.png", size=(400, 400)),
+            )
+            self.history_book: TextBook = TextBook.objects.create(
+                subject=self.history,
+                title="History Book",
+                caption="This textbook is for history subject",
+                cover=create_image(name="historyBook.png", size=(500, 500)),
+            )
+            self.geography_book: TextBook = TextBook.objects.create(
+                subject=self.geography,
+                title="Geography Book",
+                caption="This textbook is for geography subject",
+                cover=create_image(name="geographyBook.png", size=(50, 50)),
+            )
+            self.computer_science_book: TextBook = TextBook.objects.create(
+                subject=self.computer_science,
+                title="Computer Science Book",
+                caption="This textbook is for computer science subject",
+                cover=create_image(name="computer_sience_book.png", size=(299, 299)),
+            )
+            self.economics_book: TextBook = TextBook.objects.create(
+                subject=self.economics,
+                title="Economics Book",
+                caption="This textbook is for economics subject",
+                cover=create_image(name="economicsBook.png", size=(300, 300)),
+            )
 
     def test_str(self) -> None:
         self.assertEqual(str(self.math_book), "Math Book")